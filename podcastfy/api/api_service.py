@@ -1,21 +1,26 @@
-import asyncio, json, os, shutil, threading, aiofiles, hashlib, yaml
+import asyncio, json, os, shutil, threading, aiofiles, hashlib, yaml, time
 import uuid
 import copy
 
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from email.utils import formatdate
 from datetime import datetime, timedelta
 from redis import asyncio as aioredis
 
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, status
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, UploadFile, File, status
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
 from .models import *
 from .utils import *
 from .auth import *
 
-from podcastfy.client import generate_podcast
+from .job_runner import (
+    run_generate_podcast, mark_repeated_if_completed, mark_job_failed, attach_to_duplicate_job,
+    detach_job, finish_job, cleanup_job_files, resume_job
+)
+from podcastfy.tts.merger import Mp3FormatError, iter_mp3_frames, ready_segments
 from podcastfy.utils import setup_logger, check_cancelled_async, verify_admin_key
 from podcastfy.constants import *
 
@@ -36,6 +41,30 @@ processing_jobs = []
 task_dict = {}
 
 
+@app.on_event("startup")
+async def build_job_indexes():
+    """为索引功能上线前保存的作业补建用户索引，并将等待队列上线前的等待中作业加入队列"""
+    redis = await RedisClient.get_job_instance()
+    count = await JobRedisOperations.rebuild_indexes(redis)
+    if count:
+        logger.info(f"已为 {count} 个历史作业补建索引")
+    queued = await JobRedisOperations.backfill_waiting_queue(redis)
+    if queued:
+        logger.info(f"已将 {queued} 个历史等待作业加入等待队列")
+        await check_pending_jobs(redis)
+
+@app.on_event("startup")
+async def reclaim_orphaned_jobs():
+    """回收上次运行时未执行完的作业，重新排队并从检查点继续执行"""
+    # worker 模式下由 worker 通过租约回收
+    if JOB_RUNNER == "worker":
+        return
+    redis = await RedisClient.get_job_instance()
+    reclaimed = await JobRedisOperations.reclaim_orphaned_jobs(redis)
+    if reclaimed:
+        logger.warning(f"回收了上次运行中断的作业: {reclaimed}")
+        await check_pending_jobs(redis)
+
 async def get_redis_job():
     """获取用于作业的 Redis 实例"""
     return await RedisClient.get_job_instance()
@@ -59,21 +88,11 @@ async def process_job(job_id: str, redis: aioredis.Redis):
         logger.info(f"开始处理作业 {job_id}")
         
         # 检查是否有相同哈希值的已完成作业
-        job_hash = job["job_hash"]
-        existing_job_id = await JobRedisOperations.get_job_by_hash(redis, job_hash)
-        
-        if existing_job_id and existing_job_id != job_id:
-            existing_job = await JobRedisOperations.get_job(redis, existing_job_id)
-            if existing_job and existing_job.get("status") == "completed":
-                # 更新当前作业为重复
-                job["status"] = "repeated"
-                job["repeated_job_id"] = existing_job_id
-                job["update_time"] = get_current_time()
-                await JobRedisOperations.save_job(redis, job_id, job)
-                logger.info(f"作业 {job_id} 与已完成的作业 {existing_job_id} 重复，跳过处理")
-                return
+        if await mark_repeated_if_completed(redis, job_id, job):
+            return
         
         # 在开始处理之前，先保存哈希值与作业ID的映射
+        job_hash = job["job_hash"]
         await JobRedisOperations.save_job_hash(redis, job_hash, job_id)
         
         # 更新作业状态为处理中
@@ -87,29 +106,11 @@ async def process_job(job_id: str, redis: aioredis.Redis):
         # 创建用于取消线程的事件
         cancel_event = threading.Event()
 
-        # 将 cancel_event 传递给 generate_podcast 函数
-        def run_generate_podcast():
-            try:
-                return generate_podcast(
-                    urls=job["urls"],
-                    transcript_file=job["transcript_file"],
-                    tts_model=job["tts_model"],
-                    transcript_only=job["transcript_only"],
-                    config=job["config"],
-                    conversation_config=job["conversation_config"],
-                    text=job.get("text"),
-                    job_id=job_id,
-                    cancel_event=cancel_event
-                )
-            except Exception as e:
-                logger.error(f"生成播客时发生错误: {str(e)}")
-                return None  # 确保发生异常时也有返回值
-
         # 在线程池中运行 generate_podcast，并获取 Future 对象
         loop = asyncio.get_event_loop()
         future = loop.run_in_executor(
             thread_pool,
-            run_generate_podcast
+            run_generate_podcast, job_id, job, cancel_event
         )
 
         # 将任务的 Future 对象保存到 task_dict 中
@@ -118,59 +119,26 @@ async def process_job(job_id: str, redis: aioredis.Redis):
             "cancel_event": cancel_event
         }
 
-        # 等待任务完成并获取结果
-        result = await future
+        # 等待任务完成并获取结果，生成失败时保留错误信息作为失败原因
+        result, error = None, None
+        try:
+            result = await future
+        except Exception as e:
+            error = str(e)
 
         # 从 task_dict 中移除已完成的任务
         task_dict.pop(job_id, None)
 
-        # 检查作业是否被停止
-        job = await JobRedisOperations.get_job(redis, job_id)
-        if job.get("status") == "stopped":
-            logger.info(f"作业 {job_id} 已被停止，取消后续处理")
-            return
-
-        # 处理返回结果
-        if isinstance(result, tuple):
-            audio_file, text_file = result
-            job["audio_file"] = audio_file
-            job["text_file"] = text_file
-        elif isinstance(result, str):
-            audio_file = None
-            text_file = result
-            job["audio_file"] = None
-            job["text_file"] = text_file
-        else:
-            logger.error(f"作业 {job_id} 未生成有效的结果")
-            job["status"] = "failed"
-            job["fail_reason"] = "未生成有效的结果"
-            job["update_time"] = get_current_time()
-            await JobRedisOperations.save_job(redis, job_id, job)
-            return
-
-        # 更新作业状态为完成，并保存文件路径
-        job["status"] = "completed"
-        job["update_time"] = get_current_time()
-        await JobRedisOperations.save_job(redis, job_id, job)
-        
-        # 保存哈希值
-        await JobRedisOperations.save_job_hash(redis, job_hash, job_id)
+        # 处理返回结果，更新作业状态并保存文件路径
+        await finish_job(redis, job_id, result, error)
         
     except Exception as e:
         logger.error(f"处理作业 {job_id} 时发生异常: {str(e)}", exc_info=True)
         # 更新作业状态为失败，并保存错误信息
-        job = await JobRedisOperations.get_job(redis, job_id)
-        if job:
-            job["status"] = "failed"
-            job["fail_reason"] = str(e)
-            job["update_time"] = get_current_time()
-            await JobRedisOperations.save_job(redis, job_id, job)
+        await mark_job_failed(redis, job_id, str(e))
     finally:
         # 根据配置决定是否清理临时文件
-        if CLEANUP_ON_COMPLETE:
-            temp_dir = os.path.join(TEMP_DIRECTORY, job_id)
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+        await cleanup_job_files(redis, job_id)
         
         if job_id in processing_jobs:
             processing_jobs.remove(job_id)
@@ -190,24 +158,23 @@ async def start_job_processing(job_id: str, redis: aioredis.Redis):
 
 @check_cancelled_async
 async def check_pending_jobs(redis: aioredis.Redis):
-    """检查等待中的作业并开始处理"""
+    """从等待队列中取出作业并开始处理，调度开销与历史作业数量无关"""
+    # worker 模式下由独立的 worker 进程从队列中取作业
+    if JOB_RUNNER == "worker":
+        return
+
     while len(processing_jobs) < MAX_CONCURRENT_JOBS:
-        # 查找等待中的作业
-        waiting_jobs = []
-        job_keys = await redis.keys(f"{JobRedisConfig.job_prefix}*")
-        for key in job_keys:
-            job_id = key.split(":")[-1]
-            job = await JobRedisOperations.get_job(redis, job_id)
-            if job and job["status"] == "waiting":
-                waiting_jobs.append(job)
-
-        if not waiting_jobs:
+        # 原子地取出最早提交的作业
+        job_id = await JobRedisOperations.pop_waiting_job(redis)
+        if not job_id:
             break
 
-        # 按照创建时间排序，优先处理最早的
-        waiting_jobs.sort(key=lambda x: x["create_time"])
-        next_job = waiting_jobs[0]
-        await start_job_processing(next_job["job_id"], redis)
+        # 作业可能已过期、被删除或被停止
+        job = await JobRedisOperations.get_job(redis, job_id)
+        if not job or job.get("status") != "waiting":
+            continue
+
+        await start_job_processing(job_id, redis)
 
 def is_url(path: str) -> bool:
     """
@@ -374,6 +341,18 @@ async def submit_job(
 
         # 保存作业信息到 Redis
         await JobRedisOperations.save_job(redis, job_id, job_info, expire_days=JOB_EXPIRE_DAYS)
+
+        # 相同的作业已完成或正在进行时不再重复执行
+        duplicate_job_id = await attach_to_duplicate_job(redis, job_id, job_info)
+        if duplicate_job_id:
+            logger.info(f"提交的作业 {job_id} 与作业 {duplicate_job_id} 相同，用户ID: {current_user.email}")
+            return {
+                "job_id": job_id,
+                "message": f"已有相同的作业 {duplicate_job_id}，将直接使用其结果。请使用 /jobs/{{job_id}} 查询作业状态。"
+            }
+
+        # 加入等待队列
+        await JobRedisOperations.enqueue_job(redis, job_id, time.time())
         await check_pending_jobs(redis)
         
         logger.info(f"正在处理提交的作业，用户ID: {current_user.email}")
@@ -433,7 +412,17 @@ def format_job_info(job: dict) -> dict:
             # 处理失败或重复的情况
             "fail_reason": job.get("fail_reason") if job.get("status") == "failed" else None,
             "repeated_job_id": job.get("repeated_job_id") if job.get("status") == "repeated" else None,
+            "leader_job_id": job.get("leader_job_id") if job.get("status") == "waiting" else None,
         }
+
+        # 失败或被停止的作业显示已完成的阶段（不暴露服务器上的文件路径）
+        checkpoint = job.get("checkpoint")
+        if checkpoint and job.get("status") in ("failed", "stopped"):
+            formatted_info["checkpoint"] = {
+                "extracted_text": "extracted_text" in checkpoint,
+                "transcript": "transcript_file" in checkpoint,
+                "completed_segments": len(checkpoint.get("completed_segments", [])),
+            }
         
         # 提取重要的内容生成配置参数
         important_config = {
@@ -508,33 +497,29 @@ async def list_jobs(
     end_time = datetime.fromisoformat(get_current_time())
     start_time = end_time - timedelta(minutes=time_range)
 
-    # 从 Redis 中获取所有作业
-    job_keys = await redis.keys(f"{JobRedisConfig.job_prefix}*")
-
-    jobs = []
-    for key in job_keys:
-        job_id = key.split(":")[-1]  # 获取作业ID
-        job_data = await JobRedisOperations.get_job(redis, job_id)
-        if job_data and isinstance(job_data, dict):  # 确保 job_data 是字典类型
-            if job_data.get("user_id") == current_user.email:  # 只获取当前用户的作业
-                # 如果指定了状态，则只返回该状态的作业
-                if status is None or job_data.get("status") == status:
-                    create_time = datetime.fromisoformat(job_data.get("create_time", ""))
-                    if start_time <= create_time <= end_time:
-                        jobs.append(job_data)
-
-    # 按创建时间顺序排列
-    jobs.sort(key=lambda x: x.get("create_time", ""), reverse=False)
-
-    # 分页
-    total_jobs = len(jobs)
-    start_index = (page - 1) * page_size
-    end_index = start_index + page_size
-    paginated_jobs = jobs[start_index:end_index]
+    # 通过用户索引按时间范围查询，分页在 Redis 端完成
+    total_jobs, paginated_jobs = await JobRedisOperations.list_user_jobs(
+        redis,
+        current_user.email,
+        status=status,
+        min_time=start_time.timestamp(),
+        max_time=end_time.timestamp(),
+        offset=max(page - 1, 0) * page_size,
+        count=page_size
+    )
 
     # 使用format_job_info格式化每个作业信息
     formatted_jobs = [format_job_info(job) for job in paginated_jobs]
 
+    # worker 模式下作业由独立的 worker 进程执行，正在执行的作业以租约为准，
+    # 并发数由各 worker 的 --concurrency 决定；两种模式的等待作业数都来自等待队列
+    if JOB_RUNNER == "worker":
+        running_jobs = await JobRedisOperations.leased_jobs(redis)
+        max_concurrent_jobs = None
+    else:
+        running_jobs = processing_jobs
+        max_concurrent_jobs = MAX_CONCURRENT_JOBS
+
     # 构建响应
     response = {
         "user_id": current_user.email,
@@ -543,9 +528,10 @@ async def list_jobs(
         "page_size": page_size,
         "jobs": formatted_jobs,
         "queue_status": {
-            "max_concurrent_jobs": MAX_CONCURRENT_JOBS,
-            "current_processing": len(processing_jobs),
-            "processing_jobs": processing_jobs
+            "max_concurrent_jobs": max_concurrent_jobs,
+            "current_processing": len(running_jobs),
+            "processing_jobs": running_jobs,
+            "waiting_jobs": await JobRedisOperations.count_waiting_jobs(redis)
         }
     }
 
@@ -590,12 +576,19 @@ async def stop_jobs(
         job["status"] = "stopped"
         job["update_time"] = get_current_time()
         await JobRedisOperations.save_job(redis, job_id, job)
+        await JobRedisOperations.remove_waiting_job(redis, job_id)
+        # 跟随者退出跟随；领导者把执行交给跟随它的相同作业
+        await detach_job(redis, job_id, job)
 
         # 停止正在运行的任务
         await stop_running_job(job_id)
 
         stopped_jobs.append(job_id)
 
+    # 接替执行的作业已重新入队
+    if stopped_jobs:
+        await check_pending_jobs(redis)
+
     response = {
         "stopped_jobs": stopped_jobs,
         "failed_jobs": failed_jobs,
@@ -603,12 +596,46 @@ async def stop_jobs(
     }
     return response
 
-@app.get("/jobs/{job_id}/download/audio")
-async def download_audio_file(
+@app.post("/jobs/{job_id}/resume")
+async def resume_failed_job(
     job_id: str,
     current_user: User = Depends(get_current_active_user),
     redis: aioredis.Redis = Depends(get_redis_job)
 ):
+    """重新执行失败或被停止的作业，从最后完成的阶段和音频片段继续"""
+    job = await JobRedisOperations.get_job(redis, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="作业不存在")
+
+    # 检查作业是否属于当前用户
+    if job["user_id"] != current_user.email:
+        raise HTTPException(status_code=403, detail="无权访问此作业")
+
+    if job.get("status") not in ["failed", "stopped"]:
+        raise HTTPException(status_code=400, detail=f"只能恢复失败或被停止的作业，当前状态: {job.get('status')}")
+
+    duplicate_job_id = await resume_job(redis, job_id, job)
+    if duplicate_job_id:
+        return {
+            "job_id": job_id,
+            "message": f"已有相同的作业 {duplicate_job_id}，将直接使用其结果。请使用 /jobs/{{job_id}} 查询作业状态。"
+        }
+
+    await check_pending_jobs(redis)
+    return {
+        "job_id": job_id,
+        "message": "作业已重新提交，将从上次完成的阶段继续执行。请使用 /jobs/{job_id} 查询作业状态。"
+    }
+
+async def get_downloadable_job(redis: aioredis.Redis, job_id: str, current_user: User) -> Tuple[dict, Optional[str]]:
+    """
+    获取可下载结果文件的作业
+
+    重复作业会解析为其原始作业，使所有重复作业共享同一份结果文件。
+
+    Returns:
+        Tuple[dict, Optional[str]]: (实际生成结果文件的作业, 原始作业ID；非重复作业时为 None)
+    """
     job = await JobRedisOperations.get_job(redis, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="作业不存在")
@@ -629,6 +656,48 @@ async def download_audio_file(
     elif job["status"] != "completed":
         raise HTTPException(status_code=400, detail="作业未完成")
 
+    return job, original_job_id
+
+def artifact_response(request: Request, job: dict, file_path: str, kind: str,
+                      media_type: str, filename: str) -> Response:
+    """
+    返回作业结果文件，支持条件请求和 Range 请求
+
+    响应带有由作业哈希生成的强 ETag 和 Last-Modified；客户端缓存仍然有效时返回 304，
+    Range / If-Range 请求由 FileResponse 返回 206。
+
+    Args:
+        request: 当前请求
+        job: 实际生成该文件的作业
+        file_path: 文件路径
+        kind: 文件类型，如 audio、text
+        media_type: 响应的 MIME 类型
+        filename: 下载时使用的文件名
+    """
+    stat_result = os.stat(file_path)
+    etag = make_artifact_etag(job.get("job_hash", ""), job["job_id"], kind)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": DOWNLOAD_CACHE_CONTROL,
+    }
+
+    if is_not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since"),
+                       etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(file_path, media_type=media_type, filename=filename,
+                        headers=headers, stat_result=stat_result)
+
+@app.get("/jobs/{job_id}/download/audio")
+async def download_audio_file(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    redis: aioredis.Redis = Depends(get_redis_job)
+):
+    job, original_job_id = await get_downloadable_job(redis, job_id, current_user)
+
     audio_file = job.get("audio_file")
     if not audio_file or not os.path.exists(audio_file):
         raise HTTPException(status_code=404, detail="音频文件未找到")
@@ -638,14 +707,73 @@ async def download_audio_file(
     if original_job_id:
         filename = filename.replace(original_job_id, job_id)
 
-    return FileResponse(audio_file, media_type='audio/mpeg', filename=filename)
+    return artifact_response(request, job, audio_file, "audio", 'audio/mpeg', filename)
 
-@app.get("/jobs/{job_id}/download/text")
-async def download_text_file(
+async def iter_partial_audio(redis: aioredis.Redis, job_id: str, follow: bool = False,
+                             poll_interval: float = PARTIAL_AUDIO_POLL_INTERVAL):
+    """
+    按播放顺序输出作业已完成音频片段的 MP3 帧
+
+    片段按 _generate_audio_segments 的命名（1_Person1.mp3、2_Person2.mp3 ...）排序，
+    只输出前面没有缺口的片段；各片段的 ID3 标签和 Info 帧会被去掉，使拼接结果是一条连续的 MP3 流。
+
+    Args:
+        redis: Redis 实例
+        job_id: 作业ID
+        follow: 为 True 时持续等待新片段，直到作业结束
+        poll_interval: 等待新片段时的轮询间隔（秒）
+    """
+    segment_dir = os.path.join(TEMP_DIRECTORY, job_id)
+    sent_segments = 0
+    sent_frames = 0
+    while True:
+        job = await JobRedisOperations.get_job(redis, job_id)
+        job_status = job.get("status") if job else None
+
+        if job_status == "completed":
+            # 临时片段可能已被清理，剩余部分从最终音频文件中跳过已发送的帧后读取
+            audio_file = job.get("audio_file")
+            if audio_file and os.path.exists(audio_file):
+                async with aiofiles.open(audio_file, "rb") as f:
+                    data = await f.read()
+                frames = [frame for _, frame in iter_mp3_frames(data)]
+                if len(frames) > sent_frames:
+                    yield b"".join(frames[sent_frames:])
+            return
+
+        for segment in ready_segments(segment_dir)[sent_segments:]:
+            try:
+                async with aiofiles.open(segment, "rb") as f:
+                    data = await f.read()
+                frames = [frame for _, frame in iter_mp3_frames(data)]
+            except FileNotFoundError:
+                # 片段目录在作业完成时被清理，下一轮从最终文件继续
+                break
+            except Mp3FormatError as e:
+                logger.error(f"作业 {job_id} 的音频片段 {segment} 无法解析: {str(e)}")
+                return
+            sent_segments += 1
+            sent_frames += len(frames)
+            yield b"".join(frames)
+
+        if not follow or job_status not in ("waiting", "processing"):
+            return
+        await asyncio.sleep(poll_interval)
+
+@app.get("/jobs/{job_id}/download/audio/partial")
+async def download_partial_audio(
     job_id: str,
+    request: Request,
+    follow: bool = False,
     current_user: User = Depends(get_current_active_user),
     redis: aioredis.Redis = Depends(get_redis_job)
 ):
+    """
+    边合成边下载音频，以分块传输的 MP3 流返回已合成的部分
+
+    Args:
+        follow: 为 True 时保持连接，持续推送新完成的片段直到作业结束；否则只返回当前已完成的部分
+    """
     job = await JobRedisOperations.get_job(redis, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="作业不存在")
@@ -654,17 +782,42 @@ async def download_text_file(
     if job["user_id"] != current_user.email:
         raise HTTPException(status_code=403, detail="无权访问此作业")
 
-    # 如果是重复作业，获取原始作业的信息
-    original_job_id = None
+    # 如果是重复作业，改为读取原始作业的音频
     if job["status"] == "repeated" and "repeated_job_id" in job:
         original_job = await JobRedisOperations.get_job(redis, job["repeated_job_id"])
-        if original_job and original_job["status"] == "completed":
-            original_job_id = original_job["job_id"]
-            job = original_job
-        else:
-            raise HTTPException(status_code=404, detail="原始作业未找到或未完成")
-    elif job["status"] != "completed":
-        raise HTTPException(status_code=400, detail="作业未完成")
+        if not original_job:
+            raise HTTPException(status_code=404, detail="原始作业未找到")
+        job = original_job
+
+    if job["status"] in ("failed", "stopped"):
+        raise HTTPException(status_code=400, detail="作业已失败或已停止")
+
+    tts_config = job.get("conversation_config", {}).get("text_to_speech", {})
+    if tts_config.get("audio_format", "mp3").lower() != "mp3":
+        raise HTTPException(status_code=400, detail="边合成边下载仅支持 MP3 格式")
+
+    if job["status"] == "completed":
+        audio_file = job.get("audio_file")
+        if not audio_file or not os.path.exists(audio_file):
+            raise HTTPException(status_code=404, detail="音频文件未找到")
+        return artifact_response(request, job, audio_file, "audio", 'audio/mpeg', os.path.basename(audio_file))
+
+    if not follow and not ready_segments(os.path.join(TEMP_DIRECTORY, job["job_id"])):
+        raise HTTPException(status_code=404, detail="暂无已合成的音频")
+
+    return StreamingResponse(
+        iter_partial_audio(redis, job["job_id"], follow=follow),
+        media_type='audio/mpeg'
+    )
+
+@app.get("/jobs/{job_id}/download/text")
+async def download_text_file(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    redis: aioredis.Redis = Depends(get_redis_job)
+):
+    job, original_job_id = await get_downloadable_job(redis, job_id, current_user)
 
     text_file = job.get("text_file")
     if not text_file or not os.path.exists(text_file):
@@ -675,7 +828,7 @@ async def download_text_file(
     if original_job_id:
         filename = filename.replace(original_job_id, job_id)
 
-    return FileResponse(text_file, media_type='text/plain', filename=filename)
+    return artifact_response(request, job, text_file, "text", 'text/plain', filename)
 
 @app.api_route("/jobs/clear", methods=["DELETE", "POST"])
 async def clear_jobs(
@@ -700,38 +853,31 @@ async def clear_jobs(
         if before_days is not None:
             cutoff_time = datetime.fromisoformat(current_time) - timedelta(days=before_days)
         
-        # 获取所有作业键
-        job_keys = await redis.keys(f"{JobRedisConfig.job_prefix}*")
-        
+        # 通过用户索引找出截止时间之前的作业，之后的作业计为跳过
+        index_key = JobRedisConfig.user_index_key(current_user.email, status)
+        if cutoff_time:
+            max_score = cutoff_time.timestamp()
+            skipped_count = await redis.zcount(index_key, f"({max_score}", "+inf")
+        else:
+            max_score = "+inf"
+            skipped_count = 0
+        job_ids = await redis.zrangebyscore(index_key, "-inf", max_score)
+
         deleted_count = 0
-        skipped_count = 0
         
-        for key in job_keys:
-            job_id = key.split(":")[-1]
-            job_data = await JobRedisOperations.get_job(redis, job_id)
-            
-            # 只处理当前用户的作业
-            if not job_data or job_data.get("user_id") != current_user.email:
-                continue
-                
-            # 检查作业状态
-            if status and job_data.get("status") != status:
+        for job_id, job_data in zip(job_ids, await JobRedisOperations.get_jobs(redis, job_ids)):
+            # 作业已过期，仅清理索引
+            if not job_data:
+                await JobRedisOperations.remove_from_indexes(redis, current_user.email, [job_id])
                 continue
-                
-            # 检查时间
-            if cutoff_time:
-                job_time = datetime.fromisoformat(job_data.get("create_time", ""))
-                if job_time > cutoff_time:
-                    skipped_count += 1
-                    continue
-            
-            # 如果作业正在处理中，跳过
-            if job_data.get("status") == "processing" and job_id in processing_jobs:
+
+            # 如果作业正在处理中（API 进程内或任意 worker 中执行），跳过
+            if job_data.get("status") == "processing" or await JobRedisOperations.has_lease(redis, job_id):
                 skipped_count += 1
                 continue
                 
-            # 删除作业记录
-            await redis.delete(key)
+            # 删除作业记录及其索引
+            await JobRedisOperations.delete_job(redis, job_id, job_data)
             
             # 如果有对应的哈希值记录，也删除
             job_hash = job_data.get("job_hash")
@@ -0,0 +1,299 @@
+"""
+作业执行的公共逻辑
+
+API 进程内执行（线程池）和独立 worker 进程（podcastfy.api.worker）共用这里的函数，
+保证两种模式下的去重、结果处理和状态更新完全一致。
+"""
+
+import os, shutil, threading
+from typing import Any, Optional
+from redis import asyncio as aioredis
+
+from podcastfy.api.models import JobRedisConfig, JobRedisOperations
+from podcastfy.api.utils import get_current_time, parse_time
+from podcastfy.client import generate_podcast
+from podcastfy.constants import CLEANUP_ON_COMPLETE, TEMP_DIRECTORY
+from podcastfy.utils import setup_logger
+from podcastfy.utils.checkpoint import JobCheckpoint
+
+logger = setup_logger(__name__)
+
+
+def run_generate_podcast(job_id: str, job: dict, cancel_event: Optional[threading.Event] = None) -> Any:
+    """
+    根据作业信息调用 generate_podcast（同步执行）
+
+    Args:
+        job_id: 作业ID
+        job: 作业信息字典
+        cancel_event: 用于取消作业的事件
+
+    Returns:
+        Any: generate_podcast 的返回值
+    """
+    return generate_podcast(
+        urls=job["urls"],
+        transcript_file=job["transcript_file"],
+        tts_model=job["tts_model"],
+        transcript_only=job["transcript_only"],
+        config=job["config"],
+        conversation_config=job["conversation_config"],
+        text=job.get("text"),
+        job_id=job_id,
+        cancel_event=cancel_event,
+        resume=job.get("resume", False)
+    )
+
+
+def record_checkpoint(job_id: str, job: dict) -> None:
+    """
+    将作业已完成的阶段（提取的文本、文稿、已合成的音频片段）记录到作业信息中
+
+    作业失败或被停止后调用，恢复执行时从最后完成的阶段继续。
+    """
+    temp_dir = job.get("conversation_config", {}).get("text_to_speech", {}).get("temp_audio_dir")
+    if not temp_dir:
+        return
+    job["checkpoint"] = JobCheckpoint(temp_dir, job_id).summary()
+
+
+async def mark_repeated_if_completed(redis: aioredis.Redis, job_id: str, job: dict) -> bool:
+    """
+    检查是否有相同哈希值的已完成作业，如有则将当前作业标记为重复
+
+    Returns:
+        bool: 作业被标记为重复时返回 True
+    """
+    existing_job_id = await JobRedisOperations.get_job_by_hash(redis, job["job_hash"])
+    if not existing_job_id or existing_job_id == job_id:
+        return False
+
+    existing_job = await JobRedisOperations.get_job(redis, existing_job_id)
+    if not existing_job or existing_job.get("status") != "completed":
+        return False
+
+    await mark_repeated(redis, job_id, job, existing_job_id)
+    return True
+
+
+async def mark_repeated(redis: aioredis.Redis, job_id: str, job: dict, original_job_id: str) -> None:
+    """将作业标记为已完成作业 original_job_id 的重复作业"""
+    job.pop("leader_job_id", None)
+    job["status"] = "repeated"
+    job["repeated_job_id"] = original_job_id
+    job["update_time"] = get_current_time()
+    await JobRedisOperations.save_job(redis, job_id, job)
+    logger.info(f"作业 {job_id} 与已完成的作业 {original_job_id} 重复，跳过处理")
+
+
+async def attach_to_duplicate_job(redis: aioredis.Redis, job_id: str, job: dict) -> Optional[str]:
+    """
+    提交作业时按哈希值认领作业，相同的作业只执行一次
+
+    - 哈希值未被认领：当前作业认领哈希值，成为领导者，需要正常入队执行
+    - 相同作业已完成：当前作业直接标记为重复
+    - 相同作业正在等待或处理中：当前作业作为跟随者挂在该作业上（不入队），
+      领导者完成时一同完成（标记为重复），领导者失败或被停止时由最早的跟随者接替执行
+
+    作业需已保存到 Redis，避免其他请求把尚未保存的认领者当作已过期。
+
+    Returns:
+        Optional[str]: 当前作业成为领导者时返回 None，否则返回被跟随或被复用的作业 ID
+    """
+    score = parse_time(job["create_time"]).timestamp()
+    while True:
+        owner_id = await JobRedisOperations.save_job_hash(redis, job["job_hash"], job_id, nx=True)
+        if owner_id == job_id:
+            return None
+
+        owner = await JobRedisOperations.get_job(redis, owner_id)
+        if owner and owner.get("status") == "completed":
+            await mark_repeated(redis, job_id, job, owner_id)
+            return owner_id
+
+        job["leader_job_id"] = owner_id
+        job["update_time"] = get_current_time()
+        await JobRedisOperations.save_job(redis, job_id, job)
+        await JobRedisOperations.add_follower(redis, owner_id, job_id, score)
+
+        # 领导者可能在加入跟随者集合之前已经结束，此时需要自行处理
+        owner = await JobRedisOperations.get_job(redis, owner_id)
+        if owner and owner.get("status") in ("waiting", "processing"):
+            logger.info(f"作业 {job_id} 与进行中的作业 {owner_id} 相同，等待其结果")
+            return owner_id
+        if not await JobRedisOperations.remove_follower(redis, owner_id, job_id):
+            # 领导者已经处理了当前作业（标记为重复或提升为领导者）
+            return owner_id
+
+        job.pop("leader_job_id", None)
+        if owner and owner.get("status") == "completed":
+            await mark_repeated(redis, job_id, job, owner_id)
+            return owner_id
+        # 领导者已失败或被停止，重新认领
+
+
+async def complete_followers(redis: aioredis.Redis, job_id: str) -> None:
+    """领导者完成后，将所有跟随者标记为其重复作业"""
+    while True:
+        popped = await JobRedisOperations.pop_follower(redis, job_id)
+        if popped is None:
+            return
+        follower_id, _ = popped
+        follower = await JobRedisOperations.get_job(redis, follower_id)
+        if not follower or follower.get("status") != "waiting":
+            continue
+        await mark_repeated(redis, follower_id, follower, job_id)
+
+
+async def detach_job(redis: aioredis.Redis, job_id: str, job: dict) -> Optional[str]:
+    """
+    作业失败或被停止后解除其与相同作业的关联
+
+    跟随者退出跟随；领导者释放哈希值认领，并把执行交给最早的跟随者（重新入队，保留原排队分数），
+    其余跟随者转而跟随新的领导者。
+
+    Returns:
+        Optional[str]: 被提升为领导者的作业 ID，没有时返回 None
+    """
+    leader_job_id = job.get("leader_job_id")
+    if leader_job_id:
+        await JobRedisOperations.remove_follower(redis, leader_job_id, job_id)
+        return None
+
+    job_hash = job.get("job_hash")
+    while True:
+        popped = await JobRedisOperations.pop_follower(redis, job_id)
+        if popped is None:
+            if job_hash:
+                await JobRedisOperations.release_job_hash(redis, job_hash, job_id)
+            return None
+
+        follower_id, score = popped
+        follower = await JobRedisOperations.get_job(redis, follower_id)
+        if not follower or follower.get("status") != "waiting":
+            continue
+
+        await JobRedisOperations.save_job_hash(redis, job_hash, follower_id)
+        follower.pop("leader_job_id", None)
+        follower["update_time"] = get_current_time()
+        await JobRedisOperations.save_job(redis, follower_id, follower)
+
+        # 其余跟随者改为跟随新的领导者
+        await JobRedisOperations.move_followers(redis, job_id, follower_id)
+        for other_id, _ in await redis.zrange(
+            JobRedisConfig.followers_key(follower_id), 0, -1, withscores=True
+        ):
+            other = await JobRedisOperations.get_job(redis, other_id)
+            if other and other.get("status") == "waiting":
+                other["leader_job_id"] = follower_id
+                await JobRedisOperations.save_job(redis, other_id, other)
+
+        await JobRedisOperations.enqueue_job(redis, follower_id, score)
+        logger.info(f"作业 {job_id} 未能完成，由跟随作业 {follower_id} 接替执行")
+        return follower_id
+
+
+async def save_job_result(redis: aioredis.Redis, job_id: str, job: dict, result: Any) -> None:
+    """
+    根据 generate_podcast 的返回值更新作业状态并保存
+
+    返回 (音频文件, 文本文件) 或 文本文件 时作业完成，否则作业失败。
+    """
+    if isinstance(result, tuple):
+        audio_file, text_file = result
+        job["audio_file"] = audio_file
+        job["text_file"] = text_file
+    elif isinstance(result, str):
+        job["audio_file"] = None
+        job["text_file"] = result
+    else:
+        logger.error(f"作业 {job_id} 未生成有效的结果")
+        job["status"] = "failed"
+        job["fail_reason"] = job.get("fail_reason") or "未生成有效的结果"
+        job["update_time"] = get_current_time()
+        record_checkpoint(job_id, job)
+        await JobRedisOperations.save_job(redis, job_id, job)
+        await detach_job(redis, job_id, job)
+        return
+
+    # 更新作业状态为完成，并保存文件路径
+    job.pop("checkpoint", None)
+    job["status"] = "completed"
+    job["update_time"] = get_current_time()
+    await JobRedisOperations.save_job(redis, job_id, job)
+
+    # 保存哈希值，并让等待中的相同作业一同完成
+    await JobRedisOperations.save_job_hash(redis, job["job_hash"], job_id)
+    await complete_followers(redis, job_id)
+
+
+async def mark_job_failed(redis: aioredis.Redis, job_id: str, reason: str) -> None:
+    """将作业状态更新为失败，并保存错误信息"""
+    job = await JobRedisOperations.get_job(redis, job_id)
+    if job:
+        job["status"] = "failed"
+        job["fail_reason"] = reason
+        job["update_time"] = get_current_time()
+        record_checkpoint(job_id, job)
+        await JobRedisOperations.save_job(redis, job_id, job)
+        await detach_job(redis, job_id, job)
+
+
+async def finish_job(redis: aioredis.Redis, job_id: str, result: Any = None, error: Optional[str] = None) -> None:
+    """
+    作业执行结束后更新作业状态
+
+    作业已被停止时保留停止状态，只记录检查点；执行出错时将作业标记为失败并保存错误信息；
+    否则根据 generate_podcast 的返回值保存结果。
+
+    Args:
+        job_id: 作业ID
+        result: generate_podcast 的返回值
+        error: 执行出错时的错误信息
+    """
+    job = await JobRedisOperations.get_job(redis, job_id)
+    if not job:
+        return
+    if job.get("status") == "stopped":
+        logger.info(f"作业 {job_id} 已被停止，取消后续处理")
+        record_checkpoint(job_id, job)
+        await JobRedisOperations.save_job(redis, job_id, job)
+        return
+    if error is not None:
+        logger.error(f"作业 {job_id} 执行失败: {error}")
+        await mark_job_failed(redis, job_id, error)
+        return
+    await save_job_result(redis, job_id, job, result)
+
+
+async def cleanup_job_files(redis: aioredis.Redis, job_id: str) -> None:
+    """根据配置清理已完成或重复作业的临时目录；失败或被停止的作业保留检查点，以便恢复执行"""
+    if not CLEANUP_ON_COMPLETE:
+        return
+    job = await JobRedisOperations.get_job(redis, job_id)
+    temp_dir = os.path.join(TEMP_DIRECTORY, job_id)
+    if job and job.get("status") in ("completed", "repeated") and os.path.exists(temp_dir):
+        shutil.rmtree(temp_dir)
+
+
+async def resume_job(redis: aioredis.Redis, job_id: str, job: dict) -> Optional[str]:
+    """
+    将失败或被停止的作业重新放回等待队列，执行时从检查点继续
+
+    作业按原提交时间排队；若期间已有相同的作业在途或已完成，则跟随或复用该作业。
+
+    Returns:
+        Optional[str]: 作业重新入队时返回 None，否则返回被跟随或被复用的作业 ID
+    """
+    job["status"] = "waiting"
+    job["resume"] = True
+    job.pop("fail_reason", None)
+    job["update_time"] = get_current_time()
+    await JobRedisOperations.save_job(redis, job_id, job)
+
+    duplicate_job_id = await attach_to_duplicate_job(redis, job_id, job)
+    if duplicate_job_id:
+        return duplicate_job_id
+    await JobRedisOperations.enqueue_job(redis, job_id, parse_time(job["create_time"]).timestamp())
+    logger.info(f"作业 {job_id} 已重新入队，将从检查点继续执行")
+    return None
@@ -43,6 +43,7 @@ class TTSVoices(BaseModel):
 class TTSModel(BaseModel):
     default_voices: TTSVoices = TTSVoices()
     model: Optional[str] = None
+    max_workers: int = 1
 
 tts_config = conv_config.get('text_to_speech', {})
 
@@ -64,7 +65,8 @@ def get_tts_model(provider_name: str) -> TTSModel:
     
     return TTSModel(
         default_voices=get_tts_voices(provider_config),
-        model=provider_config.get('model')
+        model=provider_config.get('model'),
+        max_workers=provider_config.get('max_workers', 1)
     )
 
 class TextToSpeechConfig(BaseModel):
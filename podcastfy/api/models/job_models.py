@@ -1,13 +1,14 @@
-import os, json
+import os, json, time
 from redis import asyncio as aioredis
-from typing import Optional, List
+from redis.exceptions import WatchError
+from typing import Optional, List, Tuple
 from datetime import datetime
 from pydantic import BaseModel
 from fastapi import UploadFile
 
 from .config_models import ConfigAll, ConfigConversation, TTSModelChoice
-from podcastfy.api.utils import get_current_time
-from podcastfy.constants import JOB_EXPIRE_DAYS, JOB_PREFIX, JOB_HASH_PREFIX
+from podcastfy.api.utils import get_current_time, parse_time
+from podcastfy.constants import JOB_EXPIRE_DAYS, JOB_PREFIX, JOB_HASH_PREFIX, JOB_QUEUE_PREFIX, JOB_INDEX_PREFIX
 
 class RedisClient:
     _instance_user: Optional[aioredis.Redis] = None
@@ -62,10 +63,39 @@ class Job(BaseModel):
     config: ConfigAll = None
     conversation_config: ConfigConversation = None
 
+# 作业的所有状态
+JOB_STATUSES = ["waiting", "processing", "completed", "failed", "stopped", "repeated"]
+
+# 认领作业哈希值后仍然有效的状态：其他相同作业可以跟随或复用它
+JOB_HASH_OWNER_STATUSES = ["waiting", "processing", "completed"]
+
+# 作业索引的版本号，索引结构变化时递增以触发补建
+JOB_INDEX_VERSION = "1"
+
+# 等待队列的版本号，队列结构变化时递增以触发补建
+JOB_QUEUE_VERSION = "1"
+
 class JobRedisConfig:
     """Redis configuration class."""
     job_prefix = JOB_PREFIX
     job_hash_prefix = JOB_HASH_PREFIX
+    # 等待队列（有序集合，分数越小越先处理），不能使用 job_prefix 以免与作业键混淆
+    waiting_queue_key = f"{JOB_QUEUE_PREFIX}waiting"
+    # 租约（有序集合，分数为租约到期时间戳），记录正在被 worker 处理的作业
+    lease_key = f"{JOB_QUEUE_PREFIX}leases"
+    job_index_prefix = JOB_INDEX_PREFIX
+
+    @staticmethod
+    def followers_key(leader_job_id: str) -> str:
+        """跟随者集合键（有序集合，分数为跟随者的排队分数），记录等待某个在途作业结果的相同作业"""
+        return f"{JOB_QUEUE_PREFIX}followers:{leader_job_id}"
+
+    @staticmethod
+    def user_index_key(user_id: str, status: Optional[str] = None) -> str:
+        """用户作业索引键（有序集合，分数为创建时间戳），指定 status 时为该状态的索引"""
+        if status:
+            return f"{JobRedisConfig.job_index_prefix}user:{user_id}:status:{status}"
+        return f"{JobRedisConfig.job_index_prefix}user:{user_id}"
 
 # Redis 操作相关的辅助函数
 class JobRedisOperations:
@@ -76,12 +106,36 @@ class JobRedisOperations:
         job_info: dict, 
         expire_days: int = JOB_EXPIRE_DAYS
     ):
-        """保存作业信息到 Redis"""
-        await redis.hset(f"{JobRedisConfig.job_prefix}{job_id}", mapping={
-            "data": json.dumps(job_info)
+        """保存作业信息到 Redis，并维护用户作业索引和状态索引"""
+        key = f"{JobRedisConfig.job_prefix}{job_id}"
+        expire_seconds = 60 * 60 * 24 * expire_days
+        status = job_info.get("status") or ""
+        user_id = job_info.get("user_id")
+        create_time = job_info.get("create_time")
+
+        # 状态单独存一份，更新索引时无需解码完整作业数据
+        old_status = await redis.hget(key, "status") if user_id and create_time else None
+
+        pipe = redis.pipeline(transaction=True)
+        pipe.hset(key, mapping={
+            "data": json.dumps(job_info),
+            "status": status
         })
         # 设置过期时间
-        await redis.expire(f"{JobRedisConfig.job_prefix}{job_id}", 60 * 60 * 24 * expire_days)
+        pipe.expire(key, expire_seconds)
+
+        if user_id and create_time:
+            score = parse_time(create_time).timestamp()
+            user_key = JobRedisConfig.user_index_key(user_id)
+            status_key = JobRedisConfig.user_index_key(user_id, status)
+            pipe.zadd(user_key, {job_id: score})
+            pipe.expire(user_key, expire_seconds)
+            if old_status and old_status != status:
+                pipe.zrem(JobRedisConfig.user_index_key(user_id, old_status), job_id)
+            pipe.zadd(status_key, {job_id: score})
+            pipe.expire(status_key, expire_seconds)
+
+        await pipe.execute()
 
     @staticmethod
     async def get_job(redis: aioredis.Redis, job_id: str) -> Optional[dict]:
@@ -90,12 +144,236 @@ class JobRedisOperations:
         return json.loads(job_data) if job_data else None
 
     @staticmethod
-    async def save_job_hash(redis: aioredis.Redis, job_hash: str, job_id: str):
-        """保存作业哈希值到 Redis"""
+    async def get_jobs(redis: aioredis.Redis, job_ids: List[str]) -> List[Optional[dict]]:
+        """批量获取作业信息，返回顺序与 job_ids 一致，不存在的作业为 None"""
+        if not job_ids:
+            return []
+        pipe = redis.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hget(f"{JobRedisConfig.job_prefix}{job_id}", "data")
+        results = await pipe.execute()
+        return [json.loads(data) if data else None for data in results]
+
+    @staticmethod
+    async def list_user_jobs(
+        redis: aioredis.Redis,
+        user_id: str,
+        status: Optional[str] = None,
+        min_time: Optional[float] = None,
+        max_time: Optional[float] = None,
+        offset: int = 0,
+        count: int = 20
+    ) -> Tuple[int, List[dict]]:
+        """
+        按创建时间范围查询用户作业，分页在 Redis 端完成
+
+        Args:
+            user_id: 用户ID
+            status: 作业状态，不指定时查询所有状态
+            min_time: 创建时间下限（时间戳），不指定时不限
+            max_time: 创建时间上限（时间戳），不指定时不限
+            offset: 分页偏移
+            count: 每页数量
+
+        Returns:
+            Tuple[int, List[dict]]: (时间范围内的作业总数, 当前页作业列表，按创建时间升序)
+        """
+        index_key = JobRedisConfig.user_index_key(user_id, status)
+        min_score = "-inf" if min_time is None else min_time
+        max_score = "+inf" if max_time is None else max_time
+
+        total = await redis.zcount(index_key, min_score, max_score)
+        job_ids = await redis.zrangebyscore(index_key, min_score, max_score, start=offset, num=count)
+        jobs = await JobRedisOperations.get_jobs(redis, job_ids)
+
+        # 作业键过期后索引中会残留 ID，顺便清理
+        expired_ids = [job_id for job_id, job in zip(job_ids, jobs) if job is None]
+        if expired_ids:
+            await JobRedisOperations.remove_from_indexes(redis, user_id, expired_ids)
+
+        return total - len(expired_ids), [job for job in jobs if job is not None]
+
+    @staticmethod
+    async def remove_from_indexes(
+        redis: aioredis.Redis, user_id: str, job_ids: List[str], status: Optional[str] = None
+    ):
+        """从用户索引中移除作业；不知道状态时从所有状态索引中移除"""
+        statuses = [status] if status else JOB_STATUSES
+        pipe = redis.pipeline(transaction=False)
+        pipe.zrem(JobRedisConfig.user_index_key(user_id), *job_ids)
+        for job_status in statuses:
+            pipe.zrem(JobRedisConfig.user_index_key(user_id, job_status), *job_ids)
+        await pipe.execute()
+
+    @staticmethod
+    async def delete_job(redis: aioredis.Redis, job_id: str, job: dict):
+        """删除作业记录及其索引和队列条目"""
+        await redis.delete(f"{JobRedisConfig.job_prefix}{job_id}")
+        await JobRedisOperations.remove_waiting_job(redis, job_id)
+        if job.get("user_id"):
+            await JobRedisOperations.remove_from_indexes(
+                redis, job["user_id"], [job_id], job.get("status")
+            )
+
+    @staticmethod
+    async def rebuild_indexes(redis: aioredis.Redis) -> int:
+        """
+        为索引功能上线前保存的作业补建索引
+
+        使用 SCAN 遍历，仅在索引版本标记不存在时执行一次。
+
+        Returns:
+            int: 补建索引的作业数量
+        """
+        marker_key = f"{JobRedisConfig.job_index_prefix}version"
+        if await redis.get(marker_key) == JOB_INDEX_VERSION:
+            return 0
+
+        count = 0
+        async for key in redis.scan_iter(match=f"{JobRedisConfig.job_prefix}*", count=500):
+            job_id = key[len(JobRedisConfig.job_prefix):]
+            job = await JobRedisOperations.get_job(redis, job_id)
+            if not job:
+                continue
+            ttl = await redis.ttl(key)
+            await JobRedisOperations.save_job(redis, job_id, job)
+            if ttl and ttl > 0:
+                # 保留原有的过期时间
+                await redis.expire(key, ttl)
+            count += 1
+
+        await redis.set(marker_key, JOB_INDEX_VERSION)
+        return count
+
+    @staticmethod
+    async def backfill_waiting_queue(redis: aioredis.Redis) -> int:
+        """
+        将等待队列上线前保存的等待中作业加入等待队列
+
+        通过用户的等待中状态索引查找（需先执行 rebuild_indexes），按创建时间排队；
+        跟随其他作业的作业不入队，已在队列中的作业保留原有分数。仅在队列版本标记不存在时执行一次。
+
+        Returns:
+            int: 加入队列的作业数量
+        """
+        marker_key = f"{JOB_QUEUE_PREFIX}version"
+        if await redis.get(marker_key) == JOB_QUEUE_VERSION:
+            return 0
+
+        count = 0
+        match = JobRedisConfig.user_index_key("*", "waiting")
+        async for index_key in redis.scan_iter(match=match, count=500):
+            for job_id, score in await redis.zrange(index_key, 0, -1, withscores=True):
+                job = await JobRedisOperations.get_job(redis, job_id)
+                if not job or job.get("status") != "waiting" or job.get("leader_job_id"):
+                    continue
+                count += await redis.zadd(JobRedisConfig.waiting_queue_key, {job_id: score}, nx=True)
+
+        await redis.set(marker_key, JOB_QUEUE_VERSION)
+        return count
+
+    @staticmethod
+    async def save_job_hash(redis: aioredis.Redis, job_hash: str, job_id: str, nx: bool = False) -> str:
+        """
+        保存作业哈希值到 Redis
+
+        nx 为 True 时以 SETNX 方式原子地认领哈希值：哈希值已被等待中、处理中或已完成的作业认领时不写入；
+        认领者已失败、停止或过期时，通过 WATCH/MULTI 比较并替换，多个请求同时替换时只有一个成功。
+
+        Returns:
+            str: 认领该哈希值的作业 ID；nx 为 False 或认领成功时即 job_id
+        """
         key = f"{JobRedisConfig.job_hash_prefix}{job_hash}"
-        await redis.set(key, job_id)
         # 设置与作业相同的过期时间
-        await redis.expire(key, 60 * 60 * 24 * JOB_EXPIRE_DAYS)
+        expire_seconds = 60 * 60 * 24 * JOB_EXPIRE_DAYS
+        if not nx:
+            await redis.set(key, job_id, ex=expire_seconds)
+            return job_id
+
+        while True:
+            if await redis.set(key, job_id, nx=True, ex=expire_seconds):
+                return job_id
+            owner_id = await redis.get(key)
+            if owner_id is None:
+                # 认领在两次操作之间过期，重新尝试
+                continue
+            if owner_id == job_id:
+                return job_id
+            owner = await JobRedisOperations.get_job(redis, owner_id)
+            if owner and owner.get("status") in JOB_HASH_OWNER_STATUSES:
+                return owner_id
+
+            async with redis.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(key)
+                    if await pipe.get(key) != owner_id:
+                        continue
+                    pipe.multi()
+                    pipe.set(key, job_id, ex=expire_seconds)
+                    await pipe.execute()
+                    return job_id
+                except WatchError:
+                    continue
+
+    @staticmethod
+    async def release_job_hash(redis: aioredis.Redis, job_hash: str, job_id: str) -> bool:
+        """
+        释放作业对哈希值的认领（仅当哈希值仍由 job_id 认领时删除）
+
+        Returns:
+            bool: 成功释放时返回 True
+        """
+        key = f"{JobRedisConfig.job_hash_prefix}{job_hash}"
+        async with redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) != job_id:
+                    return False
+                pipe.multi()
+                pipe.delete(key)
+                await pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    @staticmethod
+    async def add_follower(redis: aioredis.Redis, leader_job_id: str, job_id: str, score: float):
+        """将作业加入在途作业 leader_job_id 的跟随者集合"""
+        key = JobRedisConfig.followers_key(leader_job_id)
+        pipe = redis.pipeline(transaction=True)
+        pipe.zadd(key, {job_id: score})
+        pipe.expire(key, 60 * 60 * 24 * JOB_EXPIRE_DAYS)
+        await pipe.execute()
+
+    @staticmethod
+    async def remove_follower(redis: aioredis.Redis, leader_job_id: str, job_id: str) -> bool:
+        """
+        将作业移出跟随者集合
+
+        Returns:
+            bool: 作业仍在集合中（尚未被领导者处理）时返回 True
+        """
+        return bool(await redis.zrem(JobRedisConfig.followers_key(leader_job_id), job_id))
+
+    @staticmethod
+    async def pop_follower(redis: aioredis.Redis, leader_job_id: str) -> Optional[Tuple[str, float]]:
+        """原子地取出最早的跟随者，返回 (作业 ID, 排队分数)，没有跟随者时返回 None"""
+        result = await redis.zpopmin(JobRedisConfig.followers_key(leader_job_id))
+        return (result[0][0], result[0][1]) if result else None
+
+    @staticmethod
+    async def move_followers(redis: aioredis.Redis, leader_job_id: str, new_leader_job_id: str):
+        """将 leader_job_id 剩余的跟随者转交给 new_leader_job_id"""
+        old_key = JobRedisConfig.followers_key(leader_job_id)
+        new_key = JobRedisConfig.followers_key(new_leader_job_id)
+        followers = await redis.zrange(old_key, 0, -1, withscores=True)
+        if not followers:
+            return
+        pipe = redis.pipeline(transaction=True)
+        pipe.zadd(new_key, dict(followers))
+        pipe.expire(new_key, 60 * 60 * 24 * JOB_EXPIRE_DAYS)
+        pipe.zrem(old_key, *[job_id for job_id, _ in followers])
+        await pipe.execute()
 
     @staticmethod
     async def get_job_by_hash(redis: aioredis.Redis, job_hash: str) -> Optional[str]:
@@ -103,6 +381,166 @@ class JobRedisOperations:
         key = f"{JobRedisConfig.job_hash_prefix}{job_hash}"
         return await redis.get(key)
 
+    @staticmethod
+    async def enqueue_job(redis: aioredis.Redis, job_id: str, score: float):
+        """
+        将作业加入等待队列
+
+        Args:
+            job_id: 作业ID
+            score: 排序分数，通常为创建时间戳；分数越小越先被调度
+        """
+        await redis.zadd(JobRedisConfig.waiting_queue_key, {job_id: score})
+
+    @staticmethod
+    async def pop_waiting_job(redis: aioredis.Redis) -> Optional[str]:
+        """原子地取出等待队列中优先级最高的作业 ID，队列为空时返回 None"""
+        result = await redis.zpopmin(JobRedisConfig.waiting_queue_key)
+        return result[0][0] if result else None
+
+    @staticmethod
+    async def remove_waiting_job(redis: aioredis.Redis, job_id: str):
+        """从等待队列中移除作业"""
+        await redis.zrem(JobRedisConfig.waiting_queue_key, job_id)
+
+    @staticmethod
+    async def claim_waiting_job(redis: aioredis.Redis, worker_id: str, lease_seconds: float) -> Optional[str]:
+        """
+        原子地取出等待队列中优先级最高的作业，并由 worker_id 持有租约（租约在 lease_seconds 秒后到期）
+
+        出队和持有租约在同一个事务中完成，worker 在两者之间崩溃时作业不会既不在队列中也没有租约；
+        租约到期后作业由 reclaim_expired_leases 回收。
+
+        Returns:
+            Optional[str]: 作业 ID，队列为空时返回 None
+        """
+        async with redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(JobRedisConfig.waiting_queue_key)
+                    head = await pipe.zrange(JobRedisConfig.waiting_queue_key, 0, 0)
+                    if not head:
+                        return None
+                    job_id = head[0]
+                    pipe.multi()
+                    pipe.zrem(JobRedisConfig.waiting_queue_key, job_id)
+                    pipe.zadd(JobRedisConfig.lease_key, {job_id: time.time() + lease_seconds})
+                    pipe.hset(f"{JobRedisConfig.job_prefix}{job_id}", "worker_id", worker_id)
+                    await pipe.execute()
+                    return job_id
+                except WatchError:
+                    continue
+
+    @staticmethod
+    async def leased_jobs(redis: aioredis.Redis) -> List[str]:
+        """所有 worker 正在执行（持有租约）的作业 ID"""
+        return await redis.zrange(JobRedisConfig.lease_key, 0, -1)
+
+    @staticmethod
+    async def count_waiting_jobs(redis: aioredis.Redis) -> int:
+        """等待队列中的作业数量"""
+        return await redis.zcard(JobRedisConfig.waiting_queue_key)
+
+    @staticmethod
+    async def renew_lease(redis: aioredis.Redis, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """
+        续约（心跳）
+
+        Returns:
+            bool: 续约成功返回 True；租约已被回收或作业已转交其他 worker 时返回 False
+        """
+        owner = await redis.hget(f"{JobRedisConfig.job_prefix}{job_id}", "worker_id")
+        if owner != worker_id:
+            return False
+        # 仅更新已存在的租约，已被回收的租约不会被重新创建
+        renewed = await redis.zadd(
+            JobRedisConfig.lease_key, {job_id: time.time() + lease_seconds}, xx=True, ch=True
+        )
+        return bool(renewed)
+
+    @staticmethod
+    async def release_lease(redis: aioredis.Redis, job_id: str, worker_id: str) -> bool:
+        """
+        释放租约
+
+        Returns:
+            bool: 作业仍由 worker_id 持有时返回 True
+        """
+        key = f"{JobRedisConfig.job_prefix}{job_id}"
+        if await redis.hget(key, "worker_id") != worker_id:
+            return False
+        pipe = redis.pipeline(transaction=True)
+        pipe.zrem(JobRedisConfig.lease_key, job_id)
+        pipe.hdel(key, "worker_id")
+        await pipe.execute()
+        return True
+
+    @staticmethod
+    async def has_lease(redis: aioredis.Redis, job_id: str) -> bool:
+        """作业是否由某个 worker 持有租约（正在执行）"""
+        return await redis.zscore(JobRedisConfig.lease_key, job_id) is not None
+
+    @staticmethod
+    async def reclaim_expired_leases(redis: aioredis.Redis) -> List[str]:
+        """
+        回收租约已过期的作业（持有者崩溃或失联），将其重新放回等待队列
+
+        ZREM 成功的一方才执行回收，多个 worker 同时回收时每个作业只会被重新入队一次。
+        worker 取出作业后、更新为处理中之前崩溃的作业仍是等待状态，按原提交时间重新入队。
+
+        Returns:
+            List[str]: 被重新入队的作业 ID
+        """
+        expired_ids = await redis.zrangebyscore(JobRedisConfig.lease_key, "-inf", time.time())
+        reclaimed = []
+        for job_id in expired_ids:
+            if not await redis.zrem(JobRedisConfig.lease_key, job_id):
+                continue
+            await redis.hdel(f"{JobRedisConfig.job_prefix}{job_id}", "worker_id")
+            job = await JobRedisOperations.get_job(redis, job_id)
+            if not job:
+                continue
+            if job.get("status") == "waiting":
+                await JobRedisOperations.enqueue_job(redis, job_id, parse_time(job["create_time"]).timestamp())
+            elif job.get("status") == "processing":
+                await JobRedisOperations.requeue_for_resume(redis, job_id, job)
+            else:
+                continue
+            reclaimed.append(job_id)
+        return reclaimed
+
+    @staticmethod
+    async def reclaim_orphaned_jobs(redis: aioredis.Redis) -> List[str]:
+        """
+        回收处于处理中但没有任何进程在执行的作业（API 进程在执行作业时重启），将其重新放回等待队列
+
+        通过用户的处理中状态索引查找，仅用于 API 进程内执行模式；持有租约的作业由 worker 负责回收。
+
+        Returns:
+            List[str]: 被重新入队的作业 ID
+        """
+        reclaimed = []
+        match = JobRedisConfig.user_index_key("*", "processing")
+        async for index_key in redis.scan_iter(match=match, count=500):
+            for job_id in await redis.zrange(index_key, 0, -1):
+                if await JobRedisOperations.has_lease(redis, job_id):
+                    continue
+                job = await JobRedisOperations.get_job(redis, job_id)
+                if not job or job.get("status") != "processing":
+                    continue
+                await JobRedisOperations.requeue_for_resume(redis, job_id, job)
+                reclaimed.append(job_id)
+        return reclaimed
+
+    @staticmethod
+    async def requeue_for_resume(redis: aioredis.Redis, job_id: str, job: dict):
+        """将中断的作业标记为等待并按原提交时间重新排队（避免排到队尾），执行时从检查点继续"""
+        job["status"] = "waiting"
+        job["resume"] = True
+        job["update_time"] = get_current_time()
+        await JobRedisOperations.save_job(redis, job_id, job)
+        await JobRedisOperations.enqueue_job(redis, job_id, parse_time(job["create_time"]).timestamp())
+
     @staticmethod
     async def stop_job(redis: aioredis.Redis, job_id: str) -> bool:
         """停止指定的作业"""
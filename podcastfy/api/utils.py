@@ -1,9 +1,10 @@
 import uuid
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 import pytz
 from podcastfy.utils import load_config
 import re
-from typing import Tuple
+from typing import Optional, Tuple
 
 config = load_config()
 timezone_str = config.get('logging', {}).get('timezone', 'Asia/Shanghai')
@@ -20,6 +21,10 @@ def get_current_time(type='str') -> str:
     elif type == 'dt':
         return current_time
 
+def parse_time(time_str: str) -> datetime:
+    """解析 get_current_time 生成的时间字符串"""
+    return datetime.fromisoformat(time_str)
+
 def validate_password(password: str) -> Tuple[bool, str]:
     """
     验证密码复杂度
@@ -53,3 +58,47 @@ def validate_password(password: str) -> Tuple[bool, str]:
         return False, "密码必须包含至少一个特殊字符(!@#$%^&*(),.?\":{}|<>_)"
         
     return True, ""
+
+
+def make_artifact_etag(job_hash: str, job_id: str, kind: str) -> str:
+    """
+    生成作业结果文件的强 ETag
+
+    ETag 由作业哈希、实际生成文件的作业ID和文件类型组成：重复作业指向原始作业的同一个文件，
+    因此共享同一个 ETag；同样内容重新生成的文件属于新的作业，ETag 随之变化。
+
+    Args:
+        job_hash: 作业哈希值
+        job_id: 生成该文件的（原始）作业ID
+        kind: 文件类型，如 audio、text
+    """
+    return f'"{job_hash}-{job_id}-{kind}"'
+
+def is_not_modified(if_none_match: Optional[str], if_modified_since: Optional[str],
+                    etag: str, last_modified: float) -> bool:
+    """
+    根据条件请求头判断客户端缓存是否仍然有效（RFC 9110 第 13 节）
+
+    If-None-Match 存在时只比较 ETag（弱比较），忽略 If-Modified-Since。
+
+    Args:
+        if_none_match: If-None-Match 请求头
+        if_modified_since: If-Modified-Since 请求头
+        etag: 文件当前的 ETag
+        last_modified: 文件的修改时间（时间戳）
+    """
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since is None or since.tzinfo is None:
+            return False
+        # HTTP 日期精确到秒
+        return int(last_modified) <= since.timestamp()
+
+    return False
@@ -0,0 +1,266 @@
+"""
+独立的作业 worker
+
+从 Redis 等待队列中取出作业，并在独立的子进程中执行 generate_podcast，
+避免 pydub、BeautifulSoup、PyMuPDF 等 CPU 密集操作与 API 进程争抢 GIL。
+每个正在执行的作业都持有一个租约，worker 定期续约（心跳）；
+worker 崩溃或失联后租约过期，作业会被其他 worker 回收并重新执行。
+
+启动方式（api_config.yaml 中 job_processing.runner 设置为 worker）：
+
+    python -m podcastfy.api.worker --concurrency 4
+"""
+
+import argparse, asyncio, os, signal, socket, threading, uuid
+import multiprocessing as mp
+from typing import Any, Callable, Dict, Optional
+from redis import asyncio as aioredis
+
+from podcastfy.api.models import JobRedisOperations, RedisClient
+from podcastfy.api.utils import get_current_time
+from podcastfy.api.job_runner import (
+    run_generate_podcast, mark_repeated_if_completed, mark_job_failed, finish_job, cleanup_job_files
+)
+from podcastfy.utils import setup_logger
+from podcastfy.constants import (
+    WORKER_CONCURRENCY, WORKER_LEASE_SECONDS, WORKER_HEARTBEAT_SECONDS, WORKER_POLL_INTERVAL
+)
+
+logger = setup_logger(__name__)
+
+# runner(job_id, job, cancel_event) -> generate_podcast 的返回值，在线程中调用；执行失败时抛出异常
+JobRunner = Callable[[str, dict, threading.Event], Any]
+
+
+def _child_main(job_id: str, job: dict, cancel_event, conn) -> None:
+    """子进程入口：执行作业并通过管道返回结果"""
+    # generate_podcast 只识别 threading.Event，这里把进程间的取消信号转发过去
+    local_cancel = threading.Event()
+
+    def watch_cancel():
+        cancel_event.wait()
+        local_cancel.set()
+
+    threading.Thread(target=watch_cancel, daemon=True).start()
+    try:
+        conn.send(("ok", run_generate_podcast(job_id, job, local_cancel)))
+    except BaseException as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_job_in_process(job_id: str, job: dict, cancel_event: threading.Event) -> Any:
+    """
+    在独立子进程中执行作业（阻塞直到子进程结束）
+
+    cancel_event 被设置后先通知子进程协作式取消，子进程在宽限期内未退出则强制终止。
+
+    Returns:
+        Any: generate_podcast 的返回值
+
+    Raises:
+        RuntimeError: 作业执行失败或子进程异常退出，异常信息作为作业的失败原因
+    """
+    ctx = mp.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    child_cancel = ctx.Event()
+    process = ctx.Process(
+        target=_child_main, args=(job_id, job, child_cancel, child_conn), daemon=True
+    )
+    process.start()
+    child_conn.close()
+
+    try:
+        while True:
+            if parent_conn.poll(0.5):
+                status, payload = parent_conn.recv()
+                if status == "ok":
+                    return payload
+                raise RuntimeError(payload)
+            if not process.is_alive():
+                raise RuntimeError(f"子进程异常退出，退出码 {process.exitcode}")
+            if cancel_event.is_set() and not child_cancel.is_set():
+                child_cancel.set()
+    except EOFError:
+        raise RuntimeError("子进程未返回结果")
+    finally:
+        process.join(timeout=WORKER_HEARTBEAT_SECONDS)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        parent_conn.close()
+
+
+class JobWorker:
+    """从 Redis 等待队列中拉取作业并执行的 worker"""
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        concurrency: int = WORKER_CONCURRENCY,
+        lease_seconds: float = WORKER_LEASE_SECONDS,
+        heartbeat_seconds: float = WORKER_HEARTBEAT_SECONDS,
+        poll_interval: float = WORKER_POLL_INTERVAL,
+        runner: JobRunner = run_job_in_process,
+        worker_id: Optional[str] = None,
+    ):
+        self.redis = redis
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_interval = poll_interval
+        self.runner = runner
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # 正在执行的作业：job_id -> 取消事件
+        self.running: Dict[str, threading.Event] = {}
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """停止拉取新作业，已开始的作业执行完毕后 run 返回"""
+        self._stopping.set()
+
+    async def run(self):
+        """主循环：回收过期租约、拉取作业并执行，直到 stop 被调用"""
+        logger.info(f"worker {self.worker_id} 启动，并发数 {self.concurrency}")
+        tasks = set()
+        try:
+            while not self._stopping.is_set():
+                reclaimed = await JobRedisOperations.reclaim_expired_leases(self.redis)
+                if reclaimed:
+                    logger.warning(f"回收了租约过期的作业: {reclaimed}")
+
+                started = False
+                while len(self.running) < self.concurrency:
+                    job_id = await self.claim_next_job()
+                    if job_id is None:
+                        break
+                    task = asyncio.create_task(self.process_job(job_id))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    started = True
+
+                if not started:
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"worker {self.worker_id} 已停止")
+
+    async def claim_next_job(self) -> Optional[str]:
+        """
+        从等待队列取出下一个可执行的作业，并将其标记为处理中、持有租约
+
+        Returns:
+            Optional[str]: 作业 ID；队列为空时返回 None
+        """
+        while True:
+            # 出队的同时持有租约，崩溃后作业可以通过租约回收
+            job_id = await JobRedisOperations.claim_waiting_job(self.redis, self.worker_id, self.lease_seconds)
+            if job_id is None:
+                return None
+
+            job = await JobRedisOperations.get_job(self.redis, job_id)
+            if not job or job.get("status") != "waiting":
+                await JobRedisOperations.release_lease(self.redis, job_id, self.worker_id)
+                continue
+
+            if await mark_repeated_if_completed(self.redis, job_id, job):
+                await JobRedisOperations.release_lease(self.redis, job_id, self.worker_id)
+                await cleanup_job_files(self.redis, job_id)
+                continue
+
+            await JobRedisOperations.save_job_hash(self.redis, job["job_hash"], job_id)
+            job["status"] = "processing"
+            job["update_time"] = get_current_time()
+            await JobRedisOperations.save_job(self.redis, job_id, job)
+            self.running[job_id] = threading.Event()
+            return job_id
+
+    async def process_job(self, job_id: str):
+        """执行已持有租约的作业，执行期间定期续约"""
+        cancel_event = self.running[job_id]
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, cancel_event))
+        try:
+            job = await JobRedisOperations.get_job(self.redis, job_id)
+            logger.info(f"worker {self.worker_id} 开始处理作业 {job_id}")
+            # 执行失败时保留错误信息作为失败原因
+            result, error = None, None
+            try:
+                result = await asyncio.to_thread(self.runner, job_id, job, cancel_event)
+            except Exception as e:
+                error = str(e)
+
+            heartbeat.cancel()
+            # 租约已丢失说明作业已被回收并交给其他 worker，不能再写入结果
+            if not await JobRedisOperations.release_lease(self.redis, job_id, self.worker_id):
+                logger.warning(f"作业 {job_id} 的租约已丢失，丢弃执行结果")
+                return
+
+            await finish_job(self.redis, job_id, result, error)
+            await cleanup_job_files(self.redis, job_id)
+        except Exception as e:
+            logger.error(f"处理作业 {job_id} 时发生异常: {str(e)}", exc_info=True)
+            if await JobRedisOperations.release_lease(self.redis, job_id, self.worker_id):
+                await mark_job_failed(self.redis, job_id, str(e))
+        finally:
+            heartbeat.cancel()
+            self.running.pop(job_id, None)
+
+    async def _heartbeat(self, job_id: str, cancel_event: threading.Event):
+        """定期续约；租约丢失或作业被停止时通知作业取消"""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                renewed = await JobRedisOperations.renew_lease(
+                    self.redis, job_id, self.worker_id, self.lease_seconds
+                )
+                job = await JobRedisOperations.get_job(self.redis, job_id)
+            except Exception as e:
+                # Redis 暂时不可用时继续执行，租约到期前恢复即可
+                logger.warning(f"作业 {job_id} 续约失败: {str(e)}")
+                continue
+
+            if not renewed:
+                logger.warning(f"作业 {job_id} 的租约已丢失，取消执行")
+                cancel_event.set()
+                return
+            if not job or job.get("status") == "stopped":
+                logger.info(f"作业 {job_id} 已被停止，取消执行")
+                cancel_event.set()
+                return
+
+
+async def run_worker(concurrency: int) -> None:
+    """连接 Redis 并运行 worker，收到 SIGINT/SIGTERM 后等待已开始的作业结束再退出"""
+    redis = await RedisClient.get_job_instance()
+    worker = JobWorker(redis, concurrency=concurrency)
+
+    loop = asyncio.get_running_loop()
+    try:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.stop)
+    except (NotImplementedError, RuntimeError):
+        # Windows 不支持 add_signal_handler
+        pass
+
+    try:
+        await worker.run()
+    finally:
+        await RedisClient.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Podcastfy 作业 worker")
+    parser.add_argument(
+        "--concurrency", type=int, default=WORKER_CONCURRENCY, help="同时执行的作业数"
+    )
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
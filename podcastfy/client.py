@@ -6,15 +6,19 @@ from URLs or existing transcript files. It orchestrates the content extraction,
 generation, and text-to-speech conversion processes.
 """
 
+import hashlib
 import os
 import uuid
 import typer
 import yaml
 from podcastfy.content_parser.content_extractor import ContentExtractor
+from podcastfy.content_parser.extraction_cache import file_digest
 from podcastfy.content_generator import ContentGenerator
 from podcastfy.text_to_speech import TextToSpeech
 from podcastfy.utils.config import Config, load_config
 from podcastfy.utils.config_conversation import load_conversation_config
+from podcastfy.utils.artifact_cache import ArtifactCache, get_artifact_cache, stage_key
+from podcastfy.utils.checkpoint import JobCheckpoint
 from podcastfy.utils.logger import setup_logger
 from typing import List, Optional, Dict, Any, Union
 import copy
@@ -47,6 +51,63 @@ def get_api_key_name(model_name: str) -> str:
     # raise ValueError(f"未找到模型 {model_name} 对应的API key")
 
 
+def _setup_artifact_cache(config: Config) -> Optional[ArtifactCache]:
+    """Get the shared stage artifact cache if enabled in the config."""
+    cache_config = config.get("artifact_cache", {})
+    if not cache_config or not cache_config.get("enabled", False):
+        return None
+    return get_artifact_cache(cache_config.get("directory", "data/cache/artifacts"))
+
+
+def _transcript_stage_inputs(
+    config: Config,
+    conv_config: Config,
+    content: str,
+    image_paths: Optional[List[str]],
+    is_local: bool,
+) -> Dict[str, Any]:
+    """
+    Collect the inputs that determine the transcript: the extracted content, images and
+    the generation settings. Text-to-speech settings are left out so that changing a
+    voice or TTS model reuses the transcript.
+    """
+    generator_config = config.get("content_generator", {})
+    if hasattr(generator_config, "to_dict"):
+        generator_config = generator_config.to_dict()
+    generator_config = dict(generator_config)
+    generator_config.pop("prompt_cache_directory", None)
+
+    conversation = conv_config.to_dict()
+    conversation.pop("text_to_speech", None)
+
+    return {
+        "content": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        "images": [
+            file_digest(path) if os.path.isfile(path) else path
+            for path in image_paths or []
+        ],
+        "is_local": is_local,
+        "content_generator": generator_config,
+        "conversation": conversation,
+    }
+
+
+def _audio_stage_inputs(transcript: str, tts_model: str, tts_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Collect the inputs that determine the final audio: the transcript and the settings
+    of the selected TTS provider. Output and cache locations are left out.
+    """
+    settings = {}
+    for key in (tts_model, "audio_format", "merge_engine", "ending_message"):
+        value = tts_config.get(key)
+        settings[key] = value.to_dict() if hasattr(value, "to_dict") else value
+    return {
+        "transcript": hashlib.sha256(transcript.encode("utf-8")).hexdigest(),
+        "tts_model": tts_model,
+        "settings": settings,
+    }
+
+
 @check_cancelled
 def process_content(
     urls=None,
@@ -59,10 +120,15 @@ def process_content(
     is_local: bool = False,
     text: Optional[str] = None,
     job_id: Optional[str] = None,
-    cancel_event: Optional[threading.Event] = None
+    cancel_event: Optional[threading.Event] = None,
+    resume: bool = False
 ):
     """
     Process URLs, a transcript file, image paths, or raw text to generate a podcast or transcript.
+
+    When a job_id is given, each completed stage (extracted text, transcript, audio segments)
+    is checkpointed in the job's temp_audio_dir. With ``resume``, a job that was interrupted
+    picks up after its last completed stage and only synthesizes the missing segments.
     """
     try:
         if config is None:
@@ -79,26 +145,75 @@ def process_content(
         tts_config = conv_config.get("text_to_speech", {})
         output_directories = tts_config.get("output_directories", {})
 
+        text_to_speech = None
+        if generate_audio:
+            api_key = None
+            if tts_model != "edge":
+                api_key = getattr(config, f"{tts_model.upper()}_API_KEY")
+
+            text_to_speech = TextToSpeech(
+                model=tts_model,
+                api_key=api_key,
+                conversation_config=conv_config.to_dict(),
+            )
+
+            audio_filename = "podcast_{}.mp3".format(job_id if job_id else uuid.uuid4().hex)
+            audio_file = os.path.join(
+                output_directories.get("audio", "data/audio"), 
+                audio_filename
+            )
+
+        # Synthesize turns while the LLM is still generating; the Gemini multi-speaker
+        # provider synthesizes the whole transcript in one request and cannot stream
+        streaming = (
+            text_to_speech is not None
+            and not transcript_file
+            and tts_config.get("streaming", False)
+            and tts_model != "gemini"
+        )
+
+        artifact_cache = _setup_artifact_cache(config)
+        qa_content = None
+
+        checkpoint = None
+        stages = {}
+        if job_id and tts_config.get("temp_audio_dir"):
+            checkpoint = JobCheckpoint(tts_config.get("temp_audio_dir"), job_id)
+            if resume:
+                stages = checkpoint.load()
+                logger.info(f"Resuming job {job_id} from checkpoint: {sorted(stages)}")
+        # Segments on disk belong to the checkpointed transcript only
+        resume_segments = "transcript_file" in stages
+
         if transcript_file:
             logger.info(f"Using transcript file: {transcript_file}")
             with open(transcript_file, "r") as file:
                 qa_content = file.read()
+            transcript_filepath = transcript_file
+        elif resume_segments:
+            transcript_filepath = stages["transcript_file"]
+            logger.info(f"Using checkpointed transcript: {transcript_filepath}")
+            with open(transcript_filepath, "r") as file:
+                qa_content = file.read()
+            streaming = False
         else:
-            content_generator = ContentGenerator(
-                api_key=config.GEMINI_API_KEY, 
-                conversation_config=conv_config.to_dict()
-            )
+            if "extracted_text" in stages:
+                with open(stages["extracted_text"], "r", encoding="utf-8") as file:
+                    combined_content = file.read()
+            else:
+                combined_content = ""
 
-            combined_content = ""
+                if urls:
+                    logger.info(f"Processing {len(urls)} links")
+                    content_extractor = ContentExtractor()
+                    contents = content_extractor.extract_contents(urls)
+                    combined_content += "\n\n".join(contents)
 
-            if urls:
-                logger.info(f"Processing {len(urls)} links")
-                content_extractor = ContentExtractor()
-                contents = [content_extractor.extract_content(link) for link in urls]
-                combined_content += "\n\n".join(contents)
+                if text:
+                    combined_content += f"\n\n{text}"
 
-            if text:
-                combined_content += f"\n\n{text}"
+                if checkpoint:
+                    checkpoint.save_extracted_text(combined_content)
 
             # Generate Q&A content using output directory from conversation config
             ts_filename = "transcript_{}.txt".format(job_id if job_id else uuid.uuid4().hex)
@@ -107,41 +222,73 @@ def process_content(
                 ts_filename,
             )
 
-            model_name = config.content_generator.llm_model
-            api_key_label = get_api_key_name(model_name)
-            
-            qa_content = content_generator.generate_qa_content(
-                combined_content,
-                image_file_paths=image_paths or [],
-                output_filepath=transcript_filepath,
-                is_local=is_local,
-                model_name=model_name,
-                api_key_label=api_key_label,
-                cancel_event=cancel_event
-            )
+            # Reuse the transcript of an earlier job with the same content and generation settings
+            transcript_key = None
+            if artifact_cache:
+                transcript_key = stage_key(
+                    "transcript",
+                    _transcript_stage_inputs(config, conv_config, combined_content, image_paths, is_local),
+                )
+                if artifact_cache.fetch("transcript", transcript_key, transcript_filepath):
+                    with open(transcript_filepath, "r") as file:
+                        qa_content = file.read()
+                    streaming = False
+
+            if qa_content is None:
+                content_generator = ContentGenerator(
+                    api_key=config.GEMINI_API_KEY, 
+                    conversation_config=conv_config.to_dict()
+                )
 
-        if generate_audio:
-            api_key = None
-            if tts_model != "edge":
-                api_key = getattr(config, f"{tts_model.upper()}_API_KEY")
+                model_name = config.content_generator.llm_model
+                api_key_label = get_api_key_name(model_name)
+                generation_kwargs = dict(
+                    image_file_paths=image_paths or [],
+                    output_filepath=transcript_filepath,
+                    is_local=is_local,
+                    model_name=model_name,
+                    api_key_label=api_key_label,
+                    cancel_event=cancel_event
+                )
 
-            text_to_speech = TextToSpeech(
-                model=tts_model,
-                api_key=api_key,
-                conversation_config=conv_config.to_dict(),
-            )
+                if streaming:
+                    logger.info("Streaming transcript turns to text-to-speech")
+                    text_to_speech.convert_stream_to_speech(
+                        content_generator.stream_qa_content(combined_content, **generation_kwargs),
+                        audio_file,
+                        job_id,
+                        cancel_event=cancel_event
+                    )
+                    qa_content = content_generator.response
+                else:
+                    qa_content = content_generator.generate_qa_content(
+                        combined_content, **generation_kwargs
+                    )
+
+                if artifact_cache:
+                    artifact_cache.put("transcript", transcript_key, transcript_filepath)
+
+            if checkpoint:
+                checkpoint.save_transcript(transcript_filepath)
 
-            audio_filename = "podcast_{}.mp3".format(job_id if job_id else uuid.uuid4().hex)
-            audio_file = os.path.join(
-                output_directories.get("audio", "data/audio"), 
-                audio_filename
-            )
-            text_to_speech.convert_to_speech(
-                qa_content, 
-                audio_file, 
-                job_id,
-                cancel_event=cancel_event
-            )
+        if generate_audio:
+            # Reuse the audio of an earlier job with the same transcript and TTS settings
+            audio_key = None
+            audio_cached = False
+            if artifact_cache:
+                audio_key = stage_key("audio", _audio_stage_inputs(qa_content, tts_model, tts_config))
+                audio_cached = not streaming and artifact_cache.fetch("audio", audio_key, audio_file)
+
+            if not streaming and not audio_cached:
+                text_to_speech.convert_to_speech(
+                    qa_content, 
+                    audio_file, 
+                    job_id,
+                    cancel_event=cancel_event,
+                    resume=resume_segments
+                )
+            if artifact_cache and not audio_cached:
+                artifact_cache.put("audio", audio_key, audio_file)
             logger.info(f"Podcast generated successfully using {tts_model} TTS model")
             return audio_file, transcript_filepath
         else:
@@ -279,7 +426,8 @@ def generate_podcast(
     is_local: bool = False,
     text: Optional[str] = None,
     job_id: Optional[str] = None,
-    cancel_event: Optional[threading.Event] = None
+    cancel_event: Optional[threading.Event] = None,
+    resume: bool = False
 ) -> Optional[str]:
     """
     Generate a podcast or transcript from a list of URLs, a file containing URLs, a transcript file, or image files.
@@ -298,6 +446,7 @@ def generate_podcast(
         llm_model_name (Optional[str]): LLM model name for content generation.
         api_key_label (Optional[str]): Environment variable name for LLM API key.
         cancel_event: Optional event to check for cancellation
+        resume (bool): Resume the job from its checkpointed stages. Requires job_id.
 
     Returns:
         Optional[str]: Path to the final podcast audio file, or None if only generating a transcript.
@@ -340,7 +489,8 @@ def generate_podcast(
                 is_local=is_local,
                 text=text,
                 job_id=job_id,
-                cancel_event=cancel_event
+                cancel_event=cancel_event,
+                resume=resume
             )
         else:
             urls_list = urls or []
@@ -363,7 +513,8 @@ def generate_podcast(
                 is_local=is_local,
                 text=text,
                 job_id=job_id,
-                cancel_event=cancel_event
+                cancel_event=cancel_event,
+                resume=resume
             )
 
     except Exception as e:
@@ -14,16 +14,28 @@ MAX_CONCURRENT_JOBS = api_config['job_processing']['max_concurrent_jobs']
 TEMP_DIRECTORY = api_config['job_processing']['temp_directory']
 OUTPUT_DIRECTORY = api_config['job_processing']['output_directory']
 JOB_EXPIRE_DAYS = api_config['job_processing']['job_expire_days']
+PARTIAL_AUDIO_POLL_INTERVAL = api_config['job_processing'].get('partial_audio_poll_interval', 1)
+JOB_RUNNER = api_config['job_processing'].get('runner', 'inline')
+
+# worker 相关配置
+worker_config = api_config.get('worker', {})
+WORKER_CONCURRENCY = worker_config.get('concurrency', 2)
+WORKER_LEASE_SECONDS = worker_config.get('lease_seconds', 60)
+WORKER_HEARTBEAT_SECONDS = worker_config.get('heartbeat_seconds', 15)
+WORKER_POLL_INTERVAL = worker_config.get('poll_interval', 1)
 
 # Redis 相关配置
 REDIS_URL = api_config['redis']['url']
 JOB_PREFIX = api_config['redis']['prefix']['job']
 JOB_HASH_PREFIX = api_config['redis']['prefix']['job_hash']
+JOB_QUEUE_PREFIX = api_config['redis']['prefix']['queue']
+JOB_INDEX_PREFIX = api_config['redis']['prefix']['index']
 
 # 文件处理配置
 ALLOWED_EXTENSIONS = api_config['file_handling']['allowed_extensions']
 MAX_FILE_SIZE_MB = api_config['file_handling']['max_file_size_mb']
 CLEANUP_ON_COMPLETE = api_config['file_handling']['cleanup_on_complete']
+DOWNLOAD_CACHE_CONTROL = api_config['file_handling'].get('download_cache_control', 'private, max-age=3600')
 
 # API TEST 相关配置
 API_TEST_BASE_URL = api_config['api_test']['base_url']
@@ -7,18 +7,22 @@ provides methods to generate and save the generated content.
 """
 
 import os
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import re
 import threading
 
 from langchain_community.chat_models import ChatLiteLLM
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.llms.llamafile import Llamafile
+from langchain_core.language_models import BaseLanguageModel
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain import hub
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 from podcastfy.utils.config_conversation import load_conversation_config
 from podcastfy.utils.config import load_config
+from podcastfy.utils.prompt_registry import PromptRegistry, get_prompt_registry
+from podcastfy.utils.transcript import TurnStreamParser, parse_transcript, render_transcript, strip_markup
 import logging
 from langchain.prompts import HumanMessagePromptTemplate
 from .utils.decorators import check_cancelled
@@ -26,6 +30,23 @@ from langchain.callbacks.base import BaseCallbackHandler
 
 logger = logging.getLogger(__name__)
 
+# Rough characters-per-token ratio used to size chunks without a model-specific tokenizer
+CHARS_PER_TOKEN = 4
+
+# SSML tags supported by both OpenAI and ElevenLabs, kept when cleaning transcripts
+SUPPORTED_SSML_TAGS = ["speak", "lang", "p", "phoneme", "s", "sub"]
+
+CHUNK_SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    (
+        "system",
+        "You are preparing research notes for a podcast. The source material is split into "
+        "{total} parts; you are given part {index}. Extract its key facts, arguments, figures, "
+        "names and notable quotes as concise bullet-point notes in {output_language}. "
+        "Do not add information that is not in the text.",
+    ),
+    ("human", "{chunk}"),
+])
+
 
 class LLMBackend:
     def __init__(
@@ -130,9 +151,83 @@ class CancellationCallback(BaseCallbackHandler):
         pass
 
 
+@lru_cache(maxsize=128)
+def compose_prompt(
+    registry: PromptRegistry,
+    template_name: str,
+    template_commit: str,
+    num_images: int,
+    user_instructions: str,
+) -> Tuple[ChatPromptTemplate, Tuple[str, ...]]:
+    """
+    Compose the chat prompt from the registry template, user instructions and image slots.
+
+    Composed prompts are memoized, so after the first job with a given
+    (template, commit, num_images, user_instructions) this is a dictionary lookup.
+
+    Args:
+        registry (PromptRegistry): Registry providing the base template.
+        template_name (str): Hub template name.
+        template_commit (str): Hub commit hash.
+        num_images (int): Number of image inputs.
+        user_instructions (str): Instructions appended to the system message.
+
+    Returns:
+        Tuple[ChatPromptTemplate, Tuple[str, ...]]: The composed prompt and the image path keys.
+    """
+    prompt_template = registry.get(template_name, template_commit)
+
+    image_path_keys = []
+    messages = []
+
+    # Only add text content if input_text is not empty
+    text_content = {
+        "type": "text",
+        "text": "Please analyze this input and generate a conversation. {input_text}",
+    }
+    messages.append(text_content)
+
+    for i in range(num_images):
+        key = f"image_path_{i}"
+        image_content = {
+            "image_url": {"path": f"{{{key}}}", "detail": "high"},
+            "type": "image_url",
+        }
+        image_path_keys.append(key)
+        messages.append(image_content)
+
+    user_prompt_template = ChatPromptTemplate.from_messages(
+        messages=[HumanMessagePromptTemplate.from_template(messages)]
+    )
+
+    user_instructions = (
+        "[[MAKE SURE TO FOLLOW THESE INSTRUCTIONS OVERRIDING THE PROMPT TEMPLATE IN CASE OF CONFLICT: "
+        + user_instructions
+        + "]]"
+    )
+
+    new_system_message = (
+        prompt_template.messages[0].prompt.template + "\n" + user_instructions
+    )
+
+    # Compose messages from podcastfy_prompt_template and user_prompt_template
+    combined_messages = (
+        ChatPromptTemplate.from_messages([new_system_message]).messages
+        + user_prompt_template.messages
+    )
+
+    # Create a new ChatPromptTemplate object with the combined messages
+    composed_prompt_template = ChatPromptTemplate.from_messages(combined_messages)
+
+    return composed_prompt_template, tuple(image_path_keys)
+
+
 class ContentGenerator:
     def __init__(
-        self, api_key: str, conversation_config: Optional[Dict[str, Any]] = None
+        self,
+        api_key: str,
+        conversation_config: Optional[Dict[str, Any]] = None,
+        llm: Optional[BaseLanguageModel] = None,
     ):
         """
         Initialize the ContentGenerator.
@@ -140,7 +235,10 @@ class ContentGenerator:
         Args:
                 api_key (str): API key for Google's Generative AI.
                 con versation_config (Optional[Dict[str, Any]]): Custom conversation configuration.
+                llm (Optional[BaseLanguageModel]): Language model to use instead of building one
+                    from the model name (e.g. a fake model in tests).
         """
+        self.llm = llm
         os.environ["GOOGLE_API_KEY"] = api_key
         self.config = load_config()
         self.content_generator_config = self.config.get("content_generator", {})
@@ -157,69 +255,92 @@ class ContentGenerator:
         if transcripts_dir and not os.path.exists(transcripts_dir):
             os.makedirs(transcripts_dir)
 
+        self.prompt_registry = get_prompt_registry(
+            self.content_generator_config.get("prompt_cache_directory", "data/cache/prompts")
+        )
+
     def __compose_prompt(self, num_images: int):
         """
         Compose the prompt for the LLM based on the content list.
         """
-        prompt_template = hub.pull(
-            self.config.get("content_generator", {}).get(
-                "prompt_template", 
-                "souzatharsis/podcastfy_multimodal_cleanmarkup"
-            )
-            + ":"
-            + self.config.get("content_generator", {}).get("prompt_commit", "3d5b42fc")
+        prompt_template, image_path_keys = compose_prompt(
+            self.prompt_registry,
+            self.content_generator_config.get(
+                "prompt_template", "souzatharsis/podcastfy_multimodal_cleanmarkup"
+            ),
+            self.content_generator_config.get("prompt_commit", "3d5b42fc"),
+            num_images,
+            self.config_conversation.get("user_instructions", ""),
         )
+        return prompt_template, list(image_path_keys)
 
-        image_path_keys = []
-        messages = []
+    def split_input(self, input_texts: str) -> List[str]:
+        """
+        Split the input into chunks of at most `chunking.chunk_tokens` estimated tokens.
 
-        # Only add text content if input_text is not empty
-        text_content = {
-            "type": "text",
-            "text": "Please analyze this input and generate a conversation. {input_text}",
-        }
-        messages.append(text_content)
-
-        for i in range(num_images):
-            key = f"image_path_{i}"
-            image_content = {
-                "image_url": {"path": f"{{{key}}}", "detail": "high"},
-                "type": "image_url",
-            }
-            image_path_keys.append(key)
-            messages.append(image_content)
-
-        user_prompt_template = ChatPromptTemplate.from_messages(
-            messages=[HumanMessagePromptTemplate.from_template(messages)]
-        )
-        user_instructions = self.config_conversation.get("user_instructions", "")
+        Args:
+            input_texts (str): Combined input text.
 
-        user_instructions = (
-            "[[MAKE SURE TO FOLLOW THESE INSTRUCTIONS OVERRIDING THE PROMPT TEMPLATE IN CASE OF CONFLICT: "
-            + user_instructions
-            + "]]"
+        Returns:
+            List[str]: The chunks, or a single-element list if the input fits under
+            `chunking.threshold_tokens` or chunking is disabled.
+        """
+        chunking = self.content_generator_config.get("chunking", {})
+        threshold = chunking.get("threshold_tokens", 32000) * CHARS_PER_TOKEN
+        if not chunking or not chunking.get("enabled", False) or len(input_texts) <= threshold:
+            return [input_texts]
+
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunking.get("chunk_tokens", 8000) * CHARS_PER_TOKEN,
+            chunk_overlap=chunking.get("chunk_overlap_tokens", 200) * CHARS_PER_TOKEN,
         )
+        return splitter.split_text(input_texts)
 
-        new_system_message = (
-            prompt_template.messages[0].prompt.template + "\n" + user_instructions
-        )
+    def __reduce_input(
+        self,
+        input_texts: str,
+        llm: BaseLanguageModel,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> str:
+        """
+        Summarize long input chunk by chunk (map step) so that the dialogue is
+        generated from the combined notes (reduce step).
 
-        # Create new prompt with updated system message
-        # prompt_template = ChatPromptTemplate.from_messages([
-        #    SystemMessagePromptTemplate.from_template(new_system_message),
-        #    HumanMessagePromptTemplate.from_template(messages)
-        # ])
+        Args:
+            input_texts (str): Combined input text.
+            llm (BaseLanguageModel): Language model used for the summaries.
+            cancel_event (Optional[threading.Event]): Event to check for cancellation.
 
-        # Compose messages from podcastfy_prompt_template and user_prompt_template
-        combined_messages = (
-            ChatPromptTemplate.from_messages([new_system_message]).messages
-            + user_prompt_template.messages
+        Returns:
+            str: The input itself if it needs no chunking, otherwise the chunk notes in order.
+        """
+        chunks = self.split_input(input_texts)
+        if len(chunks) == 1:
+            return input_texts
+
+        max_concurrency = self.content_generator_config.get("chunking", {}).get("max_concurrency", 4)
+        logger.info(f"Summarizing {len(chunks)} input chunks with concurrency {max_concurrency}")
+        summary_chain = CHUNK_SUMMARY_PROMPT | llm | self.parser
+        notes = summary_chain.batch(
+            [
+                {
+                    "chunk": chunk,
+                    "index": index,
+                    "total": len(chunks),
+                    "output_language": self.config_conversation.get("output_language"),
+                }
+                for index, chunk in enumerate(chunks, start=1)
+            ],
+            config={"max_concurrency": max_concurrency},
         )
 
-        # Create a new ChatPromptTemplate object with the combined messages
-        composed_prompt_template = ChatPromptTemplate.from_messages(combined_messages)
+        if cancel_event and cancel_event.is_set():
+            raise Exception("Operation cancelled by user")
 
-        return composed_prompt_template, image_path_keys
+        return "\n\n".join(
+            f"Notes on part {index} of {len(chunks)}:\n{note.strip()}"
+            for index, note in enumerate(notes, start=1)
+        )
 
     def __compose_prompt_params(
         self, image_file_paths: List[str], image_path_keys: List[str], input_texts: str
@@ -315,6 +436,70 @@ class ContentGenerator:
         Raises:
             Exception: If there's an error in generating content.
         """
+        prompt_params = self.__prepare_chain(
+            input_texts, image_file_paths, is_local, model_name, api_key_label, cancel_event
+        )
+
+        self.response = self.chain.invoke(prompt_params)
+        self.response = self.__clean_tss_markup(self.response)
+        self.__save_response(output_filepath)
+
+        return self.response
+
+    def stream_qa_content(
+        self,
+        input_texts: str = "",
+        image_file_paths: List[str] = [],
+        output_filepath: Optional[str] = None,
+        is_local: bool = False,
+        model_name: str = None,
+        api_key_label: str = "OPENAI_API_KEY",
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Generate Q&A content, yielding each dialogue turn as soon as the LLM finishes it.
+
+        Takes the same arguments as generate_qa_content. Once the stream is exhausted,
+        the full cleaned response is available as `self.response` and saved to
+        `output_filepath` like generate_qa_content does.
+
+        Yields:
+            Tuple[str, str]: (speaker tag, turn text) pairs in transcript order, with the
+                markup cleaned like the full response.
+
+        Raises:
+            Exception: If there's an error in generating content or the operation is cancelled.
+        """
+        prompt_params = self.__prepare_chain(
+            input_texts, image_file_paths, is_local, model_name, api_key_label, cancel_event
+        )
+
+        parser = TurnStreamParser()
+        chunks = []
+        for chunk in self.chain.stream(prompt_params):
+            if cancel_event and cancel_event.is_set():
+                raise Exception("Operation cancelled by user")
+            chunks.append(chunk)
+            for speaker, text in parser.feed(chunk):
+                yield speaker, self.__clean_turn(text)
+        for speaker, text in parser.finish():
+            yield speaker, self.__clean_turn(text)
+
+        self.response = self.__clean_tss_markup("".join(chunks))
+        self.__save_response(output_filepath)
+
+    def __prepare_chain(
+        self,
+        input_texts: str,
+        image_file_paths: List[str],
+        is_local: bool,
+        model_name: Optional[str],
+        api_key_label: str,
+        cancel_event: Optional[threading.Event],
+    ) -> Dict[str, Any]:
+        """
+        Build `self.chain` for the requested model and return its prompt parameters.
+        """
         if not model_name:
             model_name = self.content_generator_config.get(
                 "gemini_model", "gemini-1.5-pro-latest"
@@ -322,77 +507,58 @@ class ContentGenerator:
         if is_local:
             model_name = "User provided local model"
             
-        llmbackend = LLMBackend(
-            is_local=is_local,
-            temperature=self.config_conversation.get("creativity", 0),
-            max_output_tokens=self.content_generator_config.get(
-                "max_output_tokens", 8192
-            ),
-            model_name=model_name,
-            api_key_label=api_key_label,
-            cancel_event=cancel_event
-        )
+        llm = self.llm
+        if llm is None:
+            llm = LLMBackend(
+                is_local=is_local,
+                temperature=self.config_conversation.get("creativity", 0),
+                max_output_tokens=self.content_generator_config.get(
+                    "max_output_tokens", 8192
+                ),
+                model_name=model_name,
+                api_key_label=api_key_label,
+                cancel_event=cancel_event
+            ).llm
+
+        self.parser = StrOutputParser()
+        input_texts = self.__reduce_input(input_texts, llm, cancel_event)
 
         num_images = 0 if is_local else len(image_file_paths)
         self.prompt_template, image_path_keys = self.__compose_prompt(num_images)
-        self.parser = StrOutputParser()
-        self.chain = self.prompt_template | llmbackend.llm | self.parser
+        self.chain = self.prompt_template | llm | self.parser
 
-        prompt_params = self.__compose_prompt_params(
+        return self.__compose_prompt_params(
             image_file_paths, image_path_keys, input_texts
         )
 
-        self.response = self.chain.invoke(prompt_params)
-        self.response = self.__clean_tss_markup(self.response)
-
+    def __save_response(self, output_filepath: Optional[str]) -> None:
+        """Write the generated response to `output_filepath` if given."""
         if output_filepath:
             with open(output_filepath, "w") as file:
                 file.write(self.response)
             logger.info(f"Response content saved to {output_filepath}")
 
-        return self.response
-
-
-    def __clean_tss_markup(self, input_text: str, additional_tags: List[str] = ["Person1", "Person2"]) -> str:
+    def __clean_tss_markup(self, input_text: str, additional_tags: Optional[List[str]] = None) -> str:
         """
         Remove unsupported TSS markup tags from the input text while preserving supported SSML tags.
 
         Args:
             input_text (str): The input text containing TSS markup tags.
-			additional_tags (List[str]): Optional list of additional tags to preserve. Defaults to ["Person1", "Person2"].
+			additional_tags (Optional[List[str]]): Speaker tags to preserve. Defaults to any PersonN tag.
 
 		Returns:
 			str: Cleaned text with unsupported TSS markup tags removed.
 		"""
-        # List of SSML tags supported by both OpenAI and ElevenLabs
-        supported_tags = [
-            "speak", "lang", "p", "phoneme",
-            "s", "sub"
-        ]
-
-        # Append additional tags to the supported tags list
-        supported_tags.extend(additional_tags)
-
-        # Create a pattern that matches any tag not in the supported list
-        pattern = r'</?(?!(?:' + '|'.join(supported_tags) + r')\b)[^>]+>'
-
-        # Remove unsupported tags
-        cleaned_text = re.sub(pattern, '', input_text)
-
-        # Remove any leftover empty lines
-        cleaned_text = re.sub(r'\n\s*\n', '\n', cleaned_text)
-
-        # Ensure closing tags for additional tags are preserved
-        for tag in additional_tags:
-            cleaned_text = re.sub(
-                f'<{tag}>(.*?)(?=<(?:{"|".join(additional_tags)})>|$)',
-                f'<{tag}>\\1</{tag}>',
-                cleaned_text,
-                flags=re.DOTALL
-            )
+        cleaned_text = render_transcript(
+            parse_transcript(input_text, SUPPORTED_SSML_TAGS, speakers=additional_tags)
+        )
 
         return cleaned_text.replace('(scratchpad)', '').strip()
 
+    def __clean_turn(self, text: str) -> str:
+        """Clean the text of a single streamed turn the way __clean_tss_markup cleans a full response."""
+        return strip_markup(text, SUPPORTED_SSML_TAGS).replace('(scratchpad)', '').strip()
+
 
 
 
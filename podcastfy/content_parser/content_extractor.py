@@ -7,16 +7,26 @@ extraction, delegating to specialized extractors based on the source type.
 """
 
 import logging
+import multiprocessing
 import re
-from typing import List, Union
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Union
 from urllib.parse import urlparse
 from .youtube_transcriber import YouTubeTranscriber
 from .website_extractor import WebsiteExtractor
 from .pdf_extractor import PDFExtractor
+from .extraction_cache import ExtractionCache, file_digest, get_extraction_cache, normalize_url
 from podcastfy.utils.config import load_config
 
 logger = logging.getLogger(__name__)
 
+
+def _extract_pdf(file_path: str) -> str:
+	"""Extract a PDF in a worker process (module-level so it can be pickled)."""
+	return PDFExtractor().extract_content(file_path)
+
+
 class ContentExtractor:
 	def __init__(self):
 		"""
@@ -27,6 +37,18 @@ class ContentExtractor:
 		self.pdf_extractor = PDFExtractor()
 		self.config = load_config()
 		self.content_extractor_config = self.config.get('content_extractor', {})
+		self.extraction_cache = self._setup_extraction_cache()
+
+	def _setup_extraction_cache(self) -> Optional[ExtractionCache]:
+		"""Get the shared extraction cache if enabled in the content_extractor config."""
+		cache_config = self.content_extractor_config.get('cache')
+		if not cache_config or not cache_config.get('enabled', False):
+			return None
+		ttl = cache_config.get('ttl')
+		return get_extraction_cache(
+			cache_config.get('directory', 'data/cache/extraction'),
+			ttl.to_dict() if ttl else {},
+		)
 
 	def is_url(self, source: str) -> bool:
 		"""
@@ -63,18 +85,195 @@ class ContentExtractor:
 		"""
 		try:
 			if source.lower().endswith('.pdf'):
-				return self.pdf_extractor.extract_content(source)
+				return self._extract_cached(
+					'pdf', lambda: file_digest(source), lambda: self.pdf_extractor.extract_content(source)
+				)
 			elif self.is_url(source):
-				if any(pattern in source for pattern in self.content_extractor_config['youtube_url_patterns']):
-					return self.youtube_transcriber.extract_transcript(source)
+				if any(pattern in source for pattern in self.content_extractor_config.get('youtube_url_patterns', [])):
+					return self._extract_cached(
+						'youtube', lambda: normalize_url(source), lambda: self.youtube_transcriber.extract_transcript(source)
+					)
 				else:
-					return self.website_extractor.extract_content(source)
+					return self._extract_website(source)
 			else:
 				raise ValueError("Unsupported source type")
 		except Exception as e:
 			logger.error(f"Error extracting content from {source}: {str(e)}")
 			raise
 
+	def _extract_cached(self, source_type: str, make_key: Callable[[], str], extract: Callable[[], str]) -> str:
+		"""
+		Return the cached text of a source if still fresh, otherwise extract and cache it.
+
+		Args:
+			source_type (str): Source type, used to pick the TTL.
+			make_key (Callable[[], str]): Builds the cache key (normalized URL or content hash).
+			extract (Callable[[], str]): Extracts the content on a cache miss.
+
+		Returns:
+			str: Extracted text content.
+		"""
+		cache = self.extraction_cache
+		if cache is None:
+			return extract()
+
+		key = make_key()
+		entry = cache.get(source_type, key)
+		if entry and cache.is_fresh(source_type, entry):
+			cache.record('hit')
+			return entry['text']
+
+		cache.record('miss')
+		content = extract()
+		cache.put(source_type, key, content)
+		return content
+
+	def _extract_website(self, source: str) -> str:
+		"""
+		Extract a website, revalidating a stale cached copy with a conditional GET.
+
+		Args:
+			source (str): Website URL.
+
+		Returns:
+			str: Extracted text content.
+		"""
+		cache = self.extraction_cache
+		if cache is None:
+			return self.website_extractor.extract_content(source)
+
+		key = normalize_url(source)
+		entry = cache.get('website', key)
+		if entry and cache.is_fresh('website', entry):
+			cache.record('hit')
+			return entry['text']
+
+		if entry:
+			content, etag, last_modified = self.website_extractor.fetch_content(
+				source, etag=entry.get('etag'), last_modified=entry.get('last_modified')
+			)
+		else:
+			content, etag, last_modified = self.website_extractor.fetch_content(source)
+
+		if content is None:
+			# 304 Not Modified: keep the cached text and restart its TTL
+			cache.record('revalidation')
+			content = entry['text']
+		else:
+			cache.record('miss')
+		cache.put('website', key, content, etag=etag, last_modified=last_modified)
+		return content
+
+	def _submit_pdf(self, process_pool: ProcessPoolExecutor, source: str) -> Future:
+		"""
+		Extract a PDF on the process pool unless a fresh copy is cached.
+
+		Args:
+			process_pool (ProcessPoolExecutor): Pool used for PDF parsing.
+			source (str): Path to the PDF file.
+
+		Returns:
+			Future: Future resolving to the extracted text content.
+		"""
+		cache = self.extraction_cache
+		if cache is None:
+			return process_pool.submit(_extract_pdf, source)
+
+		future: Future = Future()
+		try:
+			key = file_digest(source)
+		except Exception as e:
+			future.set_exception(e)
+			return future
+
+		entry = cache.get('pdf', key)
+		if entry and cache.is_fresh('pdf', entry):
+			cache.record('hit')
+			future.set_result(entry['text'])
+			return future
+
+		cache.record('miss')
+
+		def store(done: Future) -> None:
+			# Futures cancelled by a batch-timeout shutdown raise CancelledError from exception()
+			if not done.cancelled() and done.exception() is None:
+				cache.put('pdf', key, done.result())
+
+		future = process_pool.submit(_extract_pdf, source)
+		future.add_done_callback(store)
+		return future
+
+	def extract_contents(self, sources: List[str]) -> List[str]:
+		"""
+		Extract content from several sources concurrently, preserving source order.
+
+		Websites and YouTube transcripts are fetched on a thread pool. When there is
+		more than one PDF, PDFs are parsed on a process pool so they do not contend
+		for the GIL. Each source must finish within `source_timeout` seconds of the
+		start of the batch; a source that times out or fails is skipped with a warning
+		when `skip_failed_sources` is enabled.
+
+		Args:
+			sources (List[str]): URLs or file paths of the content sources.
+
+		Returns:
+			List[str]: Extracted text content of the successful sources, in input order.
+
+		Raises:
+			Exception: If a source fails and `skip_failed_sources` is disabled, or if every source fails.
+		"""
+		if not sources:
+			return []
+
+		max_workers = self.content_extractor_config.get('max_workers', 8)
+		source_timeout = self.content_extractor_config.get('source_timeout', 60)
+		skip_failed = self.content_extractor_config.get('skip_failed_sources', True)
+
+		pdf_sources = [source for source in sources if source.lower().endswith('.pdf')]
+		thread_pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources))))
+		process_pool = None
+		if len(pdf_sources) > 1:
+			# Spawn rather than fork: the caller (e.g. the API thread pool) is usually multithreaded
+			process_pool = ProcessPoolExecutor(
+				max_workers=max(1, min(max_workers, len(pdf_sources))),
+				mp_context=multiprocessing.get_context('spawn'),
+			)
+
+		futures: Dict[int, Future] = {}
+		try:
+			for idx, source in enumerate(sources):
+				if process_pool is not None and source in pdf_sources:
+					futures[idx] = self._submit_pdf(process_pool, source)
+				else:
+					futures[idx] = thread_pool.submit(self.extract_content, source)
+
+			deadline = time.monotonic() + source_timeout
+			contents: List[Optional[str]] = []
+			errors = []
+			for idx, source in enumerate(sources):
+				try:
+					contents.append(futures[idx].result(timeout=max(0.0, deadline - time.monotonic())))
+					continue
+				except FutureTimeoutError:
+					error = TimeoutError(f"Timed out after {source_timeout}s extracting content from {source}")
+				except Exception as e:
+					error = e
+				if not skip_failed:
+					raise error
+				logger.warning(f"Skipping source {source}: {str(error)}")
+				errors.append(error)
+				contents.append(None)
+		finally:
+			# Do not wait for sources that timed out; their results are discarded
+			thread_pool.shutdown(wait=False, cancel_futures=True)
+			if process_pool is not None:
+				process_pool.shutdown(wait=False, cancel_futures=True)
+
+		if len(errors) == len(sources):
+			raise Exception(f"Failed to extract content from all {len(sources)} sources") from errors[-1]
+
+		return [content for content in contents if content is not None]
+
 def main(seed: int = 42) -> None:
 	"""
 	Main function to test the ContentExtractor class.
@@ -0,0 +1,195 @@
+"""
+Extraction Cache Module
+
+This module provides a persistent cache of extracted text content. Entries are keyed
+by source type and a normalized URL (or, for PDFs, a hash of the file contents) and
+store the cleaned text along with the HTTP validators (ETag / Last-Modified) needed to
+revalidate website content with a conditional GET once its TTL has passed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+	"""
+	Normalize a URL so that equivalent spellings share a cache entry.
+
+	The scheme and host are lowercased, default ports and fragments are dropped,
+	query parameters are sorted and an empty path becomes '/'.
+
+	Args:
+		url (str): URL to normalize, with or without a scheme.
+
+	Returns:
+		str: The normalized URL.
+	"""
+	if not url.startswith(('http://', 'https://')):
+		url = 'https://' + url
+	parsed = urlparse(url.strip())
+	scheme = parsed.scheme.lower()
+	host = (parsed.hostname or '').lower()
+	if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+		host = f"{host}:{parsed.port}"
+	query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+	return urlunparse((scheme, host, parsed.path or '/', parsed.params, query, ''))
+
+
+def file_digest(file_path: str) -> str:
+	"""
+	Compute the SHA-256 digest of a file's contents.
+
+	Args:
+		file_path (str): Path to the file.
+
+	Returns:
+		str: Hex digest of the file contents.
+	"""
+	digest = hashlib.sha256()
+	with open(file_path, 'rb') as f:
+		for chunk in iter(lambda: f.read(1024 * 1024), b''):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+
+class ExtractionCache:
+	"""
+	On-disk cache of extracted text, one JSON file per source.
+	"""
+
+	def __init__(self, directory: str, ttl: Dict[str, float]):
+		"""
+		Initialize the ExtractionCache.
+
+		Args:
+			directory (str): Directory holding cache entries.
+			ttl (Dict[str, float]): Seconds an entry stays fresh, per source type
+				('website', 'youtube', 'pdf').
+		"""
+		self.directory = directory
+		self.ttl = ttl
+		self.hits = 0
+		self.misses = 0
+		self.revalidations = 0
+		self._lock = threading.Lock()
+		os.makedirs(self.directory, exist_ok=True)
+
+	def get(self, source_type: str, key: str) -> Optional[Dict[str, Any]]:
+		"""
+		Return the cached entry for a source, fresh or stale.
+
+		Args:
+			source_type (str): Source type of the entry.
+			key (str): Normalized URL or content hash.
+
+		Returns:
+			Optional[Dict[str, Any]]: Entry with 'text', 'etag', 'last_modified' and
+			'fetched_at', or None if the source is not cached.
+		"""
+		try:
+			with open(self._path(source_type, key), 'r', encoding='utf-8') as f:
+				return json.load(f)
+		except (FileNotFoundError, ValueError):
+			return None
+
+	def is_fresh(self, source_type: str, entry: Dict[str, Any]) -> bool:
+		"""
+		Check whether an entry can be used without revalidation.
+
+		Args:
+			source_type (str): Source type of the entry.
+			entry (Dict[str, Any]): Entry returned by get.
+
+		Returns:
+			bool: True if the entry is younger than the TTL of its source type.
+		"""
+		return time.time() - entry.get('fetched_at', 0) < self.ttl.get(source_type, 0)
+
+	def put(
+		self,
+		source_type: str,
+		key: str,
+		text: str,
+		etag: Optional[str] = None,
+		last_modified: Optional[str] = None,
+	) -> None:
+		"""
+		Store extracted text for a source.
+
+		Args:
+			source_type (str): Source type of the entry.
+			key (str): Normalized URL or content hash.
+			text (str): Extracted text content.
+			etag (Optional[str]): ETag response header, if any.
+			last_modified (Optional[str]): Last-Modified response header, if any.
+		"""
+		entry = {
+			'key': key,
+			'text': text,
+			'etag': etag,
+			'last_modified': last_modified,
+			'fetched_at': time.time(),
+		}
+		fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+		try:
+			with os.fdopen(fd, 'w', encoding='utf-8') as f:
+				json.dump(entry, f, ensure_ascii=False)
+			os.replace(tmp_path, self._path(source_type, key))
+		except Exception:
+			if os.path.exists(tmp_path):
+				os.remove(tmp_path)
+			raise
+
+	def record(self, outcome: str) -> None:
+		"""Count a cache outcome: 'hit', 'miss' or 'revalidation'."""
+		with self._lock:
+			if outcome == 'hit':
+				self.hits += 1
+			elif outcome == 'miss':
+				self.misses += 1
+			else:
+				self.revalidations += 1
+
+	def stats(self) -> Dict[str, int]:
+		"""Return hit/miss/revalidation counters."""
+		with self._lock:
+			return {'hits': self.hits, 'misses': self.misses, 'revalidations': self.revalidations}
+
+	def _path(self, source_type: str, key: str) -> str:
+		name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+		return os.path.join(self.directory, f"{source_type}_{name}.json")
+
+
+_caches: Dict[str, ExtractionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_extraction_cache(directory: str, ttl: Dict[str, float]) -> ExtractionCache:
+	"""
+	Get the process-wide extraction cache for a directory, creating it on first use.
+
+	Args:
+		directory (str): Directory holding cache entries.
+		ttl (Dict[str, float]): Seconds an entry stays fresh, per source type.
+
+	Returns:
+		ExtractionCache: The shared cache instance.
+	"""
+	path = os.path.abspath(directory)
+	with _caches_lock:
+		cache = _caches.get(path)
+		if cache is None:
+			cache = ExtractionCache(path, ttl)
+			_caches[path] = cache
+		return cache
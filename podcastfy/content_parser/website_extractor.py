@@ -9,14 +9,22 @@ import requests
 import re
 import html
 import logging
+import threading
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
 from podcastfy.utils.config import load_config
-from typing import List
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 class WebsiteExtractor:
+	# HTTP session shared by every extractor in the process, so connections to a host
+	# are kept alive across pages, sources and jobs
+	_session: Optional[requests.Session] = None
+	_session_lock = threading.Lock()
+
 	def __init__(self):
 		"""
 		Initialize the WebsiteExtractor.
@@ -27,6 +35,41 @@ class WebsiteExtractor:
 		self.user_agent = self.website_extractor_config.get('user_agent', 'Mozilla/5.0')
 		self.timeout = self.website_extractor_config.get('timeout', 10)
 		self.remove_patterns = self.website_extractor_config.get('markdown_cleaning', {}).get('remove_patterns', [])
+		self.session = self.get_session(self.website_extractor_config.get('http_pool', {}))
+
+	@classmethod
+	def get_session(cls, pool_config) -> requests.Session:
+		"""
+		Get the process-wide pooled HTTP session, creating it on first use.
+
+		Args:
+			pool_config: Connection pool and retry settings (website_extractor.http_pool).
+
+		Returns:
+			requests.Session: Session with keep-alive connection pools per host and retries with backoff.
+		"""
+		with cls._session_lock:
+			if cls._session is None:
+				retry = Retry(
+					total=pool_config.get('max_retries', 3),
+					backoff_factor=pool_config.get('backoff_factor', 0.5),
+					status_forcelist=pool_config.get('status_forcelist', [429, 500, 502, 503, 504]),
+					allowed_methods=['GET', 'HEAD'],
+					respect_retry_after_header=True,
+					raise_on_status=False,
+				)
+				adapter = HTTPAdapter(
+					pool_connections=pool_config.get('pool_connections', 10),
+					pool_maxsize=pool_config.get('pool_maxsize', 20),
+					max_retries=retry,
+				)
+				session = requests.Session()
+				session.mount('http://', adapter)
+				session.mount('https://', adapter)
+				# Advertises brotli/zstd as well when urllib3 can decode them
+				session.headers.update(make_headers(accept_encoding=True))
+				cls._session = session
+			return cls._session
 
 	def extract_content(self, url: str) -> str:
 		"""
@@ -38,6 +81,27 @@ class WebsiteExtractor:
 		Returns:
 			str: Extracted clean text content.
 
+		Raises:
+			Exception: If there's an error in extracting the content.
+		"""
+		content, _, _ = self.fetch_content(url)
+		return content
+
+	def fetch_content(
+		self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+	) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+		"""
+		Fetch and clean a website, revalidating a previously fetched copy if validators are given.
+
+		Args:
+			url (str): Website URL.
+			etag (Optional[str]): ETag of the previously fetched copy, sent as If-None-Match.
+			last_modified (Optional[str]): Last-Modified of the previously fetched copy, sent as If-Modified-Since.
+
+		Returns:
+			Tuple[Optional[str], Optional[str], Optional[str]]: (content, etag, last_modified), where
+			content is None if the server answered 304 Not Modified.
+
 		Raises:
 			Exception: If there's an error in extracting the content.
 		"""
@@ -47,9 +111,18 @@ class WebsiteExtractor:
 
 			# Request the webpage
 			headers = {'User-Agent': self.user_agent}
-			response = requests.get(normalized_url, headers=headers, timeout=self.timeout)
+			if etag:
+				headers['If-None-Match'] = etag
+			if last_modified:
+				headers['If-Modified-Since'] = last_modified
+			response = self.session.get(normalized_url, headers=headers, timeout=self.timeout)
 			response.raise_for_status()  # Raise an exception for bad status codes
 
+			new_etag = response.headers.get('ETag') or etag
+			new_last_modified = response.headers.get('Last-Modified') or last_modified
+			if response.status_code == 304:
+				return None, new_etag, new_last_modified
+
 			# Parse the page content with BeautifulSoup
 			soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -60,7 +133,7 @@ class WebsiteExtractor:
 			raw_text = soup.get_text(separator="\n")  # Get all text content
 			cleaned_content = self.clean_content(raw_text)
 
-			return cleaned_content
+			return cleaned_content, new_etag, new_last_modified
 		except requests.RequestException as e:
 			logger.error(f"Failed to extract content from {url}: {str(e)}")
 			raise Exception(f"Failed to extract content from {url}: {str(e)}")
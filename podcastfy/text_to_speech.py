@@ -6,21 +6,30 @@ It supports ElevenLabs, Google, OpenAI and Edge TTS services and handles the con
 including cleaning of input text and merging of audio files.
 """
 
+import asyncio
 import logging
 import os
-import re
 import tempfile
-from typing import List, Tuple, Optional, Dict, Any
-from pydub import AudioSegment
+from typing import Iterable, Iterator, List, Tuple, Optional, Dict, Any
 import threading
 
+from .tts.base import run_async
+from .tts.buffer import SegmentBuffer, write_segment_file
 from .tts.factory import TTSProviderFactory
+from .tts.cache import SegmentCache, get_segment_cache
+from .tts.merger import merge_audio_clips, merge_audio_files, segment_sort_key
+from .tts.planner import plan_segments
+from .tts.scheduler import RequestScheduler, get_request_scheduler
 from .utils.config import load_config
 from .utils.config_conversation import load_conversation_config
-from .utils.decorators import check_cancelled
+from .utils.decorators import check_cancelled, check_cancelled_async
+from .utils.transcript import DEFAULT_SPEAKERS, parse_transcript, speaker_number, strip_markup
 
 logger = logging.getLogger(__name__)
 
+# default_voices keys that set the voice of a speaker under its historical role name
+VOICE_KEY_SPEAKERS = {"question": "Person1", "answer": "Person2"}
+
 
 class TextToSpeech:
     def __init__(
@@ -47,20 +56,28 @@ class TextToSpeech:
             api_key = getattr(self.config, f"{model.upper()}_API_KEY", None)
 
         # Initialize provider using factory
+        self.provider_name = model.lower()
         self.provider = TTSProviderFactory.create(provider_name=model, api_key=api_key, model=model)
 
         # Setup directories and config
         self._setup_directories()
         self.audio_format = self.tts_config.get("audio_format", "mp3")
         self.ending_message = self.tts_config.get("ending_message", "")
+        self.segment_cache = self._setup_segment_cache()
+        self.in_memory_limit = self._get_in_memory_limit()
+        self.merge_engine = self.tts_config.get("merge_engine", "auto")
+        self.scheduler = self._setup_scheduler(api_key)
 
     def _get_provider_config(self) -> Dict[str, Any]:
         """Get provider-specific configuration."""
         # Get provider name in lowercase without 'TTS' suffix
         provider_name = self.provider.__class__.__name__.lower().replace("tts", "")
 
-        # Get provider config from tts_config
-        provider_config = self.tts_config.get(provider_name, {})
+        # Get provider config from tts_config, keyed by model name (e.g. 'gemini' for
+        # GoogleMultispeakerTTS) or by provider class name
+        provider_config = (
+            self.tts_config.get(self.provider_name) or self.tts_config.get(provider_name, {})
+        )
 
         # If provider config is empty, try getting from default config
         if not provider_config:
@@ -81,40 +98,57 @@ class TextToSpeech:
         text: str, 
         output_file: str, 
         job_id: Optional[str] = None,
-        cancel_event: Optional[threading.Event] = None
+        cancel_event: Optional[threading.Event] = None,
+        resume: bool = False
     ) -> None:
-        """Convert input text to speech."""
+        """
+        Convert input text to speech.
+
+        With ``resume`` (and a job_id), segments already present in temp_audio_dir from
+        an earlier, interrupted run of the same job are kept instead of synthesized again.
+        """
         cleaned_text = text
 
         if self.provider.model.lower() == "gemini":
-            audio_data = self.provider.generate_audio(
-                cleaned_text,                           
-                voice="S", 
-                model="en-US-Studio-MultiSpeaker", 
-                voice2="R",
-                ending_message=self.ending_message,
-                cancel_event=cancel_event
+            # The provider splits long transcripts into concurrent multi-speaker requests,
+            # each rate-limited and retried by the scheduler on its own
+            max_workers = self._get_max_workers(self._get_provider_config())
+            audio_data = run_async(
+                self.provider.agenerate_transcript_audio(
+                    cleaned_text,
+                    voice="S",
+                    model="en-US-Studio-MultiSpeaker",
+                    voice2="R",
+                    ending_message=self.ending_message,
+                    cancel_event=cancel_event,
+                    max_workers=max_workers,
+                    scheduler=self.scheduler
+                )
             )
             with open(output_file, "wb") as f:
                 f.write(audio_data)
             logger.info(f"Audio saved to {output_file}")
         else:
+            buffer = self._new_segment_buffer()
             if job_id:
                 audio_segments = self._generate_audio_segments(
                     cleaned_text, 
                     self.temp_audio_dir,
-                    cancel_event=cancel_event
+                    cancel_event=cancel_event,
+                    resume=resume,
+                    buffer=buffer
                 )
-                self._merge_audio_files(audio_segments, output_file)
+                self._merge_audio_files(audio_segments, output_file, buffer=buffer)
                 logger.info(f"Audio saved to {output_file}")
             else:
                 with tempfile.TemporaryDirectory(dir=self.temp_audio_dir) as temp_dir:
                     audio_segments = self._generate_audio_segments(
                         cleaned_text, 
                         temp_dir,
-                        cancel_event=cancel_event
+                        cancel_event=cancel_event,
+                        buffer=buffer
                     )
-                    self._merge_audio_files(audio_segments, output_file)
+                    self._merge_audio_files(audio_segments, output_file, buffer=buffer)
                     logger.info(f"Audio saved to {output_file}")
 
     @check_cancelled
@@ -122,77 +156,381 @@ class TextToSpeech:
         self, 
         text: str, 
         temp_dir: str,
-        cancel_event: Optional[threading.Event] = None
+        cancel_event: Optional[threading.Event] = None,
+        resume: bool = False,
+        buffer: Optional[SegmentBuffer] = None
     ) -> List[str]:
-        """Generate audio segments for each Q&A pair."""
-        qa_pairs = self.provider.split_qa(
+        """
+        Generate the audio segments of a transcript.
+
+        Adjacent turns read by the same voice are batched into one segment and turns
+        longer than the provider's character limit are split at sentence boundaries
+        (see plan_segments), so each segment is a single request. Segments are
+        synthesized by up to ``max_workers``
+        concurrent requests (configured per provider under ``text_to_speech``). The
+        returned file list is always in transcript order regardless of completion order.
+        With ``resume``, segment files that already exist in ``temp_dir`` are not
+        synthesized again. With a ``buffer``, segments are kept in it rather than
+        written to their files (see SegmentBuffer).
+        """
+        turns = self.provider.split_turns(
             text, 
             self.ending_message, 
             self.provider.get_supported_tags(),
             cancel_event=cancel_event
         )
-        audio_files = []
         provider_config = self._get_provider_config()
+        voices = provider_config.get("default_voices", {})
+        model = provider_config.get("model")
 
-        for idx, (question, answer) in enumerate(qa_pairs, 1):
-            for speaker_type, content in [("question", question), ("answer", answer)]:
-                temp_file = os.path.join(
-                    temp_dir, f"{idx}_{speaker_type}.{self.audio_format}"
-                )
-                voice = provider_config.get("default_voices", {}).get(speaker_type)
-                model = provider_config.get("model")
+        planned = plan_segments(
+            ((turn.speaker, turn.text, self._get_voice(voices, turn.speaker)) for turn in turns),
+            self._get_max_characters(provider_config),
+        )
+        segments = [
+            (self._segment_file(temp_dir, idx, segment.speaker), segment.text, segment.voice)
+            for idx, segment in enumerate(planned, 1)
+        ]
 
-                audio_data = self.provider.generate_audio(
-                    content, 
-                    voice, 
-                    model,
-                    cancel_event=cancel_event
+        pending = segments
+        if resume:
+            # Segments are written atomically, so an existing file is a finished segment
+            pending = [segment for segment in segments if not os.path.exists(segment[0])]
+            logger.info(f"Resuming: {len(segments) - len(pending)} of {len(segments)} segments already synthesized")
+
+        max_workers = min(self._get_max_workers(provider_config), len(pending))
+        self._synthesize_segments(pending, model, max_workers, cancel_event=cancel_event, buffer=buffer)
+
+        if self.segment_cache:
+            logger.info(f"Segment cache stats: {self.segment_cache.stats()}")
+        return [temp_file for temp_file, _, _ in segments]
+
+    @check_cancelled
+    def convert_stream_to_speech(
+        self,
+        turns: Iterable[Tuple[str, str]],
+        output_file: str,
+        job_id: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> None:
+        """
+        Convert dialogue turns to speech while they are still being generated.
+
+        Each turn is submitted for synthesis as soon as the iterator yields it, so
+        audio generation overlaps with transcript generation.
+
+        Args:
+            turns: (speaker tag, turn text) pairs, e.g. from ContentGenerator.stream_qa_content
+            output_file: Path to save the merged audio file
+            job_id: Job ID; when given, segments are kept in temp_audio_dir like convert_to_speech
+            cancel_event: Optional event to check for cancellation
+        """
+        buffer = self._new_segment_buffer()
+        if job_id:
+            audio_segments = self._generate_streamed_audio_segments(
+                turns, self.temp_audio_dir, cancel_event=cancel_event, buffer=buffer
+            )
+            self._merge_audio_files(audio_segments, output_file, buffer=buffer)
+        else:
+            with tempfile.TemporaryDirectory(dir=self.temp_audio_dir) as temp_dir:
+                audio_segments = self._generate_streamed_audio_segments(
+                    turns, temp_dir, cancel_event=cancel_event, buffer=buffer
                 )
-                with open(temp_file, "wb") as f:
-                    f.write(audio_data)
+                self._merge_audio_files(audio_segments, output_file, buffer=buffer)
+        logger.info(f"Audio saved to {output_file}")
+
+    @check_cancelled
+    def _generate_streamed_audio_segments(
+        self,
+        turns: Iterable[Tuple[str, str]],
+        temp_dir: str,
+        cancel_event: Optional[threading.Event] = None,
+        buffer: Optional[SegmentBuffer] = None
+    ) -> List[str]:
+        """
+        Generate audio segments from streamed turns.
+
+        Turns are segmented the same way as a complete transcript: the ending message
+        follows a trailing Person1 turn, and plan_segments batches turns of the same voice
+        and splits overlong ones. A segment is submitted for synthesis as soon as the
+        next voice starts talking.
+        """
+        provider_config = self._get_provider_config()
+        voices = provider_config.get("default_voices", {})
+        model = provider_config.get("model")
+        supported_tags = self.provider.get_supported_tags()
+
+        audio_files: List[str] = []
+
+        def voiced_turns() -> Iterator[Tuple[str, str, Optional[str]]]:
+            last_speaker = None
+            for speaker, text in turns:
+                content = " ".join(strip_markup(text, supported_tags).split())
+                if content:
+                    last_speaker = speaker
+                    yield speaker, content, self._get_voice(voices, speaker)
+            ending_message = " ".join(self.ending_message.split())
+            if last_speaker == DEFAULT_SPEAKERS[0] and ending_message:
+                yield DEFAULT_SPEAKERS[1], ending_message, self._get_voice(voices, DEFAULT_SPEAKERS[1])
+
+        def segments() -> Iterator[Tuple[str, str, Optional[str]]]:
+            planned = plan_segments(voiced_turns(), self._get_max_characters(provider_config))
+            for idx, segment in enumerate(planned, 1):
+                temp_file = self._segment_file(temp_dir, idx, segment.speaker)
                 audio_files.append(temp_file)
+                yield temp_file, segment.text, segment.voice
+
+        self._synthesize_segments(
+            segments(),
+            model,
+            self._get_max_workers(provider_config),
+            cancel_event=cancel_event,
+            streaming=True,
+            buffer=buffer,
+        )
 
+        if self.segment_cache:
+            logger.info(f"Segment cache stats: {self.segment_cache.stats()}")
         return audio_files
 
-    def _merge_audio_files(self, audio_files: List[str], output_file: str) -> None:
+    def _segment_file(self, temp_dir: str, idx: int, speaker: str) -> str:
+        """Path of the idx-th (1-based) segment, e.g. "3_Person2.mp3"."""
+        return os.path.join(temp_dir, f"{idx}_{speaker}.{self.audio_format}")
+
+    def _get_voice(self, voices: Dict[str, str], speaker: str) -> Optional[str]:
+        """
+        Get the voice of a speaker from a provider's default_voices.
+
+        Voices may be set per speaker (Person1, Person2, Person3, ...); 'question' and
+        'answer' set the voices of Person1 and Person2. A speaker without a voice of its
+        own reuses the configured voices in turn.
+        """
+        if hasattr(voices, "to_dict"):
+            voices = voices.to_dict()
+        by_speaker: Dict[str, str] = {}
+        for key, voice in voices.items():
+            if voice and key not in VOICE_KEY_SPEAKERS:
+                by_speaker[key] = voice
+        for key, speaker_name in VOICE_KEY_SPEAKERS.items():
+            if voices.get(key):
+                by_speaker.setdefault(speaker_name, voices[key])
+
+        if speaker in by_speaker:
+            return by_speaker[speaker]
+        if not by_speaker:
+            return None
+        configured = [by_speaker[name] for name in sorted(by_speaker, key=speaker_number)]
+        return configured[(speaker_number(speaker) - 1) % len(configured)]
+
+    def _synthesize_segments(
+        self,
+        segments: Iterable[Tuple[str, str, Optional[str]]],
+        model: str,
+        max_workers: int,
+        cancel_event: Optional[threading.Event] = None,
+        streaming: bool = False,
+        buffer: Optional[SegmentBuffer] = None,
+    ) -> None:
+        """
+        Synthesize (temp_file, content, voice) segments with up to ``max_workers`` concurrent requests.
+
+        Segments are driven by a single event loop through the provider's async
+        interface, so concurrent requests share one client and its connections.
+        """
+        if max_workers > 1 or streaming:
+            logger.info(f"Synthesizing segments with {max_workers} concurrent requests")
+        run_async(
+            self._asynthesize_segments(
+                segments, model, max(1, max_workers), cancel_event=cancel_event,
+                streaming=streaming, buffer=buffer
+            )
+        )
+
+    async def _asynthesize_segments(
+        self,
+        segments: Iterable[Tuple[str, str, Optional[str]]],
+        model: str,
+        max_workers: int,
+        cancel_event: Optional[threading.Event] = None,
+        streaming: bool = False,
+        buffer: Optional[SegmentBuffer] = None,
+    ) -> None:
+        """
+        Submit segments as the iterable yields them and wait for all of them.
+
+        In streaming mode the iterable (e.g. a transcript still being generated) is
+        advanced in a worker thread so that waiting for the next turn never blocks
+        synthesis of the turns already received.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+        tasks: List[asyncio.Task] = []
+
+        async def synthesize(temp_file: str, content: str, voice: Optional[str]) -> None:
+            async with semaphore:
+                await self._synthesize_segment(
+                    temp_file, content, voice, model, cancel_event=cancel_event, buffer=buffer
+                )
+
+        def raise_first_failure() -> None:
+            # Stop consuming the stream as soon as a segment has failed
+            failed = next((t for t in tasks if t.done() and t.exception() is not None), None)
+            if failed is not None:
+                raise failed.exception()
+
+        iterator = iter(segments)
+        try:
+            while True:
+                if streaming:
+                    segment = await asyncio.to_thread(next, iterator, None)
+                else:
+                    segment = next(iterator, None)
+                if segment is None:
+                    break
+                raise_first_failure()
+                tasks.append(asyncio.create_task(synthesize(*segment)))
+
+            # Surface the first failure (including cancellation) as soon as it happens
+            if tasks:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            raise_first_failure()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # The loop ends with this run; release the provider's connections with it
+            await self.provider.aclose()
+
+    @check_cancelled_async
+    async def _synthesize_segment(
+        self,
+        temp_file: str,
+        content: str,
+        voice: str,
+        model: str,
+        cancel_event: Optional[threading.Event] = None,
+        buffer: Optional[SegmentBuffer] = None
+    ) -> str:
+        """
+        Synthesize a single segment and write it to ``temp_file`` (or keep it in ``buffer``),
+        using the segment cache if enabled.
+        """
+        audio_data = None
+        cache_key = None
+        if self.segment_cache:
+            cache_key = SegmentCache.make_key(self.provider_name, model, voice, content)
+            audio_data = self.segment_cache.get(cache_key)
+
+        if audio_data is None:
+            audio_data = await self.scheduler.run(
+                lambda: self.provider.agenerate_audio(
+                    content,
+                    voice,
+                    model,
+                    cancel_event=cancel_event
+                ),
+                cancel_event=cancel_event
+            )
+            if cache_key:
+                self.segment_cache.put(cache_key, audio_data)
+
+        if buffer is not None:
+            buffer.put(temp_file, audio_data)
+        else:
+            write_segment_file(temp_file, audio_data)
+        return temp_file
+
+    def _setup_segment_cache(self) -> Optional[SegmentCache]:
+        """Get the shared segment cache if enabled in the text_to_speech config."""
+        cache_config = self.tts_config.get("segment_cache", {})
+        if not cache_config or not cache_config.get("enabled", False):
+            return None
+        return get_segment_cache(
+            cache_config.get("directory", "data/audio/cache"),
+            cache_config.get("max_size_mb", 512),
+            self.audio_format,
+        )
+
+    def _get_in_memory_limit(self) -> Optional[int]:
+        """Get the memory threshold of in-memory segments in bytes, or None if disabled."""
+        memory_config = self.tts_config.get("in_memory_segments", {})
+        if not memory_config or not memory_config.get("enabled", False):
+            return None
+        return int(float(memory_config.get("max_memory_mb", 64)) * 1024 * 1024)
+
+    def _new_segment_buffer(self) -> Optional[SegmentBuffer]:
+        """Create a buffer for one conversion's segments if in-memory segments are enabled."""
+        if self.in_memory_limit is None:
+            return None
+        return SegmentBuffer(self.in_memory_limit)
+
+    def _setup_scheduler(self, api_key: Optional[str]) -> RequestScheduler:
+        """Get the shared request scheduler for the provider and API key."""
+        rate_limit = self._get_provider_config().get("rate_limit") or {}
+        retry = self.tts_config.get("retry") or {}
+        return get_request_scheduler(
+            self.provider_name,
+            api_key,
+            rate_limit.to_dict() if hasattr(rate_limit, "to_dict") else rate_limit,
+            retry.to_dict() if hasattr(retry, "to_dict") else retry,
+        )
+
+    def _get_max_workers(self, provider_config: Dict[str, Any]) -> int:
+        """Get the number of concurrent synthesis requests allowed for the provider."""
+        try:
+            return max(1, int(provider_config.get("max_workers", 1) or 1))
+        except (TypeError, ValueError):
+            logger.warning(
+                f"Invalid max_workers value: {provider_config.get('max_workers')}, using 1"
+            )
+            return 1
+
+    def _get_max_characters(self, provider_config: Dict[str, Any]) -> Optional[int]:
+        """Get the longest text the provider accepts in one request; None for no limit."""
+        max_characters = provider_config.get("max_characters", self.provider.MAX_CHARACTERS)
+        if max_characters is None:
+            return None
+        try:
+            return max(1, int(max_characters))
+        except (TypeError, ValueError):
+            logger.warning(
+                f"Invalid max_characters value: {max_characters}, using {self.provider.MAX_CHARACTERS}"
+            )
+            return self.provider.MAX_CHARACTERS
+
+    def _merge_audio_files(
+        self, audio_files: List[str], output_file: str, buffer: Optional[SegmentBuffer] = None
+    ) -> None:
         """
-        Merge the provided audio files sequentially, ensuring questions come before answers.
+        Merge the provided audio files sequentially, in segment order.
 
         Args:
                 audio_files: List of paths to audio files to merge
                 output_file: Path to save the merged audio file
+                buffer: Buffer holding the segments, which are then already in segment order
         """
         try:
-
-            def get_sort_key(file_path: str) -> Tuple[int, int]:
-                """
-                Create sort key from filename that puts questions before answers.
-                Example filenames: "1_question.mp3", "1_answer.mp3"
-                """
-                basename = os.path.basename(file_path)
-                # Extract the index number and type (question/answer)
-                idx = int(basename.split("_")[0])
-                is_answer = basename.split("_")[1].startswith("answer")
-                return (
-                    idx,
-                    1 if is_answer else 0,
-                )  # Questions (0) come before answers (1)
-
-            # Sort files by index and type (question/answer)
-            audio_files.sort(key=get_sort_key)
-
-            # Create empty audio segment
-            combined = AudioSegment.empty()
-
-            # Add each audio file to the combined segment
-            for file_path in audio_files:
-                combined += AudioSegment.from_file(file_path, format=self.audio_format)
-
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
-
-            # Export the combined audio
-            combined.export(output_file, format=self.audio_format)
+            if buffer is not None:
+                logger.info(f"Merging in-memory segments: {buffer.stats()}")
+                merge_audio_clips(
+                    audio_files,
+                    buffer.get,
+                    output_file,
+                    audio_format=self.audio_format,
+                    engine=self.merge_engine,
+                )
+                logger.info(f"Merged audio saved to {output_file}")
+                return
+
+            # Sort files by segment index
+            audio_files.sort(key=segment_sort_key)
+
+            # Join MP3 frames directly when possible, re-encode with pydub otherwise
+            merge_audio_files(
+                audio_files,
+                output_file,
+                audio_format=self.audio_format,
+                engine=self.merge_engine,
+            )
             logger.info(f"Merged audio saved to {output_file}")
 
         except Exception as e:
@@ -226,7 +564,7 @@ class TextToSpeech:
             ValueError: If the text is not properly formatted
             
         The text should:
-        1. Have alternating Person1 and Person2 tags
+        1. Have at least one speaker turn (Person1, Person2, Person3, ...)
         2. Each opening tag should have a closing tag
         3. Tags should be properly nested
         """
@@ -234,45 +572,11 @@ class TextToSpeech:
             # Check for empty text
             if not text.strip():
                 raise ValueError("Input text is empty")
-                
-            # Check for matching opening and closing tags
-            person1_open = text.count("<Person1>")
-            person1_close = text.count("</Person1>")
-            person2_open = text.count("<Person2>")
-            person2_close = text.count("</Person2>")
-            
-            if person1_open != person1_close:
-                raise ValueError(f"Mismatched Person1 tags: {person1_open} opening tags and {person1_close} closing tags")
-            if person2_open != person2_close:
-                raise ValueError(f"Mismatched Person2 tags: {person2_open} opening tags and {person2_close} closing tags")
-                
-            # Check for alternating pattern using regex
-            pattern = r"<Person1>.*?</Person1>\s*<Person2>.*?</Person2>"
-            matches = re.findall(pattern, text, re.DOTALL)
-            
-            # Calculate expected number of pairs
-            expected_pairs = min(person1_open, person2_open)
-            
-            if len(matches) != expected_pairs:
-                raise ValueError(
-                    "Tags are not properly alternating between Person1 and Person2. "
-                    "Each Person1 section should be followed by a Person2 section."
-                )
-                
-            # Check for malformed tags (unclosed or improperly nested)
-                stack = []
-                for match in re.finditer(r"<(/?)Person([12])>", text):
-                    tag = match.group(0)
-                    if tag.startswith("</"):
-                        if not stack or stack[-1] != tag[2:-1]:
-                            raise ValueError(f"Improperly nested tags near: {tag}")
-                        stack.pop()
-                    else:
-                        stack.append(tag[1:-1])
-                        
-                if stack:
-                    raise ValueError(f"Unclosed tags: {', '.join(stack)}")
-                
+
+            # Unclosed and improperly nested speaker tags are rejected while parsing
+            if not parse_transcript(text, strict=True):
+                raise ValueError("Transcript has no speaker turns")
+
             logger.debug("Transcript format validation passed")
             
         except ValueError as e:
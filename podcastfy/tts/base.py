@@ -1,10 +1,32 @@
 """Abstract base class for Text-to-Speech providers."""
 
 from abc import ABC, abstractmethod
-from typing import List, ClassVar, Tuple, Optional
-import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, List, ClassVar, Tuple, Optional, TypeVar
+import asyncio
 import threading
-from ..utils.decorators import check_cancelled
+from ..utils.decorators import check_cancelled, check_cancelled_async
+from ..utils.transcript import (
+    DEFAULT_SPEAKERS, Turn, merge_turns, pair_turns, parse_transcript, render_transcript
+)
+
+T = TypeVar("T")
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run when the calling thread has no running event loop; otherwise
+    (e.g. inside a notebook) the coroutine runs on a fresh loop in a helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 
 class TTSProvider(ABC):
     """Abstract base class that defines the interface for TTS providers."""
@@ -13,6 +35,9 @@ class TTSProvider(ABC):
     COMMON_SSML_TAGS: ClassVar[List[str]] = [
         'lang', 'p', 'phoneme', 's', 'sub'
     ]
+
+    # Longest text accepted in one request; longer turns are split. None for no limit
+    MAX_CHARACTERS: ClassVar[Optional[int]] = None
     
     @abstractmethod
     @check_cancelled
@@ -44,6 +69,72 @@ class TTSProvider(ABC):
         """
         pass
 
+    @check_cancelled_async
+    async def agenerate_audio(
+        self,
+        text: str,
+        voice: str,
+        model: str,
+        voice2: str = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> bytes:
+        """
+        Generate audio from text without blocking the event loop.
+
+        Providers with an async client override this; the default runs
+        generate_audio in a worker thread.
+
+        Args:
+            text: Text to convert to speech
+            voice: Voice ID/name to use
+            model: Model ID/name to use
+            voice2: Optional second voice for multi-speaker models
+            cancel_event: Optional event to check for cancellation
+
+        Returns:
+            Audio data as bytes
+        """
+        return await asyncio.to_thread(
+            self.generate_audio, text, voice, model, voice2, cancel_event=cancel_event
+        )
+
+    def _get_async_client(self) -> Any:
+        """
+        Get the provider's async client for the running event loop.
+
+        Async HTTP clients keep their connection pool bound to the loop they were
+        created in, so one client is created per loop and reused by every request
+        made from it. Call aclose before the loop ends to release its connections.
+        """
+        loop = asyncio.get_running_loop()
+        if getattr(self, "_async_client_loop", None) is not loop:
+            self._async_client = self._create_async_client()
+            self._async_client_loop = loop
+        return self._async_client
+
+    def _create_async_client(self) -> Any:
+        """Create the async client used by agenerate_audio."""
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """
+        Close the async client created for the running event loop, if any.
+
+        run_async discards its loop when the coroutine finishes, so callers that
+        synthesize through it close the client before returning; otherwise each run
+        would leave a connection pool and its sockets open.
+        """
+        client = getattr(self, "_async_client", None)
+        if client is None or self._async_client_loop is not asyncio.get_running_loop():
+            return
+        self._async_client = None
+        self._async_client_loop = None
+        await self._close_async_client(client)
+
+    async def _close_async_client(self, client: Any) -> None:
+        """Close a client created by _create_async_client."""
+        await client.close()
+
     @check_cancelled
     def get_supported_tags(self) -> List[str]:
         """
@@ -84,6 +175,41 @@ class TTSProvider(ABC):
         if not model:
             raise ValueError("Model must be specified")
         
+    @check_cancelled
+    def split_turns(
+        self,
+        input_text: str,
+        ending_message: str,
+        supported_tags: List[str] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> List[Turn]:
+        """
+        Split the input text into speaker turns, one per text-to-speech request.
+
+        Any number of speakers (Person1, Person2, Person3, ...) is supported. Consecutive
+        turns of the same speaker are batched into one turn, and the ending message is
+        added as a Person2 turn when the transcript ends with a Person1 turn.
+
+        Args:
+            input_text: The input text containing speaker-tagged dialogue
+            ending_message: The ending message to add
+            supported_tags: Optional list of supported tags
+            cancel_event: Optional event to check for cancellation
+
+        Returns:
+            List of turns in speaking order, no two neighbours sharing a speaker
+
+        Raises:
+            Exception: If operation is cancelled
+        """
+        if supported_tags is None:
+            supported_tags = self.COMMON_SSML_TAGS
+        turns = merge_turns(parse_transcript(input_text, supported_tags))
+        question_speaker, answer_speaker = DEFAULT_SPEAKERS
+        if turns and turns[-1].speaker == question_speaker and ending_message.strip():
+            turns.append(Turn(answer_speaker, " ".join(ending_message.split())))
+        return turns
+
     @check_cancelled
     def split_qa(
         self, 
@@ -107,49 +233,22 @@ class TTSProvider(ABC):
         Raises:
             Exception: If operation is cancelled
         """
-        input_text = self.clean_tss_markup(input_text, supported_tags=supported_tags)
-        input_text += f"<Person2>{ending_message}</Person2>"
-
-        pattern = r"<Person1>(.*?)</Person1>\s*<Person2>(.*?)</Person2>"
-        matches = re.findall(pattern, input_text, re.DOTALL)
-
-        return [
-            (" ".join(person1.split()).strip(), " ".join(person2.split()).strip())
-            for person1, person2 in matches
-        ]
+        if supported_tags is None:
+            supported_tags = self.COMMON_SSML_TAGS
+        return pair_turns(parse_transcript(input_text, supported_tags, DEFAULT_SPEAKERS), ending_message)
     
 
-    def clean_tss_markup(self, input_text: str, additional_tags: List[str] = ["Person1", "Person2"], supported_tags: List[str] = None) -> str:
+    def clean_tss_markup(self, input_text: str, additional_tags: Optional[List[str]] = None, supported_tags: List[str] = None) -> str:
         """
         Remove unsupported TSS markup tags from the input text while preserving supported SSML tags.
 
         Args:
             input_text (str): The input text containing TSS markup tags.
-            additional_tags (List[str]): Optional list of additional tags to preserve. Defaults to ["Person1", "Person2"].
+            additional_tags (Optional[List[str]]): Speaker tags to preserve. If None, any PersonN tag.
             supported_tags (List[str]): Optional list of supported tags. If None, use COMMON_SSML_TAGS.
         Returns:
             str: Cleaned text with unsupported TSS markup tags removed.
         """
         if supported_tags is None:
-            supported_tags = self.COMMON_SSML_TAGS.copy()
-
-        # Append additional tags to the supported tags list
-        supported_tags.extend(additional_tags)
-
-        # Create a pattern that matches any tag not in the supported list
-        pattern = r'</?(?!(?:' + '|'.join(supported_tags) + r')\b)[^>]+>'
-
-        # Remove unsupported tags
-        cleaned_text = re.sub(pattern, '', input_text)
-
-        # Remove any leftover empty lines
-        cleaned_text = re.sub(r'\n\s*\n', '\n', cleaned_text)
-
-        # Ensure closing tags for additional tags are preserved
-        for tag in additional_tags:
-            cleaned_text = re.sub(f'<{tag}>(.*?)(?=<(?:{"|".join(additional_tags)})>|$)', 
-                                f'<{tag}>\\1</{tag}>', 
-                                cleaned_text, 
-                                flags=re.DOTALL)
-
-        return cleaned_text.strip()
\ No newline at end of file
+            supported_tags = self.COMMON_SSML_TAGS
+        return render_transcript(parse_transcript(input_text, supported_tags, speakers=additional_tags))
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+In-memory store for synthesized TTS segments.
+
+Segments are normally written to their segment files as they finish and read back when
+the episode is merged. A SegmentBuffer keeps their audio in memory instead, saving a
+write and a read of every clip. Once the held audio reaches a memory threshold, further
+segments are spilled to their segment files, so memory use stays bounded for long
+episodes and the merge reads each segment from wherever it is.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+def write_segment_file(path: str, data: bytes) -> None:
+    """Write a segment under a temporary name, so readers of its directory never see a partial segment."""
+    partial_file = f"{path}.part"
+    with open(partial_file, "wb") as f:
+        f.write(data)
+    os.replace(partial_file, path)
+
+
+class SegmentBuffer:
+    """
+    Thread-safe store of segment audio keyed by segment file path.
+    """
+
+    def __init__(self, max_memory_bytes: int):
+        """
+        Initialize the SegmentBuffer.
+
+        Args:
+            max_memory_bytes (int): Most audio held in memory; later segments are
+                written to their segment files.
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self._segments: Dict[str, bytes] = {}
+        self._size = 0
+        self._spilled = 0
+        self._lock = threading.Lock()
+
+    def put(self, path: str, data: bytes) -> None:
+        """
+        Store a finished segment.
+
+        Args:
+            path (str): Segment file path, which identifies the segment
+            data (bytes): Audio data of the segment
+        """
+        with self._lock:
+            if self._size + len(data) <= self.max_memory_bytes:
+                self._segments[path] = data
+                self._size += len(data)
+                return
+            self._spilled += 1
+        write_segment_file(path, data)
+
+    def get(self, path: str) -> bytes:
+        """
+        Get the audio of a segment, held in memory or spilled to (or left on) disk.
+
+        Args:
+            path (str): Segment file path
+
+        Returns:
+            bytes: Audio data of the segment
+        """
+        data = self._segments.get(path)
+        if data is not None:
+            return data
+        with open(path, "rb") as f:
+            return f.read()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of segments and bytes held in memory and the number of spilled segments."""
+        with self._lock:
+            return {"segments": len(self._segments), "size_bytes": self._size, "spilled": self._spilled}
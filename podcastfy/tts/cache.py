@@ -0,0 +1,173 @@
+"""Content-addressed on-disk cache for synthesized TTS segments."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentCache:
+    """
+    Size-bounded LRU cache of audio clips keyed by (provider, model, voice, text).
+
+    Entries are stored as one file per clip under ``directory``. Recency is kept in
+    memory and mirrored to file modification times, so the LRU order survives a
+    process restart.
+    """
+
+    def __init__(self, directory: str, max_size_bytes: int, audio_format: str = "mp3"):
+        """
+        Initialize the segment cache.
+
+        Args:
+            directory: Directory holding cached clips
+            max_size_bytes: Total size above which least recently used clips are evicted
+            audio_format: File extension of cached clips
+        """
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+        self.audio_format = audio_format
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_size = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(provider: str, model: Optional[str], voice: Optional[str], text: str) -> str:
+        """Build the content address of a clip."""
+        payload = json.dumps([provider, model, voice, text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached clip for ``key`` or None on a miss.
+
+        Args:
+            key: Content address built by make_key
+
+        Returns:
+            Audio data as bytes, or None if the clip is not cached
+        """
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process sharing the directory
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store a clip and evict least recently used clips above the size limit.
+
+        Args:
+            key: Content address built by make_key
+            data: Audio data to store
+        """
+        if len(data) > self.max_size_bytes:
+            return
+
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = len(data)
+            self._total_size += len(data)
+            self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current cache occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._total_size,
+            }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.{self.audio_format}")
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from the files already on disk."""
+        suffix = f".{self.audio_format}"
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(suffix):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[: -len(suffix)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_size += size
+        with self._lock:
+            self._evict()
+
+    def _forget(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_size -= size
+
+    def _evict(self) -> None:
+        while self._total_size > self.max_size_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+
+_caches: Dict[str, SegmentCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_segment_cache(directory: str, max_size_mb: float, audio_format: str = "mp3") -> SegmentCache:
+    """
+    Get the process-wide cache for ``directory``, creating it on first use.
+
+    Sharing one instance per directory keeps the LRU index and the hit/miss
+    counters consistent across TextToSpeech instances (one per job in the API).
+    """
+    path = os.path.abspath(directory)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = SegmentCache(path, int(max_size_mb * 1024 * 1024), audio_format)
+            _caches[path] = cache
+        return cache
@@ -0,0 +1,362 @@
+"""
+Audio merging utilities.
+
+MP3 segments produced by a single provider share the same stream parameters, so they can
+be joined by copying their frames into the output file one segment at a time. This keeps
+memory bounded by the largest segment and avoids a decode/re-encode pass. Segments that
+cannot be joined this way are merged with pydub instead.
+"""
+
+import io
+import logging
+import os
+import re
+import tempfile
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from pydub import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+# Bitrates in kbps indexed by [is_mpeg1][layer][bitrate_index]
+_BITRATES = {
+    True: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    False: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+
+# Sample rates in Hz indexed by version bits
+_SAMPLE_RATES = {
+    0b11: (44100, 48000, 32000),  # MPEG 1
+    0b10: (22050, 24000, 16000),  # MPEG 2
+    0b00: (11025, 12000, 8000),  # MPEG 2.5
+}
+
+_LAYERS = {0b11: 1, 0b10: 2, 0b01: 3}
+
+
+# "{idx}_{speaker}.{format}", e.g. "3_Person2.mp3"
+_SEGMENT_NAME = re.compile(r"^(\d+)_([A-Za-z][A-Za-z0-9]*)\.([A-Za-z0-9]+)$")
+
+
+class Mp3FormatError(ValueError):
+    """Raised when data cannot be joined at the MP3 frame level."""
+
+
+class FrameHeader(NamedTuple):
+    """Stream parameters of an MP3 frame that must match across joined segments."""
+
+    version: int
+    layer: int
+    sample_rate: int
+    mono: bool
+
+
+def _parse_header(data: memoryview, offset: int) -> Optional[Tuple[FrameHeader, int]]:
+    """Parse the frame header at ``offset``, returning (header, frame_length) or None."""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0b11
+    layer = _LAYERS.get((b1 >> 1) & 0b11)
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0b11
+    if version == 0b01 or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    is_mpeg1 = version == 0b11
+    bitrate = _BITRATES[is_mpeg1][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+    padding = (b2 >> 1) & 1
+    mono = (b3 >> 6) == 0b11
+
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 3 and not is_mpeg1:
+        length = 72 * bitrate // sample_rate + padding
+    else:
+        length = 144 * bitrate // sample_rate + padding
+
+    return FrameHeader(version, layer, sample_rate, mono), length
+
+
+def _is_info_frame(frame: memoryview, header: FrameHeader) -> bool:
+    """Check whether a frame is a Xing/Info/VBRI header frame rather than audio."""
+    if header.version == 0b11:
+        side_info = 17 if header.mono else 32
+    else:
+        side_info = 9 if header.mono else 17
+    xing = bytes(frame[4 + side_info: 8 + side_info])
+    return xing in (b"Xing", b"Info") or bytes(frame[36:40]) == b"VBRI"
+
+
+def _skip_id3v2(data: memoryview) -> int:
+    """Return the offset of the first byte after a leading ID3v2 tag."""
+    if len(data) >= 10 and bytes(data[:3]) == b"ID3":
+        size = 0
+        for byte in data[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def iter_mp3_frames(data: bytes) -> Iterator[Tuple[FrameHeader, memoryview]]:
+    """
+    Iterate over the audio frames of an MP3 byte string.
+
+    Leading ID3v2 tags, trailing ID3v1/APE tags and Xing/Info/VBRI header frames are
+    skipped, since their metadata would describe only the first segment of a join.
+
+    Args:
+        data: Complete MP3 file contents
+
+    Yields:
+        (header, frame) tuples where frame is a zero-copy view of the frame bytes
+
+    Raises:
+        Mp3FormatError: If the data contains no frames or is not a clean frame sequence
+    """
+    view = memoryview(data)
+    offset = _skip_id3v2(view)
+    end = len(view)
+    if end - offset >= 128 and bytes(view[end - 128:end - 125]) == b"TAG":
+        end -= 128
+
+    first = True
+    found = False
+    while offset < end:
+        parsed = _parse_header(view, offset)
+        if parsed is None:
+            if bytes(view[offset:offset + 8]) == b"APETAGEX":
+                break
+            raise Mp3FormatError(f"Invalid MP3 frame header at byte {offset}")
+        header, length = parsed
+        if offset + length > end:
+            # Truncated trailing frame; drop it rather than emit a corrupt frame
+            logger.debug(f"Dropping truncated MP3 frame at byte {offset}")
+            break
+        frame = view[offset:offset + length]
+        if not (first and _is_info_frame(frame, header)):
+            found = True
+            yield header, frame
+        first = False
+        offset += length
+
+    if not found:
+        raise Mp3FormatError("No MP3 audio frames found")
+
+
+def segment_sort_key(file_path: str) -> int:
+    """
+    Create a sort key from a segment file name: its 1-based position in the turn sequence.
+
+    Example file names: "1_Person1.mp3", "2_Person2.mp3", "3_Person3.mp3"
+    """
+    return int(os.path.basename(file_path).split("_")[0])
+
+
+def list_segments(directory: str, audio_format: str = "mp3") -> List[str]:
+    """
+    List the finished segments of a job, in playback order.
+
+    Args:
+        directory: Directory holding the segment files of a job
+        audio_format: Audio format (file extension) of the segments
+
+    Returns:
+        Paths of the finished segments, which may not be contiguous
+    """
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+
+    segments = [
+        os.path.join(directory, name)
+        for name in names
+        if (match := _SEGMENT_NAME.match(name)) and match.group(3).lower() == audio_format.lower()
+    ]
+    return sorted(segments, key=segment_sort_key)
+
+
+def ready_segments(directory: str, audio_format: str = "mp3") -> List[str]:
+    """
+    List the finished segments of a job that can be played back without gaps.
+
+    Segments are synthesized concurrently and may finish out of order, so only the
+    leading run of segments with no missing predecessor (1_Person1, 2_Person2,
+    3_Person1, ...) is returned. Segments are written atomically, so every listed
+    file is complete.
+
+    Args:
+        directory: Directory holding the segment files of a job
+        audio_format: Audio format (file extension) of the segments
+
+    Returns:
+        Paths of the playable segments, in playback order
+    """
+    available = {segment_sort_key(path): path for path in list_segments(directory, audio_format)}
+
+    playable = []
+    idx = 1
+    while idx in available:
+        playable.append(available[idx])
+        idx += 1
+    return playable
+
+
+def _joined_frames(inputs: Iterable[Tuple[str, bytes]]) -> Iterator[memoryview]:
+    """Audio frames of consecutive (name, MP3 data) inputs, checking that their streams match."""
+    reference: Optional[FrameHeader] = None
+    for name, data in inputs:
+        for header, frame in iter_mp3_frames(data):
+            if reference is None:
+                reference = header
+            elif header != reference:
+                raise Mp3FormatError(f"Incompatible MP3 stream in {name}: {header} != {reference}")
+            yield frame
+
+
+def _read_files(audio_files: List[str]) -> Iterator[Tuple[str, bytes]]:
+    """(path, contents) of each file, reading one file at a time."""
+    for file_path in audio_files:
+        with open(file_path, "rb") as f:
+            yield file_path, f.read()
+
+
+def concat_mp3_files(audio_files: List[str], output_file: str) -> None:
+    """
+    Join MP3 files by copying their audio frames into ``output_file``.
+
+    Only one input file is held in memory at a time.
+
+    Args:
+        audio_files: Paths of the MP3 files to join, in playback order
+        output_file: Path to save the joined file
+
+    Raises:
+        Mp3FormatError: If any input is not a clean MP3 stream or the stream
+            parameters differ between inputs
+    """
+    _write_frames(_joined_frames(_read_files(audio_files)), output_file)
+
+
+def _write_frames(frames: Iterable[memoryview], output_file: str) -> None:
+    """Write frames to a temporary file next to ``output_file`` and move it into place on success."""
+    output_dir = os.path.dirname(output_file) or "."
+    os.makedirs(output_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for frame in frames:
+                out.write(frame)
+        os.replace(tmp_path, output_file)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def merge_with_pydub(audio_files: List[str], output_file: str, audio_format: str) -> None:
+    """
+    Decode every file with pydub and export the re-encoded result.
+
+    Args:
+        audio_files: Paths (or file objects) of the audio files to join, in playback order
+        output_file: Path to save the merged file
+        audio_format: Audio format of the inputs and output
+    """
+    combined = AudioSegment.empty()
+    for file_path in audio_files:
+        combined += AudioSegment.from_file(file_path, format=audio_format)
+
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    combined.export(output_file, format=audio_format)
+
+
+def merge_audio_files(
+    audio_files: List[str], output_file: str, audio_format: str = "mp3", engine: str = "auto"
+) -> None:
+    """
+    Merge audio files in order, preferring frame-level MP3 concatenation.
+
+    Args:
+        audio_files: Paths of the audio files to join, in playback order
+        output_file: Path to save the merged file
+        audio_format: Audio format of the inputs and output
+        engine: 'auto' to join MP3 frames and fall back to pydub, or 'pydub' to always re-encode
+    """
+    if engine != "pydub" and audio_format.lower() == "mp3":
+        try:
+            concat_mp3_files(audio_files, output_file)
+            return
+        except Mp3FormatError as e:
+            logger.warning(f"Frame-level MP3 merge not possible ({e}), falling back to pydub")
+
+    merge_with_pydub(audio_files, output_file, audio_format)
+
+
+def merge_audio_clips(
+    names: List[str],
+    read: Callable[[str], bytes],
+    output_file: str,
+    audio_format: str = "mp3",
+    engine: str = "auto",
+) -> None:
+    """
+    Merge clips held anywhere (e.g. in memory) in order, like merge_audio_files.
+
+    Args:
+        names: Names of the clips, in playback order
+        read: Returns the audio data of a clip by name; called again for the pydub fallback
+        output_file: Path to save the merged file
+        audio_format: Audio format of the clips and output
+        engine: 'auto' to join MP3 frames and fall back to pydub, or 'pydub' to always re-encode
+    """
+    if engine != "pydub" and audio_format.lower() == "mp3":
+        try:
+            _write_frames(_joined_frames((name, read(name)) for name in names), output_file)
+            return
+        except Mp3FormatError as e:
+            logger.warning(f"Frame-level MP3 merge not possible ({e}), falling back to pydub")
+
+    merge_with_pydub([io.BytesIO(read(name)) for name in names], output_file, audio_format)
+
+
+def merge_audio_data(chunks: List[bytes], audio_format: str = "mp3") -> bytes:
+    """
+    Merge in-memory audio clips in order, preferring frame-level MP3 concatenation.
+
+    Args:
+        chunks: Audio data of the clips, in playback order
+        audio_format: Audio format of the clips and the result
+
+    Returns:
+        Audio data of the merged clips
+    """
+    if audio_format.lower() == "mp3":
+        try:
+            inputs = ((f"clip {idx}", chunk) for idx, chunk in enumerate(chunks, 1))
+            return b"".join(_joined_frames(inputs))
+        except Mp3FormatError as e:
+            logger.warning(f"Frame-level MP3 merge not possible ({e}), falling back to pydub")
+
+    combined = AudioSegment.empty()
+    for chunk in chunks:
+        combined += AudioSegment.from_file(io.BytesIO(chunk), format=audio_format)
+    output = io.BytesIO()
+    combined.export(output, format=audio_format)
+    return output.getvalue()
@@ -0,0 +1,113 @@
+"""
+Segment planning for text-to-speech.
+
+Every segment costs one synthesis request, and for short turns the per-request latency
+and billing overhead dominate. The planner turns a sequence of speaker turns into as few
+requests as possible: adjacent turns read by the same voice are merged, and text longer
+than the provider's character limit is split at sentence boundaries. Planning is
+deterministic, so a resumed job plans the same segments as the run it resumes.
+"""
+
+import re
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Whitespace after a sentence end; CJK sentence ends need no whitespace after them
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])\s*")
+
+
+class Segment(NamedTuple):
+    """Text read by one voice in a single synthesis request."""
+
+    speaker: str
+    text: str
+    voice: Optional[str]
+
+
+def split_text(text: str, max_size: Optional[int], size: Callable[[str], int] = len) -> List[str]:
+    """
+    Split text into as few chunks of at most ``max_size`` as possible.
+
+    Chunks end at sentence boundaries; a sentence that is too long by itself is split
+    between words, and a word that is too long between characters.
+
+    Args:
+        text: Whitespace-normalized text
+        max_size: Maximum chunk size; None for no limit
+        size: Measure of a chunk's size, characters by default (e.g. UTF-8 bytes for
+            providers that limit requests in bytes)
+
+    Returns:
+        Chunks in reading order
+    """
+    if max_size is None or size(text) <= max_size:
+        return [text]
+
+    chunks: List[str] = []
+    current = ""
+    for piece in _pieces(text, max_size, size):
+        if current and size(current) + 1 + size(piece) > max_size:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _pieces(text: str, max_size: int, size: Callable[[str], int]) -> Iterator[str]:
+    """Sentences of text, with those larger than max_size broken into words."""
+    for sentence in _SENTENCE_BREAK.split(text):
+        if size(sentence) <= max_size:
+            if sentence:
+                yield sentence
+            continue
+        for word in sentence.split():
+            while size(word) > max_size:
+                cut = max_size
+                while cut > 1 and size(word[:cut]) > max_size:
+                    cut -= 1
+                yield word[:cut]
+                word = word[cut:]
+            if word:
+                yield word
+
+
+def plan_segments(
+    turns: Iterable[Tuple[str, str, Optional[str]]],
+    max_chars: Optional[int] = None,
+) -> Iterator[Segment]:
+    """
+    Plan the synthesis requests for a sequence of turns.
+
+    Adjacent turns with the same voice are merged into one segment (named after the first
+    speaker); turns without a voice are only merged with turns of the same speaker. Each
+    segment is then split into as few segments within ``max_chars`` as possible.
+    A segment is yielded as soon as the voice changes, so turns may come from a stream.
+
+    Args:
+        turns: (speaker, text, voice) turns in speaking order, with normalized whitespace
+        max_chars: The provider's maximum request length; None for no limit
+
+    Yields:
+        Segments in speaking order
+    """
+    pending: Optional[Segment] = None
+    for speaker, text, voice in turns:
+        if not text:
+            continue
+        # Without a voice, turns of different speakers cannot be told to share one
+        if pending and pending.voice == voice and (voice is not None or pending.speaker == speaker):
+            pending = pending._replace(text=f"{pending.text} {text}")
+            continue
+        if pending:
+            yield from _split_segment(pending, max_chars)
+        pending = Segment(speaker, text, voice)
+    if pending:
+        yield from _split_segment(pending, max_chars)
+
+
+def _split_segment(segment: Segment, max_chars: Optional[int]) -> Iterator[Segment]:
+    """Split a segment's text into chunks within max_chars, keeping its speaker and voice."""
+    for chunk in split_text(segment.text, max_chars):
+        yield segment._replace(text=chunk)
@@ -1,12 +1,10 @@
 """Edge TTS provider implementation."""
 
 import edge_tts
-import os
-import tempfile
 from typing import List, Optional
 import threading
-from ..base import TTSProvider
-from podcastfy.utils.decorators import check_cancelled
+from ..base import TTSProvider, run_async
+from podcastfy.utils.decorators import check_cancelled, check_cancelled_async
 
 class EdgeTTS(TTSProvider):
     def __init__(self, api_key: str = None, model: str = None):
@@ -29,35 +27,25 @@ class EdgeTTS(TTSProvider):
         cancel_event: Optional[threading.Event] = None
     ) -> bytes:
         """Generate audio using Edge TTS."""
-        import nest_asyncio
-        import asyncio
-        
-        # Apply nest_asyncio to allow nested event loops
-        nest_asyncio.apply()
-        
-        async def _generate():
-            communicate = edge_tts.Communicate(text, voice)
-            
-            # Create a temporary file with proper context management
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-                temp_path = tmp_file.name
-                
-            try:
-                # Save audio to temporary file
-                await communicate.save(temp_path)
-                
-                # Read the audio data
-                with open(temp_path, 'rb') as f:
-                    return f.read()
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+        return run_async(self.agenerate_audio(text, voice, model, voice2, cancel_event=cancel_event))
 
-        # Use nest_asyncio to handle nested event loops
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(_generate())
+    @check_cancelled_async
+    async def agenerate_audio(
+        self,
+        text: str,
+        voice: str,
+        model: str,
+        voice2: str = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> bytes:
+        """Generate audio using Edge TTS, collecting the streamed audio chunks in memory."""
+        communicate = edge_tts.Communicate(text, voice)
+        audio = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+        return bytes(audio)
         
     def get_supported_tags(self) -> List[str]:
         """Get supported SSML tags."""
-        return self.COMMON_SSML_TAGS
\ No newline at end of file
+        return self.COMMON_SSML_TAGS
@@ -1,12 +1,16 @@
 """ElevenLabs TTS provider implementation."""
 
+import httpx
 from elevenlabs import client as elevenlabs_client
 from ..base import TTSProvider
 from typing import List, Optional
 import threading
-from podcastfy.utils.decorators import check_cancelled
+from podcastfy.utils.decorators import check_cancelled, check_cancelled_async
 
 class ElevenLabsTTS(TTSProvider):
+    # Request limit of the multilingual models; the flash and turbo models accept more
+    MAX_CHARACTERS = 5000
+
     def __init__(self, api_key: str, model: str = "eleven_multilingual_v2"):
         """
         Initialize ElevenLabs TTS provider.
@@ -15,6 +19,7 @@ class ElevenLabsTTS(TTSProvider):
             api_key (str): ElevenLabs API key
             model (str): Model name to use. Defaults to "eleven_multilingual_v2"
         """
+        self.api_key = api_key
         self.client = elevenlabs_client.ElevenLabs(api_key=api_key)
         self.model = model
         
@@ -41,6 +46,39 @@ class ElevenLabsTTS(TTSProvider):
         except Exception as e:
             raise RuntimeError(f"Failed to generate audio: {str(e)}") from e
         
+    @check_cancelled_async
+    async def agenerate_audio(
+        self,
+        text: str,
+        voice: str,
+        model: str,
+        voice2: str = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> bytes:
+        """Generate audio using the async ElevenLabs client."""
+        self.validate_parameters(text, voice, model, voice2, cancel_event)
+
+        try:
+            audio = await self._get_async_client().generate(
+                text=text,
+                voice=voice,
+                model=model,
+                # The RequestScheduler is the only retry layer; SDK retries would multiply its attempts
+                request_options={"max_retries": 0}
+            )
+            return b''.join([chunk async for chunk in audio if chunk])
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate audio: {str(e)}") from e
+
+    def _create_async_client(self) -> elevenlabs_client.AsyncElevenLabs:
+        # The SDK client cannot be closed, so it gets an HTTP client owned by the provider
+        self._async_http_client = httpx.AsyncClient(timeout=240, follow_redirects=True)
+        return elevenlabs_client.AsyncElevenLabs(api_key=self.api_key, httpx_client=self._async_http_client)
+
+    async def _close_async_client(self, client: elevenlabs_client.AsyncElevenLabs) -> None:
+        await self._async_http_client.aclose()
+
     def get_supported_tags(self) -> List[str]:
         """Get supported SSML tags."""
         return ['lang', 'p', 'phoneme', 's', 'sub'] 
\ No newline at end of file
@@ -1,17 +1,36 @@
 """Google Cloud Text-to-Speech provider implementation."""
 
+import asyncio
 from google.cloud import texttospeech_v1beta1
-from typing import List, Optional
-from ..base import TTSProvider
-import re
+from typing import Awaitable, Dict, List, Optional, Tuple
+from ..base import TTSProvider, run_async
+from ..merger import merge_audio_data
+from ..planner import split_text
+from ..scheduler import RequestScheduler
 import logging
 import threading
 from podcastfy.utils.decorators import check_cancelled
 
 logger = logging.getLogger(__name__)
 
+
+def _utf8_size(text: str) -> int:
+    """Size of text in UTF-8 bytes, the unit of the API's request limit."""
+    return len(text.encode("utf-8"))
+
+
 class GoogleMultispeakerTTS(TTSProvider):
     """Google Cloud Text-to-Speech provider with multi-speaker support."""
+
+    # Speakers of the en-US-Studio-MultiSpeaker voice
+    MULTISPEAKER_VOICES = ("R", "S", "T", "U")
+
+    # The API limits the text of a request to 5000 bytes. This single limit both packs
+    # turns into requests and splits turns too long for one request; it is measured in
+    # UTF-8 bytes because a character limit would overflow requests in non-Latin scripts.
+    # The segment planner's MAX_CHARACTERS does not apply, since this provider
+    # synthesizes whole transcripts rather than planned segments.
+    MAX_REQUEST_BYTES = 5000
     
     def __init__(self, api_key: str = None, model: str = "en-US-Studio-MultiSpeaker"):
         """
@@ -25,7 +44,7 @@ class GoogleMultispeakerTTS(TTSProvider):
             self.client = texttospeech_v1beta1.TextToSpeechClient(
                 client_options={'api_key': api_key} if api_key else None
             )
-            self.ending_message = ""  # Required for split_qa method
+            self.ending_message = ""  # Required for split_turns method
         except Exception as e:
             logger.error(f"Failed to initialize Google TTS client: {str(e)}")
             raise
@@ -38,18 +57,28 @@ class GoogleMultispeakerTTS(TTSProvider):
         model: str = "en-US-Studio-MultiSpeaker", 
         voice2: str = "S", 
         ending_message: str = "",
-        cancel_event: Optional[threading.Event] = None
+        cancel_event: Optional[threading.Event] = None,
+        speaker_voices: Optional[Dict[str, str]] = None,
+        max_workers: int = 1
     ) -> bytes:
         """
         Generate audio using Google Cloud TTS API with multi-speaker support.
+
+        The transcript is sent as multi-speaker requests of at most MAX_REQUEST_BYTES
+        of text, up to ``max_workers`` at a time, and their MP3 audio is joined in
+        transcript order. See agenerate_transcript_audio to rate-limit and retry each
+        request through a RequestScheduler.
         
         Args:
-            text: Text to convert to speech (in Person1/Person2 format)
-            voice: Voice ID for the current segment (R or S)
+            text: Text to convert to speech (in Person1/Person2/Person3... format)
+            voice: Voice ID of Person1 (R, S, T or U)
             model: Model name (must be 'en-US-Studio-MultiSpeaker')
-            voice2: Second voice ID
+            voice2: Voice ID of Person2
             ending_message: Optional ending message
             cancel_event: Optional event to check for cancellation
+            speaker_voices: Optional voice IDs of other speakers, e.g. {"Person3": "T"};
+                speakers without one get the voices not used by other speakers in turn
+            max_workers: Maximum number of concurrent requests
             
         Returns:
             bytes: Audio data
@@ -59,65 +88,175 @@ class GoogleMultispeakerTTS(TTSProvider):
             RuntimeError: If audio generation fails
             Exception: If operation is cancelled
         """
-        print(f"Generating audio with voice: {voice}, voice2: {voice2}, model: {model}")
+        return run_async(self.agenerate_transcript_audio(
+            text,
+            voice=voice,
+            model=model,
+            voice2=voice2,
+            ending_message=ending_message,
+            cancel_event=cancel_event,
+            speaker_voices=speaker_voices,
+            max_workers=max_workers
+        ))
+
+    async def agenerate_transcript_audio(
+        self,
+        text: str,
+        voice: str = "R",
+        model: str = "en-US-Studio-MultiSpeaker",
+        voice2: str = "S",
+        ending_message: str = "",
+        cancel_event: Optional[threading.Event] = None,
+        speaker_voices: Optional[Dict[str, str]] = None,
+        max_workers: int = 1,
+        scheduler: Optional[RequestScheduler] = None
+    ) -> bytes:
+        """
+        Generate audio for a transcript like generate_audio, without blocking the event loop.
+
+        With a ``scheduler``, every multi-speaker request takes its own token from the
+        provider's rate limit and is retried on its own, so a failed request never
+        re-synthesizes the requests that already succeeded.
+
+        Args:
+            See generate_audio; scheduler is the optional RequestScheduler of the provider
+
+        Returns:
+            bytes: Audio data
+
+        Raises:
+            ValueError: If parameters are invalid
+            RuntimeError: If audio generation fails
+            Exception: If operation is cancelled
+        """
         self.validate_parameters(text, voice, model, voice2, cancel_event)
-          
+
         try:
-            # Create multi-speaker markup
-            multi_speaker_markup = texttospeech_v1beta1.MultiSpeakerMarkup()
-            
-            # Get Q&A pairs using the base class method
-            qa_pairs = self.split_qa(
-                text, 
-                ending_message, 
-                self.get_supported_tags(),
-                cancel_event=cancel_event
-            )
-            
-            # Add turns for each Q&A pair
-            for idx, (question, answer) in enumerate(qa_pairs, 1):
-                print(f"question: {question}, answer: {answer}")
-                
-                # Add question turn
-                q_turn = texttospeech_v1beta1.MultiSpeakerMarkup.Turn()
-                q_turn.text = question.strip()
-                q_turn.speaker = voice  # First speaker
-                multi_speaker_markup.turns.append(q_turn)
-                
-                # Add answer turn
-                a_turn = texttospeech_v1beta1.MultiSpeakerMarkup.Turn()
-                a_turn.text = answer.strip()
-                a_turn.speaker = voice2  # Second speaker
-                multi_speaker_markup.turns.append(a_turn)
-            
-            # Create synthesis input with multi-speaker markup
-            synthesis_input = texttospeech_v1beta1.SynthesisInput(
-                multi_speaker_markup=multi_speaker_markup
-            )
-            
-            # Set voice parameters - must use the multi-speaker model
-            voice_params = texttospeech_v1beta1.VoiceSelectionParams(
-                language_code="en-US",
-                name=model  # Use the model attribute
+            requests = self._chunk_turns(
+                self._voiced_turns(text, voice, voice2, ending_message, speaker_voices, cancel_event)
             )
-            
-            # Set audio config
-            audio_config = texttospeech_v1beta1.AudioConfig(
-                audio_encoding=texttospeech_v1beta1.AudioEncoding.MP3
-            )
-            
-            # Generate speech
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice_params,
-                audio_config=audio_config
+            if not requests:
+                raise ValueError("Transcript has no speaker turns")
+            workers = max(1, min(max_workers, len(requests)))
+            logger.info(
+                f"Synthesizing {sum(len(turns) for turns in requests)} turns in "
+                f"{len(requests)} multi-speaker requests with {workers} concurrent requests "
+                f"(model: {model}, voices: {voice}/{voice2})"
             )
-            
-            return response.audio_content
-            
+
+            semaphore = asyncio.Semaphore(workers)
+
+            async def synthesize(turns: List[Tuple[str, str]]) -> bytes:
+                def request() -> Awaitable[bytes]:
+                    return asyncio.to_thread(self._synthesize, turns, model, cancel_event=cancel_event)
+
+                async with semaphore:
+                    if scheduler is None:
+                        return await request()
+                    return await scheduler.run(request, cancel_event=cancel_event)
+
+            tasks = [asyncio.create_task(synthesize(turns)) for turns in requests]
+            try:
+                # Fail as soon as one request has failed for good
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+                failed = next((task for task in tasks if task.done() and task.exception()), None)
+                if failed is not None:
+                    raise failed.exception()
+                audio_chunks = [task.result() for task in tasks]
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            return merge_audio_data(audio_chunks)
+
         except Exception as e:
             logger.error(f"Failed to generate audio: {str(e)}")
             raise RuntimeError(f"Failed to generate audio: {str(e)}") from e
+
+    def _voiced_turns(
+        self,
+        text: str,
+        voice: str,
+        voice2: str,
+        ending_message: str,
+        speaker_voices: Optional[Dict[str, str]],
+        cancel_event: Optional[threading.Event]
+    ) -> List[Tuple[str, str]]:
+        """Split the transcript into (text, voice ID) turns of at most MAX_REQUEST_BYTES."""
+        # Consecutive turns of a speaker are batched into one markup turn
+        turns = self.split_turns(
+            text,
+            ending_message,
+            self.get_supported_tags(),
+            cancel_event=cancel_event
+        )
+
+        voices = {"Person1": voice, "Person2": voice2, **(speaker_voices or {})}
+        spare_voices = [
+            v for v in self.MULTISPEAKER_VOICES if v not in voices.values()
+        ] or list(self.MULTISPEAKER_VOICES)
+        voiced = []
+        for turn in turns:
+            if turn.speaker not in voices:
+                voices[turn.speaker] = spare_voices[(len(voices) - 2) % len(spare_voices)]
+            voiced.extend(
+                (chunk, voices[turn.speaker])
+                for chunk in split_text(turn.text, self.MAX_REQUEST_BYTES, size=_utf8_size)
+            )
+        return voiced
+
+    def _chunk_turns(self, turns: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Pack consecutive turns into as few requests of at most MAX_REQUEST_BYTES as possible."""
+        requests: List[List[Tuple[str, str]]] = []
+        size = 0
+        for turn_text, voice in turns:
+            turn_size = _utf8_size(turn_text)
+            if not requests or size + turn_size > self.MAX_REQUEST_BYTES:
+                requests.append([])
+                size = 0
+            requests[-1].append((turn_text, voice))
+            size += turn_size
+        return requests
+
+    @check_cancelled
+    def _synthesize(
+        self,
+        turns: List[Tuple[str, str]],
+        model: str,
+        cancel_event: Optional[threading.Event] = None
+    ) -> bytes:
+        """Synthesize one multi-speaker request of (text, voice ID) turns."""
+        multi_speaker_markup = texttospeech_v1beta1.MultiSpeakerMarkup()
+        for turn_text, voice in turns:
+            markup_turn = texttospeech_v1beta1.MultiSpeakerMarkup.Turn()
+            markup_turn.text = turn_text
+            markup_turn.speaker = voice
+            multi_speaker_markup.turns.append(markup_turn)
+
+        # Create synthesis input with multi-speaker markup
+        synthesis_input = texttospeech_v1beta1.SynthesisInput(
+            multi_speaker_markup=multi_speaker_markup
+        )
+
+        # Set voice parameters - must use the multi-speaker model
+        voice_params = texttospeech_v1beta1.VoiceSelectionParams(
+            language_code="en-US",
+            name=model  # Use the model attribute
+        )
+
+        # Set audio config
+        audio_config = texttospeech_v1beta1.AudioConfig(
+            audio_encoding=texttospeech_v1beta1.AudioEncoding.MP3
+        )
+
+        # Generate speech
+        response = self.client.synthesize_speech(
+            input=synthesis_input,
+            voice=voice_params,
+            audio_config=audio_config
+        )
+        logger.debug(f"Synthesized multi-speaker request of {len(turns)} turns")
+        return response.audio_content
     
     def get_supported_tags(self) -> List[str]:
         """Get supported SSML tags."""
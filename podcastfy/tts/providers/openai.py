@@ -4,13 +4,15 @@ import openai
 from typing import List, Optional
 import threading
 from ..base import TTSProvider
-from podcastfy.utils.decorators import check_cancelled
+from podcastfy.utils.decorators import check_cancelled, check_cancelled_async
 
 class OpenAITTS(TTSProvider):
     """OpenAI Text-to-Speech provider."""
     
     # Provider-specific SSML tags
     PROVIDER_SSML_TAGS: List[str] = ['break', 'emphasis']
+
+    MAX_CHARACTERS = 4096
     
     def __init__(self, api_key: Optional[str] = None, model: str = "tts-1-hd"):
         """
@@ -24,6 +26,7 @@ class OpenAITTS(TTSProvider):
             openai.api_key = api_key
         elif not openai.api_key:
             raise ValueError("OpenAI API key must be provided or set in environment")
+        self.api_key = openai.api_key
         self.model = model
             
     def get_supported_tags(self) -> List[str]:
@@ -51,4 +54,31 @@ class OpenAITTS(TTSProvider):
             return response.content
             
         except Exception as e:
-            raise RuntimeError(f"Failed to generate audio: {str(e)}") from e
\ No newline at end of file
+            raise RuntimeError(f"Failed to generate audio: {str(e)}") from e
+
+    @check_cancelled_async
+    async def agenerate_audio(
+        self,
+        text: str,
+        voice: str,
+        model: str,
+        voice2: str = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> bytes:
+        """Generate audio using the async OpenAI client."""
+        self.validate_parameters(text, voice, model, voice2, cancel_event)
+
+        try:
+            response = await self._get_async_client().audio.speech.create(
+                model=model,
+                voice=voice,
+                input=text
+            )
+            return response.content
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate audio: {str(e)}") from e
+
+    def _create_async_client(self) -> openai.AsyncOpenAI:
+        # The RequestScheduler is the only retry layer; SDK retries would multiply its attempts
+        return openai.AsyncOpenAI(api_key=self.api_key, max_retries=0)
@@ -0,0 +1,259 @@
+"""
+Request scheduling for TTS providers.
+
+Every synthesis request goes through a RequestScheduler shared by all jobs in the process
+that use the same provider and API key. The scheduler paces requests with a token bucket,
+retries rate-limited (429) and transient (5xx, timeout, connection) failures with jittered
+exponential backoff, and honours Retry-After by pausing the whole bucket, so one failed
+segment is retried in place instead of failing the job.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+_TRANSIENT_ERRORS: Tuple[type, ...] = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+try:
+    import httpx
+
+    _TRANSIENT_ERRORS += (httpx.TransportError,)
+except ImportError:  # pragma: no cover - httpx ships with the OpenAI client
+    pass
+try:
+    import aiohttp
+
+    _TRANSIENT_ERRORS += (aiohttp.ClientConnectionError,)
+except ImportError:  # pragma: no cover - aiohttp ships with edge-tts
+    pass
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """Get the HTTP status code carried by a client library error, if any."""
+    # google.api_core errors carry the HTTP status as ``code``
+    for attr in ("status_code", "status", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Get the delay requested by a Retry-After header (in seconds), if any."""
+    headers = getattr(error, "headers", None) or getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: BaseException) -> Tuple[bool, Optional[float]]:
+    """
+    Decide whether a failed request may be retried.
+
+    Providers wrap client errors (e.g. ``RuntimeError(...) from e``), so the whole
+    cause chain is inspected.
+
+    Args:
+        error: Exception raised by the request
+
+    Returns:
+        (retryable, retry_after) where retry_after is the server-requested delay in seconds
+    """
+    current: Optional[BaseException] = error
+    seen = set()
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        status = _status_code(current)
+        if status is not None:
+            return status in RETRYABLE_STATUS_CODES, _retry_after(current)
+        if isinstance(current, _TRANSIENT_ERRORS):
+            return True, None
+        current = current.__cause__ or current.__context__
+    return False, None
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared across threads and event loops.
+
+    Tokens refill at ``rate`` per second up to ``burst``. A rate of None disables limiting.
+    """
+
+    def __init__(self, rate: Optional[float], burst: Optional[float] = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Requests per second, or None for no limit
+            burst: Maximum number of requests that may be sent back to back
+        """
+        self.rate = rate
+        self.capacity = max(1.0, float(burst if burst is not None else (rate or 1)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            pause = max(0.0, self._paused_until - now)
+            if self.rate is None:
+                return pause
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, pause)
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for ``seconds``, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RequestScheduler:
+    """Run provider requests under a rate limit, retrying transient failures."""
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            bucket: Rate limiter shared by all requests for a provider and API key
+            max_retries: Retries per request before the error is raised
+            base_delay: Backoff delay before the first retry, doubled on each retry
+            max_delay: Upper bound on a single backoff delay, including a Retry-After delay
+        """
+        self.bucket = bucket
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for the given retry attempt (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def run(
+        self,
+        request: Callable[[], Awaitable[T]],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> T:
+        """
+        Send a request, retrying it while it fails with a retryable error.
+
+        Args:
+            request: Callable creating a fresh awaitable for each attempt
+            cancel_event: Optional event to check for cancellation between attempts
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            Exception: The last error if it is not retryable or retries are exhausted,
+                or if the operation is cancelled
+        """
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            try:
+                return await request()
+            except Exception as e:
+                retryable, retry_after = classify_error(e)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                if cancel_event is not None and cancel_event.is_set():
+                    raise
+
+                if retry_after is not None:
+                    # The server asked everyone using this key to slow down; an oversized
+                    # Retry-After must not stall the provider for longer than any backoff
+                    delay = min(retry_after, self.max_delay)
+                    self.bucket.pause(delay)
+                else:
+                    delay = self.backoff(attempt)
+                attempt += 1
+                self.retries += 1
+                logger.warning(
+                    f"TTS request failed ({str(e)}), retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                await self._sleep(delay, cancel_event)
+
+    @staticmethod
+    async def _sleep(delay: float, cancel_event: Optional[threading.Event]) -> None:
+        """Sleep for ``delay`` seconds, waking up early to honour cancellation."""
+        deadline = time.monotonic() + delay
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise Exception("Operation run cancelled by user")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, 0.5))
+
+
+_schedulers: Dict[Tuple[str, str], RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_request_scheduler(
+    provider_name: str,
+    api_key: Optional[str],
+    rate_limit: Optional[Dict[str, Any]] = None,
+    retry: Optional[Dict[str, Any]] = None,
+) -> RequestScheduler:
+    """
+    Get the process-wide scheduler for a provider and API key, creating it on first use.
+
+    Args:
+        provider_name: TTS provider name
+        api_key: API key the requests are sent with; each key has its own rate limit
+        rate_limit: 'requests_per_second' and 'burst'; no limit if omitted
+        retry: 'max_retries', 'base_delay' and 'max_delay'
+
+    Returns:
+        RequestScheduler: The shared scheduler
+    """
+    key_id = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+    with _schedulers_lock:
+        scheduler = _schedulers.get((provider_name, key_id))
+        if scheduler is None:
+            rate_limit = rate_limit or {}
+            retry = retry or {}
+            scheduler = RequestScheduler(
+                TokenBucket(rate_limit.get("requests_per_second"), rate_limit.get("burst")),
+                max_retries=retry.get("max_retries", 5),
+                base_delay=retry.get("base_delay", 1.0),
+                max_delay=retry.get("max_delay", 60.0),
+            )
+            _schedulers[(provider_name, key_id)] = scheduler
+        return scheduler
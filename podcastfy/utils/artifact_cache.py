@@ -0,0 +1,146 @@
+"""
+Artifact Cache Module
+
+This module stores the outputs of the pipeline stages (transcripts and final audio) under
+content-addressed stage keys. A stage key hashes only the inputs that affect that stage,
+so a job that differs from an earlier one only in its text-to-speech settings reuses the
+earlier transcript and re-runs synthesis alone, and an identical job reuses both.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("transcript", "audio")
+
+
+def stage_key(stage: str, inputs: Dict[str, Any]) -> str:
+    """
+    Compute the key of a stage artifact from the inputs that determine it.
+
+    Args:
+        stage (str): Pipeline stage, 'transcript' or 'audio'.
+        inputs (Dict[str, Any]): JSON-serializable stage inputs.
+
+    Returns:
+        str: Hex digest identifying the artifact.
+    """
+    payload = json.dumps({"stage": stage, "inputs": inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """
+    On-disk store of stage artifacts, one file per (stage, key).
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the ArtifactCache.
+
+        Args:
+            directory (str): Directory holding one subdirectory per stage.
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        for stage in STAGES:
+            os.makedirs(os.path.join(self.directory, stage), exist_ok=True)
+
+    def fetch(self, stage: str, key: str, output_file: str) -> bool:
+        """
+        Copy a cached artifact to ``output_file`` if it exists.
+
+        Args:
+            stage (str): Pipeline stage of the artifact.
+            key (str): Stage key from stage_key.
+            output_file (str): Destination path.
+
+        Returns:
+            bool: True if the artifact was found and copied.
+        """
+        path = self._path(stage, key, output_file)
+        try:
+            self._copy(path, output_file)
+        except FileNotFoundError:
+            self._record(hit=False)
+            return False
+        self._record(hit=True)
+        logger.info(f"Reusing cached {stage} {key[:12]} for {output_file}")
+        return True
+
+    def put(self, stage: str, key: str, source_file: str) -> None:
+        """
+        Store a copy of a freshly produced artifact.
+
+        Args:
+            stage (str): Pipeline stage of the artifact.
+            key (str): Stage key from stage_key.
+            source_file (str): Path of the artifact to store.
+        """
+        try:
+            self._copy(source_file, self._path(stage, key, source_file))
+        except OSError as e:
+            logger.warning(f"Could not cache {stage} {key[:12]}: {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _path(self, stage: str, key: str, file_path: str) -> str:
+        extension = os.path.splitext(file_path)[1]
+        return os.path.join(self.directory, stage, f"{key}{extension}")
+
+    @staticmethod
+    def _copy(source_file: str, output_file: str) -> None:
+        # Copy under a temporary name so concurrent readers never see a partial file
+        directory = os.path.dirname(output_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(source_file, tmp_path)
+            os.replace(tmp_path, output_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+_caches: Dict[str, ArtifactCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_artifact_cache(directory: str) -> ArtifactCache:
+    """
+    Get the process-wide artifact cache for a directory, creating it on first use.
+
+    Args:
+        directory (str): Directory holding cached artifacts.
+
+    Returns:
+        ArtifactCache: The shared cache instance.
+    """
+    path = os.path.abspath(directory)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = ArtifactCache(path)
+            _caches[path] = cache
+        return cache
@@ -0,0 +1,103 @@
+"""
+Job Checkpoint Module
+
+This module records the stage artifacts of a job as they are produced, so that a job that
+failed, was stopped or was interrupted by a restart can resume from its last completed
+stage instead of starting over. The checkpoint lives next to the job's audio segments.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from podcastfy.tts.merger import list_segments
+
+logger = logging.getLogger(__name__)
+
+
+class JobCheckpoint:
+    """
+    Checkpoint of a job's completed stages: extracted text, transcript and audio segments.
+    """
+
+    def __init__(self, directory: str, job_id: str, audio_format: str = "mp3"):
+        """
+        Initialize the JobCheckpoint.
+
+        Args:
+            directory (str): The job's temporary audio directory.
+            job_id (str): Job ID.
+            audio_format (str): Audio format of the job's segments.
+        """
+        self.directory = directory
+        self.job_id = job_id
+        self.audio_format = audio_format
+        self.path = os.path.join(directory, f"checkpoint_{job_id}.json")
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the recorded stages, dropping those whose artifact no longer exists.
+
+        Returns:
+            Dict[str, Any]: 'extracted_text' and 'transcript_file' paths, when recorded.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {stage: path for stage, path in state.items() if path and os.path.exists(path)}
+
+    def save_extracted_text(self, text: str) -> None:
+        """
+        Record the text extracted from the job's sources.
+
+        Args:
+            text (str): Combined extracted text.
+        """
+        path = os.path.join(self.directory, f"extracted_{self.job_id}.txt")
+        self._write(path, text)
+        self._update(extracted_text=path)
+
+    def save_transcript(self, transcript_file: str) -> None:
+        """
+        Record the completed transcript.
+
+        Args:
+            transcript_file (str): Path of the saved transcript.
+        """
+        self._update(transcript_file=transcript_file)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Describe the completed stages for the job record.
+
+        Returns:
+            Dict[str, Any]: Recorded artifact paths and the names of finished segments.
+        """
+        state = self.load()
+        state["completed_segments"] = self.completed_segments()
+        return state
+
+    def completed_segments(self) -> List[str]:
+        """Names of the audio segments already synthesized, in playback order."""
+        return [os.path.basename(path) for path in list_segments(self.directory, self.audio_format)]
+
+    def _update(self, **stages: Optional[str]) -> None:
+        state = self.load()
+        state.update(stages)
+        self._write(self.path, json.dumps(state, ensure_ascii=False))
+
+    def _write(self, path: str, text: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -7,28 +7,98 @@ and a YAML file for non-sensitive configuration settings.
 """
 
 import os
+import threading
 from dotenv import load_dotenv, find_dotenv 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set, Tuple
 import yaml
 import copy
 
+# Parsed YAML files keyed by path, with the (mtime, size) they were parsed at
+_yaml_snapshots: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_yaml_lock = threading.Lock()
+_dotenv_loaded = False
+_created_directories: Set[str] = set()
+
+
+def load_yaml_snapshot(config_path: str) -> Dict[str, Any]:
+    """
+    Parse a YAML file, reusing the previous result while the file is unchanged.
+
+    The returned dictionary is shared between callers and must be treated as
+    read-only; NestedConfig reads it as a copy-on-write view, so configure()
+    on a config object never writes through to the snapshot.
+
+    Args:
+        config_path (str): Path to the YAML file
+
+    Returns:
+        Dict[str, Any]: The parsed YAML content
+    """
+    stat = os.stat(config_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _yaml_lock:
+        cached = _yaml_snapshots.get(config_path)
+        if cached and cached[0] == version:
+            return cached[1]
+    with open(config_path, 'r') as file:
+        data = yaml.safe_load(file) or {}
+    with _yaml_lock:
+        _yaml_snapshots[config_path] = (version, data)
+    return data
+
+
+def _load_dotenv_once() -> None:
+    """Load the .env file into the environment on first use only."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    # Try to find .env file
+    dotenv_path = find_dotenv(usecwd=True)
+    if dotenv_path:
+        load_dotenv(dotenv_path)
+    else:
+        print("Warning: .env file not found. Using environment variables if available.")
+
+
+def _copy_container(value: Any) -> Any:
+    """Copy lists and dicts nested in a list so instances never share mutable state."""
+    if isinstance(value, list):
+        return [_copy_container(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_container(item) for key, item in value.items()}
+    return value
+
+
 class NestedConfig:
     """
     A class to handle nested configuration objects with proper method inheritance.
+
+    A NestedConfig is a copy-on-write view of its dictionary: construction is constant
+    time, and a value is only copied into the object when it is first read, so many
+    configs can share one parsed snapshot. Values set on the object (e.g. by configure)
+    are kept on the object and never reach the dictionary.
     """
     def __init__(self, config_dict: Dict[str, Any]):
         """
         Initialize a nested configuration object.
 
         Args:
-            config_dict (Dict[str, Any]): Dictionary containing the nested configuration
+            config_dict (Dict[str, Any]): Dictionary containing the nested configuration.
+                It is shared, so it must not be modified afterwards; the config never
+                modifies it.
         """
-        for key, value in config_dict.items():
-            if isinstance(value, dict):
-                setattr(self, key, NestedConfig(value))
-            else:
-                setattr(self, key, value)
-    
+        self._source = config_dict
+
+    def __getattr__(self, key: str) -> Any:
+        """Copy a value from the shared dictionary into the object on first read."""
+        if key.startswith('_') or key not in self.__dict__.get('_source', {}):
+            raise AttributeError(key)
+        value = self._source[key]
+        value = NestedConfig(value) if isinstance(value, dict) else _copy_container(value)
+        setattr(self, key, value)
+        return value
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the NestedConfig object to a dictionary, preserving nested structure.
@@ -37,8 +107,9 @@ class NestedConfig:
             Dict[str, Any]: A dictionary representation of the configuration
         """
         result = {}
-        for key, value in self.__dict__.items():
+        for key in [*self._source, *(k for k in self.__dict__ if k not in self._source)]:
             if not key.startswith('_'):
+                value = getattr(self, key)
                 if isinstance(value, NestedConfig):
                     result[key] = value.to_dict()
                 else:
@@ -88,12 +159,7 @@ class Config(NestedConfig):
         Args:
             config_file (str): Path to the YAML configuration file. Defaults to 'config.yaml'.
         """
-        # Try to find .env file
-        dotenv_path = find_dotenv(usecwd=True)
-        if dotenv_path:
-            load_dotenv(dotenv_path)
-        else:
-            print("Warning: .env file not found. Using environment variables if available.")
+        _load_dotenv_once()
         
         # Load API keys from environment variables
         api_keys = {
@@ -105,17 +171,14 @@ class Config(NestedConfig):
         
         config_path = get_config_path(config_file)
         if config_path:
-            with open(config_path, 'r') as file:
-                config_dict = yaml.safe_load(file)
+            config_dict = load_yaml_snapshot(config_path)
         else:
             print("Could not locate config.yaml")
             config_dict = {}
             
-        # Merge API keys with config
-        config_dict.update(api_keys)
-        
-        # Initialize NestedConfig with the merged configuration
+        # View the shared snapshot; API keys are set on this config only
         super().__init__(config_dict)
+        self.configure(api_keys)
         
         # Create output directories if specified
         self._setup_directories()
@@ -125,8 +188,9 @@ class Config(NestedConfig):
         output_dirs = self.get('output_directories', {})
         if isinstance(output_dirs, dict):
             for dir_path in output_dirs.values():
-                if dir_path:
+                if dir_path and dir_path not in _created_directories:
                     os.makedirs(dir_path, exist_ok=True)
+                    _created_directories.add(dir_path)
 
 def get_config_path(config_file: str = 'config.yaml'):
     """
@@ -163,6 +227,9 @@ def load_config() -> Config:
     """
     Load and return a Config instance.
 
+    The config is a copy-on-write view of the shared parsed config.yaml, so loading
+    it does not copy the configuration, and changes made to it stay private to it.
+
     Returns:
         Config: An instance of the Config class.
     """
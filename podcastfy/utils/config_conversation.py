@@ -5,10 +5,8 @@ This module handles the loading and management of conversation configuration set
 for the Podcastfy application. It uses a YAML file for conversation-specific configuration settings.
 """
 
-import copy
 from typing import Any, Dict, Optional, List
-import yaml
-from .config import NestedConfig, get_config_path
+from .config import NestedConfig, get_config_path, load_yaml_snapshot
 
 class ConversationConfig(NestedConfig):
 	def __init__(self, config_dict: Optional[Dict[str, Any]] = None):
@@ -22,10 +20,8 @@ class ConversationConfig(NestedConfig):
 		default_config = self._load_default_config()
 		
 		if config_dict is not None:
-			# Create a deep copy of the default configuration
-			merged_config = copy.deepcopy(default_config)
-			# Update with provided configuration
-			self._deep_update(merged_config, config_dict)
+			# Overlay the provided configuration; the default is shared and never modified
+			merged_config = self._overlay(default_config, config_dict)
 		else:
 			merged_config = default_config
 		
@@ -36,24 +32,31 @@ class ConversationConfig(NestedConfig):
 		"""Load the default configuration from conversation_config.yaml."""
 		config_path = get_config_path('conversation_config.yaml')
 		if config_path:
-			with open(config_path, 'r') as file:
-				return yaml.safe_load(file)
+			return load_yaml_snapshot(config_path)
 		else:
 			raise FileNotFoundError("conversation_config.yaml not found")
 
-	def _deep_update(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
+	def _overlay(self, base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
 		"""
-		Recursively update a nested dictionary.
+		Recursively merge overrides onto a base dictionary without modifying either.
+
+		Only the dictionaries along overridden paths are copied; untouched
+		sections are shared with the base.
 
 		Args:
-			target (Dict[str, Any]): The dictionary to update
-			source (Dict[str, Any]): The dictionary containing updates
+			base (Dict[str, Any]): The dictionary providing defaults
+			overrides (Dict[str, Any]): The dictionary containing updates
+
+		Returns:
+			Dict[str, Any]: The merged dictionary
 		"""
-		for key, value in source.items():
-			if isinstance(value, dict) and key in target and isinstance(target[key], dict):
-				self._deep_update(target[key], value)
+		merged = dict(base)
+		for key, value in overrides.items():
+			if isinstance(value, dict) and isinstance(merged.get(key), dict):
+				merged[key] = self._overlay(merged[key], value)
 			else:
-				target[key] = value
+				merged[key] = value
+		return merged
 
 	def get_list(self, key: str, default: Optional[List[str]] = None) -> List[str]:
 		"""
@@ -0,0 +1,139 @@
+"""
+Prompt Registry Module
+
+This module resolves LangChain prompt templates by name and commit without a network
+round trip on every job. Templates are looked up, in order, in an in-process memo, an
+on-disk cache and finally the LangChain hub; templates pulled from the hub are written
+to the on-disk cache so that later processes (including air-gapped workers sharing the
+cache) never need the hub again.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import warnings
+from typing import Dict, Tuple
+
+from langchain_core.load import dumps, loads
+from langchain_core.prompts import ChatPromptTemplate
+
+logger = logging.getLogger(__name__)
+
+
+class PromptRegistry:
+    """
+    Registry of prompt templates keyed by (template name, commit).
+    """
+
+    def __init__(self, cache_directory: str):
+        """
+        Initialize the PromptRegistry.
+
+        Args:
+            cache_directory (str): Directory where templates pulled from the hub are stored.
+        """
+        self.cache_directory = cache_directory
+        self._memo: Dict[Tuple[str, str], ChatPromptTemplate] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_name(name: str, commit: str) -> str:
+        """
+        Build the file name under which a template is stored.
+
+        Args:
+            name (str): Hub template name, e.g. 'owner/template'.
+            commit (str): Hub commit hash.
+
+        Returns:
+            str: File name such as 'owner__template@commit.json'.
+        """
+        return f"{name.replace('/', '__')}@{commit}.json"
+
+    def get(self, name: str, commit: str) -> ChatPromptTemplate:
+        """
+        Get a prompt template, pulling it from the hub only if no local copy exists.
+
+        Args:
+            name (str): Hub template name, e.g. 'owner/template'.
+            commit (str): Hub commit hash.
+
+        Returns:
+            ChatPromptTemplate: The prompt template.
+        """
+        key = (name, commit)
+        with self._lock:
+            template = self._memo.get(key)
+        if template is not None:
+            return template
+
+        # Loaded without the lock, so a slow hub request never blocks prompts already memoized
+        template = self._load(name, commit)
+        with self._lock:
+            # Keep the first template stored if another thread loaded it concurrently
+            return self._memo.setdefault(key, template)
+
+    def _load(self, name: str, commit: str) -> ChatPromptTemplate:
+        path = os.path.join(self.cache_directory, self.file_name(name, commit))
+        if os.path.exists(path):
+            logger.debug(f"Loading prompt template {name}:{commit} from {path}")
+            return self._read(path)
+
+        # Imported lazily: only needed when the template is not available locally
+        from langchain import hub
+
+        logger.info(f"Pulling prompt template {name}:{commit} from the LangChain hub")
+        template = hub.pull(f"{name}:{commit}")
+        try:
+            self._write(path, template)
+        except OSError as e:
+            logger.warning(f"Could not cache prompt template {name}:{commit}: {str(e)}")
+        return template
+
+    @staticmethod
+    def _read(path: str) -> ChatPromptTemplate:
+        with open(path, "r", encoding="utf-8") as file:
+            text = file.read()
+        with warnings.catch_warnings():
+            # loads() is marked beta; the files are written by this module
+            warnings.simplefilter("ignore")
+            return loads(text)
+
+    @staticmethod
+    def _write(path: str, template: ChatPromptTemplate) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(dumps(template, pretty=True))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+_registries: Dict[str, PromptRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_prompt_registry(cache_directory: str) -> PromptRegistry:
+    """
+    Get the process-wide prompt registry for a cache directory, creating it on first use.
+
+    Args:
+        cache_directory (str): Directory where templates pulled from the hub are stored.
+
+    Returns:
+        PromptRegistry: The shared registry.
+    """
+    path = os.path.abspath(cache_directory)
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = PromptRegistry(path)
+            _registries[path] = registry
+        return registry
+
@@ -0,0 +1,291 @@
+"""
+Transcript Parsing Module
+
+This module provides helpers for parsing dialogue transcripts whose turns are tagged by
+speaker (<Person1>, <Person2>, <Person3>, ...): a single-pass tokenizer that turns a complete
+transcript into typed turns (shared by markup cleaning, format validation and segmenting for
+text-to-speech), and an incremental parser that extracts turns from LLM output while it is
+still streaming.
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_SPEAKERS: Tuple[str, ...] = ("Person1", "Person2")
+
+# Speaker tag names accepted when no explicit speaker list is given
+SPEAKER_TAG = r"Person\d+"
+
+# Rest of an opening, closing or self-closing markup tag after its "<"
+_TAG_BODY = r"/?[A-Za-z][\w:.-]*(?:\s[^<>]*)?/?>"
+_BLANK_LINES = re.compile(r"\n\s*\n")
+
+
+class Turn(NamedTuple):
+    """A speaker's turn in a transcript."""
+
+    speaker: str
+    text: str
+    # False if the turn ended at the next turn or the end of the text instead of its closing tag
+    closed: bool = True
+
+
+def _speaker_names(speakers: Optional[Sequence[str]]) -> str:
+    """Regex alternation of speaker tag names; any PersonN speaker if None."""
+    if speakers is None:
+        return SPEAKER_TAG
+    return "|".join(re.escape(speaker) for speaker in speakers)
+
+
+@lru_cache(maxsize=64)
+def _speaker_pattern(speakers: Optional[Tuple[str, ...]]) -> "re.Pattern[str]":
+    """Compiled pattern matching the opening and closing tags of the given speakers."""
+    return re.compile(r"<(/?)(" + _speaker_names(speakers) + r")>")
+
+
+@lru_cache(maxsize=64)
+def _unsupported_tag_pattern(keep: FrozenSet[str], speakers: Optional[Tuple[str, ...]] = ()) -> "re.Pattern[str]":
+    """Compiled pattern matching every markup tag that is neither in ``keep`` nor a speaker tag."""
+    alternatives = [re.escape(name) for name in sorted(keep)]
+    if speakers is None or speakers:
+        alternatives.append(_speaker_names(speakers))
+    names = "|".join(alternatives)
+    if not names:
+        return re.compile("<" + _TAG_BODY)
+    # Starting with a literal "<" lets the regex engine skip ahead to candidate tags
+    return re.compile(r"<(?!/?(?:" + names + r")(?![\w:.-]))" + _TAG_BODY)
+
+
+def parse_transcript(
+    text: str,
+    supported_tags: Optional[Iterable[str]] = None,
+    speakers: Optional[Sequence[str]] = None,
+    strict: bool = False,
+) -> List[Turn]:
+    """
+    Split a transcript into turns in a single pass over its speaker tags.
+
+    Text outside turns is dropped. A turn without a closing tag ends where the next
+    turn starts; a closing tag of another speaker is ignored. Patterns are compiled
+    once per tag set, so repeated calls only scan the text.
+
+    Args:
+        text (str): Transcript text.
+        supported_tags (Optional[Iterable[str]]): Markup tags kept in turn text; others are
+            removed. None keeps all markup.
+        speakers (Optional[Sequence[str]]): Tag names that delimit turns. None accepts any
+            PersonN tag.
+        strict (bool): Raise instead of recovering from unclosed or mismatched speaker tags.
+
+    Returns:
+        List[Turn]: Turns in transcript order, with their markup cleaned.
+
+    Raises:
+        ValueError: In strict mode, if a speaker tag is unclosed or mismatched.
+    """
+    speakers = None if speakers is None else tuple(speakers)
+    if supported_tags is not None:
+        text = _unsupported_tag_pattern(frozenset(supported_tags), speakers).sub("", text)
+
+    # [text, "/" or "", speaker, text, "/" or "", speaker, text, ...]
+    tokens = _speaker_pattern(speakers).split(text)
+    turns = []
+    speaker = None
+    content = ""
+    for i in range(1, len(tokens), 3):
+        if speaker is not None:
+            content += tokens[i - 1]
+        is_closing, name = tokens[i] == "/", tokens[i + 1]
+        if is_closing:
+            if name == speaker:
+                turns.append(Turn(speaker, content))
+                speaker = None
+            elif strict:
+                raise ValueError(f"Unexpected closing tag </{name}>")
+        else:
+            if speaker is not None:
+                if strict:
+                    raise ValueError(f"Unclosed {speaker} tag before <{name}>")
+                turns.append(Turn(speaker, content, closed=False))
+            speaker = name
+            content = ""
+
+    if speaker is not None:
+        if strict:
+            raise ValueError(f"Unclosed {speaker} tag at the end of the transcript")
+        turns.append(Turn(speaker, content + tokens[-1], closed=False))
+    return turns
+
+
+def strip_markup(text: str, supported_tags: Optional[Iterable[str]] = None) -> str:
+    """
+    Remove markup tags that are not supported from a piece of text.
+
+    Args:
+        text (str): Text possibly containing markup tags.
+        supported_tags (Optional[Iterable[str]]): Tags to keep. None removes all tags.
+
+    Returns:
+        str: Text with unsupported tags removed.
+    """
+    return _unsupported_tag_pattern(frozenset(supported_tags or ())).sub("", text)
+
+
+def render_transcript(turns: Iterable[Turn]) -> str:
+    """
+    Write turns back as a transcript, one properly closed turn per line.
+
+    Args:
+        turns (Iterable[Turn]): Turns from parse_transcript.
+
+    Returns:
+        str: Transcript text.
+    """
+    lines = []
+    for turn in turns:
+        text = _BLANK_LINES.sub("\n", turn.text.strip())
+        lines.append(f"<{turn.speaker}>{text}</{turn.speaker}>")
+    return "\n".join(lines)
+
+
+def speaker_number(speaker: str) -> int:
+    """Number of a PersonN speaker (e.g. 3 for "Person3"); 0 for other names."""
+    digits = speaker[len("Person"):]
+    return int(digits) if speaker.startswith("Person") and digits.isdigit() else 0
+
+
+def merge_turns(turns: Iterable[Turn]) -> List[Turn]:
+    """
+    Batch consecutive turns of the same speaker into one turn.
+
+    Whitespace is normalized and empty turns are dropped, so each returned turn can be
+    synthesized with a single text-to-speech request.
+
+    Args:
+        turns (Iterable[Turn]): Turns from parse_transcript.
+
+    Returns:
+        List[Turn]: Turns in which no two neighbours share a speaker.
+    """
+    merged: List[Turn] = []
+    for turn in turns:
+        text = " ".join(turn.text.split())
+        if not text:
+            continue
+        if merged and merged[-1].speaker == turn.speaker:
+            previous = merged[-1]
+            merged[-1] = Turn(previous.speaker, f"{previous.text} {text}", previous.closed and turn.closed)
+        else:
+            merged.append(Turn(turn.speaker, text, turn.closed))
+    return merged
+
+
+def pair_turns(
+    turns: Iterable[Turn],
+    ending_message: str,
+    speakers: Sequence[str] = DEFAULT_SPEAKERS,
+) -> List[Tuple[str, str]]:
+    """
+    Pair each turn of the first speaker with the turn of the second speaker that follows it.
+
+    A first-speaker turn that is not answered is dropped, except the last one, which the
+    ending message answers. Whitespace in the paired texts is normalized.
+
+    Args:
+        turns (Iterable[Turn]): Turns from parse_transcript.
+        ending_message (str): Answer to a trailing first-speaker turn.
+        speakers (Sequence[str]): (question speaker, answer speaker).
+
+    Returns:
+        List[Tuple[str, str]]: (question, answer) text pairs.
+    """
+    question_speaker, answer_speaker = speakers[0], speakers[1]
+    pairs = []
+    question = None
+    for turn in turns:
+        if turn.speaker == question_speaker:
+            question = turn.text
+        elif turn.speaker == answer_speaker and question is not None:
+            pairs.append((" ".join(question.split()), " ".join(turn.text.split())))
+            question = None
+    if question is not None:
+        pairs.append((" ".join(question.split()), " ".join(ending_message.split())))
+    return pairs
+
+
+class TurnStreamParser:
+    """
+    Incremental parser that yields dialogue turns as soon as they are complete.
+
+    Text is fed in arbitrary chunks (e.g. LLM tokens); tags may be split across
+    chunks. A turn is complete when its closing tag arrives, or when the opening
+    tag of the next turn arrives without a closing tag in between. Text outside
+    turns is ignored.
+    """
+
+    def __init__(self, speakers: Optional[Sequence[str]] = None):
+        """
+        Initialize the TurnStreamParser.
+
+        Args:
+            speakers (Optional[Sequence[str]]): Tag names that delimit turns. None accepts
+                any PersonN tag.
+        """
+        self._pattern = _speaker_pattern(None if speakers is None else tuple(speakers))
+        # Longest possible tag minus one: how much of an unmatched tail may hold a partial tag
+        longest = len("Person") + 6 if speakers is None else max(len(speaker) for speaker in speakers)
+        self._max_partial = longest + 2
+        self._buffer = ""
+        self._speaker = None
+        self._scan_from = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """
+        Add streamed text and return the turns it completes.
+
+        Args:
+            chunk (str): Next piece of the transcript.
+
+        Returns:
+            List[Tuple[str, str]]: Completed (speaker, text) turns, in order.
+        """
+        self._buffer += chunk
+        turns = []
+        content_start = 0
+        consumed = 0
+        for match in self._pattern.finditer(self._buffer, self._scan_from):
+            is_closing, speaker = match.group(1) == "/", match.group(2)
+            if self._speaker is not None:
+                turns.append((self._speaker, self._buffer[content_start:match.start()]))
+                self._speaker = None
+            if not is_closing:
+                self._speaker = speaker
+                content_start = match.end()
+            consumed = match.end()
+
+        if self._speaker is not None:
+            # Keep the open turn's text; rescan only where a split tag could start
+            self._buffer = self._buffer[content_start:]
+            self._scan_from = max(0, len(self._buffer) - self._max_partial)
+        else:
+            self._buffer = self._buffer[consumed:][-self._max_partial:]
+            self._scan_from = 0
+        return turns
+
+    def finish(self) -> List[Tuple[str, str]]:
+        """
+        Flush the parser at the end of the stream.
+
+        Returns:
+            List[Tuple[str, str]]: The last turn if its closing tag never arrived.
+        """
+        turns = []
+        # Drop a tag cut off by the end of the stream
+        text = re.sub(r"<[^<>]*$", "", self._buffer)
+        if self._speaker is not None and text.strip():
+            turns.append((self._speaker, text))
+        self._buffer = ""
+        self._speaker = None
+        self._scan_from = 0
+        return turns
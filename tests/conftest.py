@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+import pytest
+
+from podcastfy.text_to_speech import TextToSpeech
+from podcastfy.tts import scheduler
+from podcastfy.tts.base import TTSProvider
+from podcastfy.tts.factory import TTSProviderFactory
+
+
+class FakeAsyncClient:
+    """Async client that records whether it was closed."""
+
+    closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class MockTTS(TTSProvider):
+    """Provider that fails with scripted errors before succeeding."""
+
+    def __init__(self, api_key=None, model=None):
+        self.model = model or "mock"
+        # Errors raised by the next requests, in order, and the text of every request
+        self.failures = []
+        self.calls = []
+        self.clients = []
+
+    def generate_audio(self, text, voice, model, voice2=None, cancel_event=None):
+        raise AssertionError("segments must use agenerate_audio")
+
+    async def agenerate_audio(self, text, voice, model, voice2=None, cancel_event=None):
+        self.calls.append(text)
+        self._get_async_client()
+        if self.failures:
+            error = self.failures.pop(0)
+            # Providers wrap client errors the same way
+            raise RuntimeError(f"Failed to generate audio: {error}") from error
+        return text.encode()
+
+    def _create_async_client(self):
+        self.clients.append(FakeAsyncClient())
+        return self.clients[-1]
+
+
+@pytest.fixture
+def mock_tts():
+    """TextToSpeech backed by a MockTTS provider (``mock_tts.provider``) with fast retries."""
+    with patch.dict(TTSProviderFactory._providers, {"mock": MockTTS}), \
+            patch.dict(scheduler._schedulers, clear=True):
+        yield TextToSpeech(
+            model="mock",
+            conversation_config={
+                "text_to_speech": {
+                    "mock": {"default_voices": {"question": "a", "answer": "b"}, "model": "m"},
+                    "segment_cache": {"enabled": False},
+                    "retry": {"max_retries": 3, "base_delay": 0.01, "max_delay": 0.05},
+                }
+            },
+        )
@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+import pytest
+
+from podcastfy import client
+from podcastfy.utils.config import load_config
+
+TRANSCRIPT = "<Person1>Hello there</Person1><Person2>Hi!</Person2>"
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Run process_content with the LLM and TTS replaced by fakes that write their outputs."""
+    config = load_config()
+    config.configure({"artifact_cache": {"enabled": True, "directory": str(tmp_path / "cache")}})
+
+    def generate_qa_content(content, output_filepath=None, **kwargs):
+        with open(output_filepath, "w") as f:
+            f.write(TRANSCRIPT)
+        return TRANSCRIPT
+
+    def convert_to_speech(text, output_file, job_id=None, cancel_event=None, resume=False):
+        with open(output_file, "wb") as f:
+            f.write(b"audio")
+
+    with patch.object(client, "ContentGenerator") as generator_cls, \
+            patch.object(client, "TextToSpeech") as tts_cls:
+        generator_cls.return_value.generate_qa_content.side_effect = generate_qa_content
+        tts_cls.return_value.convert_to_speech.side_effect = convert_to_speech
+
+        def run(voice, job_id):
+            conversation_config = {
+                "text_to_speech": {
+                    "output_directories": {
+                        "transcripts": str(tmp_path / "out"),
+                        "audio": str(tmp_path / "out"),
+                    },
+                    "edge": {"default_voices": {"question": voice}},
+                }
+            }
+            return client.process_content(
+                text="Some article", tts_model="edge", config=config,
+                conversation_config=conversation_config, job_id=job_id,
+            )
+
+        yield run, generator_cls.return_value, tts_cls.return_value
+
+
+def test_voice_change_reuses_transcript(pipeline):
+    run, generator, tts = pipeline
+
+    run("en-US-JennyNeural", "first")
+    audio_file, transcript_file = run("en-US-AriaNeural", "second")
+
+    assert generator.generate_qa_content.call_count == 1
+    assert tts.convert_to_speech.call_count == 2
+    with open(transcript_file) as f:
+        assert f.read() == TRANSCRIPT
+
+    # Same transcript and TTS settings: the audio is reused too
+    audio_file, _ = run("en-US-AriaNeural", "third")
+    assert tts.convert_to_speech.call_count == 2
+    with open(audio_file, "rb") as f:
+        assert f.read() == b"audio"
@@ -1,7 +1,16 @@
+import asyncio
 import unittest
 import pytest
 import os
+import tempfile
+import threading
 from podcastfy.text_to_speech import TextToSpeech
+from podcastfy.tts.cache import SegmentCache
+from podcastfy.tts import merger
+from podcastfy.tts.providers.gemini import GoogleMultispeakerTTS
+from podcastfy.tts.scheduler import RequestScheduler, TokenBucket
+from google.api_core.exceptions import ServiceUnavailable
+from unittest.mock import patch
 from podcastfy.utils.config_conversation import load_conversation_config
 
 
@@ -57,6 +66,349 @@ class TestAudio(unittest.TestCase):
         # Clean up
         os.remove(output_file)
 
+    def test_concurrent_segments_keep_transcript_order(self):
+        tts = TextToSpeech(
+            model="edge",
+            conversation_config={
+                "text_to_speech": {
+                    "edge": {"max_workers": 4},
+                    "segment_cache": {"enabled": False},
+                }
+            },
+        )
+        active = []
+        peak = []
+
+        async def fake_agenerate_audio(text, voice, model, voice2=None, cancel_event=None):
+            active.append(text)
+            peak.append(len(active))
+            # Finish later turns first to exercise out-of-order completion
+            await asyncio.sleep(0.05 if "Hello" in text else 0.01)
+            active.remove(text)
+            return text.encode()
+
+        tts.provider.agenerate_audio = fake_agenerate_audio
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_files = tts._generate_audio_segments(self.test_text, temp_dir)
+            contents = [open(path, "rb").read().decode() for path in audio_files]
+
+        self.assertEqual(
+            [os.path.basename(path) for path in audio_files],
+            ["1_Person1.mp3", "2_Person2.mp3"],
+        )
+        self.assertEqual(
+            contents, ["Hello, how are you?", "I'm doing great, thanks for asking!"]
+        )
+        self.assertEqual(max(peak), 2)
+
+    def test_speakers_beyond_two_get_their_own_voices(self):
+        tts = TextToSpeech(
+            model="edge",
+            conversation_config={
+                "text_to_speech": {
+                    "edge": {"default_voices": {"question": "q", "answer": "a", "Person3": "c"}},
+                    "segment_cache": {"enabled": False},
+                }
+            },
+        )
+        voices = {}
+
+        async def fake_agenerate_audio(text, voice, model, voice2=None, cancel_event=None):
+            voices[text] = voice
+            return text.encode()
+
+        tts.provider.agenerate_audio = fake_agenerate_audio
+        transcript = (
+            "<Person1>Hi.</Person1><Person3>Hello.</Person3><Person3>Glad to be here.</Person3>"
+            "<Person4>Me too.</Person4><Person2>Welcome!</Person2>"
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_files = tts._generate_audio_segments(transcript, temp_dir)
+
+        self.assertEqual(
+            [os.path.basename(path) for path in audio_files],
+            ["1_Person1.mp3", "2_Person3.mp3", "3_Person4.mp3", "4_Person2.mp3"],
+        )
+        # Person4 has no voice of its own and reuses the configured voices in turn
+        self.assertEqual(
+            voices,
+            {"Hi.": "q", "Hello. Glad to be here.": "c", "Me too.": "q", "Welcome!": "a"},
+        )
+
+    def test_in_memory_segments_spill_above_threshold(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tts = TextToSpeech(
+                model="edge",
+                conversation_config={
+                    "text_to_speech": {
+                        "temp_audio_dir": temp_dir,
+                        "segment_cache": {"enabled": False},
+                        # Room for two 417-byte segments
+                        "in_memory_segments": {"enabled": True, "max_memory_mb": 1000 / 1024 / 1024},
+                        "ending_message": "",
+                    }
+                },
+            )
+
+            async def fake_agenerate_audio(text, voice, model, voice2=None, cancel_event=None):
+                return mp3_frame(fill=text[0].encode())
+
+            tts.provider.agenerate_audio = fake_agenerate_audio
+            output_file = os.path.join(temp_dir, "out.mp3")
+            tts.convert_to_speech(
+                "<Person1>A</Person1><Person2>B</Person2><Person1>C</Person1>", output_file, job_id="job"
+            )
+
+            # Only the segment beyond the threshold went through the disk
+            self.assertEqual(sorted(os.listdir(temp_dir)), ["3_Person1.mp3", "out.mp3"])
+            with open(output_file, "rb") as f:
+                self.assertEqual(f.read(), b"".join(mp3_frame(fill=c) for c in (b"A", b"B", b"C")))
+
+    def test_concurrent_segments_honor_cancel_event(self):
+        tts = TextToSpeech(
+            model="edge",
+            conversation_config={
+                "text_to_speech": {
+                    "edge": {"max_workers": 2},
+                    "segment_cache": {"enabled": False},
+                }
+            },
+        )
+        cancel_event = threading.Event()
+        cancel_event.set()
+        async def fake_agenerate_audio(*args, **kwargs):
+            return b"audio"
+
+        tts.provider.agenerate_audio = fake_agenerate_audio
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaises(Exception):
+                tts._generate_audio_segments(
+                    self.test_text, temp_dir, cancel_event=cancel_event
+                )
+
+    def test_edge_collects_streamed_chunks_in_memory(self):
+        class FakeCommunicate:
+            def __init__(self, text, voice):
+                self.voice = voice
+
+            async def stream(self):
+                yield {"type": "audio", "data": b"ab"}
+                yield {"type": "WordBoundary", "offset": 0}
+                yield {"type": "audio", "data": b"cd"}
+
+        tts = TextToSpeech(model="edge")
+        with patch("podcastfy.tts.providers.edge.edge_tts.Communicate", FakeCommunicate):
+            audio = tts.provider.generate_audio("Hi", "en-US-JennyNeural", "default")
+        self.assertEqual(audio, b"abcd")
+
+    def test_segment_cache_serves_repeated_turns(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            tts = TextToSpeech(
+                model="edge",
+                conversation_config={
+                    "text_to_speech": {
+                        "segment_cache": {"enabled": True, "directory": cache_dir}
+                    }
+                },
+            )
+            calls = []
+
+            async def fake_agenerate_audio(text, voice, model, voice2=None, cancel_event=None):
+                calls.append(text)
+                return text.encode()
+
+            tts.provider.agenerate_audio = fake_agenerate_audio
+            for _ in range(2):
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    tts._generate_audio_segments(self.test_text, temp_dir)
+
+            self.assertEqual(len(calls), 2)
+            stats = tts.segment_cache.stats()
+            self.assertEqual(stats["hits"], 2)
+            self.assertEqual(stats["misses"], 2)
+
+    def test_streamed_turns_synthesized_before_stream_ends(self):
+        tts = TextToSpeech(
+            model="edge",
+            conversation_config={
+                "text_to_speech": {
+                    "edge": {"max_workers": 2},
+                    "segment_cache": {"enabled": False},
+                    "ending_message": "Bye!",
+                }
+            },
+        )
+        first_synthesized = threading.Event()
+        stream_finished = []
+
+        async def fake_agenerate_audio(text, voice, model, voice2=None, cancel_event=None):
+            first_synthesized.set()
+            return text.encode()
+
+        def turns():
+            yield "Person1", " Hello,\n how are <unknown>you</unknown>? "
+            yield "Person2", "Fine, thanks!"
+            # The next speaker ended the first turn: it is synthesized while the LLM is still generating
+            self.assertTrue(first_synthesized.wait(2))
+            yield "Person1", "One more thing."
+            yield "Person1", "Last question?"
+            stream_finished.append(True)
+
+        tts.provider.agenerate_audio = fake_agenerate_audio
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_files = tts._generate_streamed_audio_segments(turns(), temp_dir)
+            contents = [open(path, "rb").read().decode() for path in audio_files]
+
+        self.assertEqual(stream_finished, [True])
+        self.assertEqual(
+            [os.path.basename(path) for path in audio_files],
+            ["1_Person1.mp3", "2_Person2.mp3", "3_Person1.mp3", "4_Person2.mp3"],
+        )
+        # Same batching and cleaning as split_turns on the complete transcript
+        self.assertEqual(
+            contents,
+            ["Hello, how are you?", "Fine, thanks!", "One more thing. Last question?", "Bye!"],
+        )
+
+
+class TestSegmentCache(unittest.TestCase):
+    def test_lru_eviction_by_size(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = SegmentCache(cache_dir, max_size_bytes=25)
+            keys = [SegmentCache.make_key("openai", "tts-1", "echo", str(i)) for i in range(3)]
+            cache.put(keys[0], b"a" * 10)
+            cache.put(keys[1], b"b" * 10)
+            # Touch the first clip so the second one becomes least recently used
+            self.assertEqual(cache.get(keys[0]), b"a" * 10)
+            cache.put(keys[2], b"c" * 10)
+
+            self.assertIsNone(cache.get(keys[1]))
+            self.assertEqual(cache.get(keys[2]), b"c" * 10)
+            self.assertEqual(cache.stats()["evictions"], 1)
+            self.assertEqual(cache.stats()["size_bytes"], 20)
+
+            # A new instance rebuilds the index from disk
+            reloaded = SegmentCache(cache_dir, max_size_bytes=25)
+            self.assertEqual(reloaded.stats()["entries"], 2)
+
+    def test_key_depends_on_voice(self):
+        self.assertNotEqual(
+            SegmentCache.make_key("openai", "tts-1", "echo", "Hi"),
+            SegmentCache.make_key("openai", "tts-1", "shimmer", "Hi"),
+        )
+
+
+def mp3_frame(sample_rate_bits=0b00, marker=b"", fill=b"\x00"):
+    """Build a MPEG-1 Layer III 128kbps mono frame (417 bytes at 44.1kHz)."""
+    header = bytes([0xFF, 0xFB, 0x90 | (sample_rate_bits << 2), 0xC0])
+    length = {0b00: 417, 0b01: 384, 0b10: 576}[sample_rate_bits]
+    body = (b"\x00" * 17 + marker).ljust(length - 4, fill)
+    return header + body
+
+
+class TestGoogleMultispeaker(unittest.TestCase):
+    def test_long_transcript_synthesized_in_concurrent_chunks(self):
+        requests = []
+
+        def synthesize_speech(input, voice, audio_config):
+            turns = [(turn.speaker, turn.text) for turn in input.multi_speaker_markup.turns]
+            requests.append(turns)
+            if len(requests) == 1:
+                # Finish the first request last to exercise out-of-order completion
+                threading.Event().wait(0.05)
+            if turns == [("R", "question")] and requests.count(turns) == 1:
+                raise ServiceUnavailable("busy")
+            fill = bytes([len(turns[0][1])])
+            return type("Response", (), {"audio_content": mp3_frame(fill=fill)})()
+
+        bucket = TokenBucket(rate=None)
+        tokens = []
+        acquire = bucket.acquire
+
+        async def counting_acquire():
+            tokens.append(True)
+            await acquire()
+
+        bucket.acquire = counting_acquire
+        scheduler = RequestScheduler(bucket, max_retries=2, base_delay=0.001, max_delay=0.01)
+
+        with patch(
+            "podcastfy.tts.providers.gemini.texttospeech_v1beta1.TextToSpeechClient"
+        ) as client_cls:
+            client_cls.return_value.synthesize_speech.side_effect = synthesize_speech
+            provider = GoogleMultispeakerTTS(api_key="key")
+            provider.MAX_REQUEST_BYTES = 12
+
+            audio = asyncio.run(provider.agenerate_transcript_audio(
+                "<Person1>Hi.</Person1><Person2>Hello.</Person2><Person1>Longer question here?</Person1>",
+                voice="R",
+                voice2="S",
+                ending_message="Bye!",
+                max_workers=4,
+                scheduler=scheduler,
+            ))
+
+        # Turns are packed into requests of at most 12 bytes; the long turn is split between words
+        self.assertCountEqual(requests, [
+            [("R", "Hi."), ("S", "Hello.")],
+            [("R", "Longer")],
+            [("R", "question")],
+            [("R", "question")],
+            [("R", "here?"), ("S", "Bye!")],
+        ])
+        # Every request took its own token, and only the failed one was retried
+        self.assertEqual(len(tokens), 5)
+        self.assertEqual(scheduler.retries, 1)
+        self.assertEqual(
+            audio, b"".join(mp3_frame(fill=bytes([n])) for n in (3, 6, 8, 5))
+        )
+
+
+class TestMerger(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_concat_strips_tags_and_info_frames(self):
+        id3 = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"x" * 5
+        first = self.write(
+            "1_Person1.mp3",
+            id3 + mp3_frame(marker=b"Info") + mp3_frame(fill=b"\x01") * 2,
+        )
+        second = self.write(
+            "2_Person2.mp3", mp3_frame(fill=b"\x02") * 3 + b"TAG" + b"\x00" * 125
+        )
+        output = os.path.join(self.temp_dir.name, "out", "merged.mp3")
+
+        merger.concat_mp3_files([first, second], output)
+
+        with open(output, "rb") as f:
+            merged = f.read()
+        self.assertEqual(
+            merged, mp3_frame(fill=b"\x01") * 2 + mp3_frame(fill=b"\x02") * 3
+        )
+
+    def test_incompatible_streams_fall_back_to_pydub(self):
+        first = self.write("1_Person1.mp3", mp3_frame() * 2)
+        second = self.write("2_Person2.mp3", mp3_frame(sample_rate_bits=0b01) * 2)
+        output = os.path.join(self.temp_dir.name, "merged.mp3")
+
+        with self.assertRaises(merger.Mp3FormatError):
+            merger.concat_mp3_files([first, second], output)
+        self.assertFalse(os.path.exists(output))
+
+        with patch.object(merger, "merge_with_pydub") as pydub_merge:
+            merger.merge_audio_files([first, second], output, "mp3")
+        pydub_merge.assert_called_once_with([first, second], output, "mp3")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+import pytest
+
+from podcastfy import client
+from podcastfy.utils.checkpoint import JobCheckpoint
+from podcastfy.utils.config import load_config
+
+TRANSCRIPT = "<Person1>Hello there</Person1><Person2>Hi!</Person2>"
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Run process_content for one job with extraction, the LLM and TTS replaced by fakes."""
+    config = load_config()
+    config.configure({"artifact_cache": {"enabled": False}})
+    conversation_config = {
+        "text_to_speech": {
+            "output_directories": {"transcripts": str(tmp_path), "audio": str(tmp_path)},
+            "temp_audio_dir": str(tmp_path / "tmp"),
+            "streaming": False,
+        }
+    }
+
+    def generate_qa_content(content, output_filepath=None, **kwargs):
+        with open(output_filepath, "w") as f:
+            f.write(TRANSCRIPT)
+        return TRANSCRIPT
+
+    with patch.object(client, "ContentExtractor") as extractor_cls, \
+            patch.object(client, "ContentGenerator") as generator_cls, \
+            patch.object(client, "TextToSpeech") as tts_cls:
+        extractor_cls.return_value.extract_contents.return_value = ["Some article"]
+        generator_cls.return_value.generate_qa_content.side_effect = generate_qa_content
+
+        def run(resume=False):
+            return client.process_content(
+                urls=["https://example.com"], tts_model="edge", config=config,
+                conversation_config=conversation_config, job_id="job", resume=resume,
+            )
+
+        yield run, extractor_cls.return_value, generator_cls.return_value, tts_cls.return_value
+
+
+def test_resume_skips_completed_stages(pipeline, tmp_path):
+    run, extractor, generator, tts = pipeline
+    tts.convert_to_speech.side_effect = RuntimeError("TTS quota exceeded")
+
+    with pytest.raises(RuntimeError):
+        run()
+    (tmp_path / "tmp" / "1_Person1.mp3").write_bytes(b"audio")
+    state = JobCheckpoint(str(tmp_path / "tmp"), "job").summary()
+    assert set(state) == {"extracted_text", "transcript_file", "completed_segments"}
+    assert state["completed_segments"] == ["1_Person1.mp3"]
+
+    tts.convert_to_speech.side_effect = None
+    audio_file, transcript_file = run(resume=True)
+
+    assert extractor.extract_contents.call_count == 1
+    assert generator.generate_qa_content.call_count == 1
+    assert tts.convert_to_speech.call_args.args[0] == TRANSCRIPT
+    assert tts.convert_to_speech.call_args.kwargs["resume"] is True
+
+
+def test_resume_after_extraction_regenerates_transcript(pipeline, tmp_path):
+    run, extractor, generator, tts = pipeline
+    generator.generate_qa_content.side_effect = RuntimeError("LLM unavailable")
+
+    with pytest.raises(RuntimeError):
+        run()
+    generator.generate_qa_content.side_effect = None
+    generator.generate_qa_content.return_value = TRANSCRIPT
+    run(resume=True)
+
+    assert extractor.extract_contents.call_count == 1
+    assert generator.generate_qa_content.call_args.args[0] == "Some article"
+    # Segments left on disk may belong to another transcript
+    assert tts.convert_to_speech.call_args.kwargs["resume"] is False
+
+
+def test_resume_synthesizes_only_missing_segments(mock_tts, tmp_path):
+    (tmp_path / "1_Person1.mp3").write_bytes(b"earlier run")
+
+    audio_files = mock_tts._generate_audio_segments(TRANSCRIPT, str(tmp_path), resume=True)
+
+    assert [open(path, "rb").read() for path in audio_files] == [b"earlier run", b"Hi!"]
+    assert mock_tts.provider.calls == ["Hi!"]
@@ -0,0 +1,54 @@
+import os
+import time
+
+from podcastfy.utils.config import get_config_path, load_config, load_yaml_snapshot
+from podcastfy.utils.config_conversation import load_conversation_config
+
+
+def test_yaml_snapshot_reused_until_file_changes(tmp_path):
+    path = tmp_path / "settings.yaml"
+    path.write_text("a: 1\n")
+
+    first = load_yaml_snapshot(str(path))
+    assert load_yaml_snapshot(str(path)) is first
+
+    path.write_text("a: 22\n")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert load_yaml_snapshot(str(path)) == {"a": 22}
+
+
+def test_configure_does_not_leak_into_snapshot():
+    config = load_config()
+    config.configure({"content_extractor": {"max_workers": 99}})
+    config.content_extractor.youtube_url_patterns.append("example.com")
+
+    fresh = load_config()
+    assert fresh.content_extractor.max_workers != 99
+    assert "example.com" not in fresh.content_extractor.youtube_url_patterns
+
+
+def test_conversation_overlay_shares_untouched_sections():
+    default = load_conversation_config()
+    custom = load_conversation_config(
+        {"text_to_speech": {"default_tts_model": "edge"}, "podcast_name": "Custom"}
+    )
+
+    assert custom.get("podcast_name") == "Custom"
+    assert custom.get("text_to_speech.default_tts_model") == "edge"
+    # Sibling keys of an overridden section come from the default
+    assert custom.get("text_to_speech.output_directories").to_dict() == \
+        default.get("text_to_speech.output_directories").to_dict()
+    assert load_conversation_config().get("podcast_name") == default.get("podcast_name")
+
+
+def test_config_is_copy_on_write_view_of_snapshot():
+    config = load_config()
+    snapshot = load_yaml_snapshot(get_config_path())
+
+    # Nothing is copied until it is read
+    assert config._source is snapshot
+    assert "content_extractor" not in vars(config)
+    patterns = config.content_extractor.youtube_url_patterns
+    assert patterns == snapshot["content_extractor"]["youtube_url_patterns"]
+    assert patterns is not snapshot["content_extractor"]["youtube_url_patterns"]
+    assert config.to_dict()["content_extractor"] == snapshot["content_extractor"]
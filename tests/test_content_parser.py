@@ -1,10 +1,18 @@
+import os
+import tempfile
+import time
 import unittest
+from concurrent.futures import Future
+from unittest.mock import Mock, patch
+
+import pymupdf
 import pytest
 from podcastfy.utils.config import load_config
 from podcastfy.content_parser.content_extractor import ContentExtractor
 from podcastfy.content_parser.youtube_transcriber import YouTubeTranscriber
 from podcastfy.content_parser.website_extractor import WebsiteExtractor
 from podcastfy.content_parser.pdf_extractor import PDFExtractor
+from podcastfy.content_parser.extraction_cache import ExtractionCache, normalize_url
 
 
 class TestContentParser(unittest.TestCase):
@@ -83,5 +91,156 @@ class TestContentParser(unittest.TestCase):
         )
 
 
+class TestExtractContents(unittest.TestCase):
+    def setUp(self):
+        self.extractor = ContentExtractor()
+        self.extractor.extraction_cache = None
+        self.extractor.content_extractor_config.configure({"source_timeout": 1})
+
+    def test_preserves_order_and_skips_slow_source(self):
+        """
+        Sources finishing out of order keep their input order, and a source exceeding
+        the timeout is dropped without delaying the others.
+        """
+        delays = {"a.com": 0.3, "b.com": 0.0, "slow.com": 5, "c.com": 0.1}
+
+        def fake_extract(url):
+            time.sleep(delays[url])
+            return f"content of {url}"
+
+        with patch.object(self.extractor.website_extractor, "extract_content", side_effect=fake_extract):
+            start = time.monotonic()
+            contents = self.extractor.extract_contents(list(delays))
+            elapsed = time.monotonic() - start
+
+        self.assertEqual(contents, ["content of a.com", "content of b.com", "content of c.com"])
+        self.assertLess(elapsed, 2)
+
+    def test_raises_when_every_source_fails(self):
+        with patch.object(
+            self.extractor.website_extractor, "extract_content", side_effect=Exception("boom")
+        ):
+            with self.assertRaises(Exception):
+                self.extractor.extract_contents(["a.com", "b.com"])
+
+    def test_pdfs_extracted_in_process_pool(self):
+        self.extractor.content_extractor_config.configure({"source_timeout": 60})
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = []
+            for name in ("first", "second"):
+                doc = pymupdf.open()
+                doc.new_page().insert_text((72, 72), f"This is the {name} document.")
+                path = os.path.join(tmp_dir, f"{name}.pdf")
+                doc.save(path)
+                doc.close()
+                paths.append(path)
+
+            contents = self.extractor.extract_contents(paths)
+
+        self.assertEqual(len(contents), 2)
+        self.assertIn("first document", contents[0])
+        self.assertIn("second document", contents[1])
+
+
+class TestWebsiteExtractorSession(unittest.TestCase):
+    def test_session_shared_and_reused(self):
+        """
+        Every extractor uses the same pooled session, so pages from one host reuse connections.
+        """
+        first, second = WebsiteExtractor(), WebsiteExtractor()
+        self.assertIs(first.session, second.session)
+        adapter = first.session.get_adapter("https://example.com")
+        self.assertGreater(adapter.max_retries.total, 0)
+        self.assertIn("gzip", first.session.headers["Accept-Encoding"])
+
+        response = Mock(text="<html><body><p>Hello   world</p></body></html>")
+        with patch.object(first.session, "get", return_value=response) as session_get:
+            self.assertEqual(first.extract_content("example.com/a"), "Hello world")
+            self.assertEqual(second.extract_content("example.com/b"), "Hello world")
+
+        self.assertEqual(
+            [call.args[0] for call in session_get.call_args_list],
+            ["https://example.com/a", "https://example.com/b"],
+        )
+
+
+class TestExtractionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.extractor = ContentExtractor()
+        self.extractor.extraction_cache = ExtractionCache(
+            self.tmp_dir.name, {"website": 3600, "youtube": 3600, "pdf": 3600}
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_normalize_url(self):
+        self.assertEqual(
+            normalize_url("Example.COM:443?b=2&a=1#section"), "https://example.com/?a=1&b=2"
+        )
+        self.assertEqual(normalize_url("http://example.com:8080/x"), "http://example.com:8080/x")
+
+    def test_website_revalidated_with_conditional_get(self):
+        """
+        A fresh entry is served from the cache, and a stale entry is revalidated
+        with its ETag so that an unchanged page costs a 304 instead of a parse.
+        """
+        page = Mock(
+            status_code=200,
+            text="<html><body><p>Front page</p></body></html>",
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 04 Nov 2024 10:00:00 GMT"},
+        )
+        not_modified = Mock(status_code=304, text="", headers={})
+        session = self.extractor.website_extractor.session
+
+        with patch.object(session, "get", return_value=page) as session_get:
+            self.assertEqual(self.extractor.extract_content("example.com"), "Front page")
+            self.assertEqual(self.extractor.extract_content("https://EXAMPLE.com/"), "Front page")
+        self.assertEqual(session_get.call_count, 1)
+
+        self.extractor.extraction_cache.ttl["website"] = 0
+        with patch.object(session, "get", return_value=not_modified) as session_get:
+            self.assertEqual(self.extractor.extract_content("example.com"), "Front page")
+        headers = session_get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 04 Nov 2024 10:00:00 GMT")
+        self.assertEqual(
+            self.extractor.extraction_cache.stats(), {"hits": 1, "misses": 1, "revalidations": 1}
+        )
+
+    def test_pdf_cached_by_content_hash(self):
+        doc = pymupdf.open()
+        doc.new_page().insert_text((72, 72), "Cached document.")
+        first = os.path.join(self.tmp_dir.name, "first.pdf")
+        doc.save(first)
+        doc.close()
+        # Same bytes under another name share the entry
+        copy = os.path.join(self.tmp_dir.name, "copy.pdf")
+        with open(first, "rb") as src, open(copy, "wb") as dst:
+            dst.write(src.read())
+
+        self.assertIn("Cached document", self.extractor.extract_content(first))
+        with patch.object(self.extractor.pdf_extractor, "extract_content") as pdf_extract:
+            self.assertIn("Cached document", self.extractor.extract_content(copy))
+        pdf_extract.assert_not_called()
+
+    def test_cancelled_pdf_extraction_not_cached(self):
+        """
+        A PDF future cancelled by a batch timeout is skipped by the cache callback instead
+        of raising CancelledError inside it.
+        """
+        path = os.path.join(self.tmp_dir.name, "cancelled.pdf")
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4")
+        pending = Future()
+        pool = Mock(submit=Mock(return_value=pending))
+
+        future = self.extractor._submit_pdf(pool, path)
+        with self.assertNoLogs("concurrent.futures", level="ERROR"):
+            self.assertTrue(future.cancel())
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["cancelled.pdf"])
+
+
 if __name__ == "__main__":
     unittest.main()
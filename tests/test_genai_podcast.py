@@ -3,7 +3,12 @@ import pytest
 from unittest.mock import patch, MagicMock
 import tempfile
 import os
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
 from podcastfy.content_generator import ContentGenerator
+from podcastfy.utils.prompt_registry import PromptRegistry
 from podcastfy.utils.config import Config
 from podcastfy.utils.config_conversation import ConversationConfig
 from podcastfy.content_parser.pdf_extractor import PDFExtractor
@@ -137,5 +142,98 @@ class TestGenAIPodcast(unittest.TestCase):
         self.assertIsInstance(result, str)
 
 
+class TestGenerationWithFakeLLM(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        template = ChatPromptTemplate.from_messages(
+            [("system", "Write a {word_count} word podcast."), ("human", "{input_text}")]
+        )
+        registry = PromptRegistry(self.tmp_dir.name)
+        generator = ContentGenerator("test-key", sample_conversation_config())
+        name = generator.content_generator_config.get("prompt_template")
+        commit = generator.content_generator_config.get("prompt_commit")
+        PromptRegistry._write(
+            os.path.join(self.tmp_dir.name, PromptRegistry.file_name(name, commit)), template
+        )
+        self.registry = registry
+
+        self.prompts = []
+
+        def fake_llm(prompt_value):
+            messages = prompt_value.to_messages()
+            self.prompts.append(messages)
+            if "research notes" in messages[0].content:
+                # Map step: echo the first word of the chunk
+                return AIMessage(content=f"- {messages[1].content.split()[0]}")
+            return AIMessage(content="<Person1>Welcome!</Person1><Person2>Thanks!</Person2>")
+
+        self.fake_llm = RunnableLambda(fake_llm)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_generator(self, **chunking):
+        generator = ContentGenerator("test-key", sample_conversation_config(), llm=self.fake_llm)
+        generator.prompt_registry = self.registry
+        generator.content_generator_config.configure({"chunking": chunking})
+        return generator
+
+    def test_long_input_summarized_per_chunk(self):
+        generator = self.make_generator(
+            enabled=True, threshold_tokens=100, chunk_tokens=100, chunk_overlap_tokens=0, max_concurrency=3
+        )
+        paragraphs = [f"section{i} " + "lorem ipsum " * 25 for i in range(5)]
+
+        result = generator.generate_qa_content("\n\n".join(paragraphs))
+
+        self.assertEqual(result, "<Person1>Welcome!</Person1>\n<Person2>Thanks!</Person2>")
+        self.assertEqual(len(self.prompts), 6)
+        final_input = self.prompts[-1][-1].content[0]["text"]
+        # Notes are reduced in source order
+        positions = [final_input.index(f"- section{i}") for i in range(5)]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_short_input_single_call(self):
+        generator = self.make_generator(enabled=True, threshold_tokens=10000)
+        generator.generate_qa_content("A short article.")
+        self.assertEqual(len(self.prompts), 1)
+        self.assertIn("A short article.", self.prompts[0][-1].content[0]["text"])
+
+    def test_stream_yields_turns_and_saves_transcript(self):
+        transcript = "<Person1>Welcome to the show!</Person1>\n<Person2>Glad to be here.</Person2>"
+        generator = ContentGenerator(
+            "test-key", sample_conversation_config(), llm=FakeListChatModel(responses=[transcript])
+        )
+        generator.prompt_registry = self.registry
+        output_file = os.path.join(self.tmp_dir.name, "transcript.txt")
+
+        turns = list(generator.stream_qa_content("Some article", output_filepath=output_file))
+
+        self.assertEqual(
+            turns, [("Person1", "Welcome to the show!"), ("Person2", "Glad to be here.")]
+        )
+        with open(output_file) as f:
+            self.assertEqual(f.read(), generator.response)
+        self.assertIn("<Person2>Glad to be here.</Person2>", generator.response)
+
+    def test_streamed_turns_cleaned_like_full_response(self):
+        transcript = (
+            "<Person1>(scratchpad) Welcome to <emphasis>the</emphasis> show!</Person1>\n"
+            "<Person2><s>Glad</s> to be here.<break time='1s'/></Person2>"
+        )
+        generator = ContentGenerator(
+            "test-key", sample_conversation_config(), llm=FakeListChatModel(responses=[transcript])
+        )
+        generator.prompt_registry = self.registry
+
+        turns = list(generator.stream_qa_content("Some article"))
+
+        self.assertEqual(
+            turns, [("Person1", "Welcome to the show!"), ("Person2", "<s>Glad</s> to be here.")]
+        )
+        self.assertNotIn("(scratchpad)", generator.response)
+        self.assertNotIn("emphasis", generator.response)
+
+
 if __name__ == "__main__":
     unittest.main()
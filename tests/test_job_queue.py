@@ -0,0 +1,349 @@
+"""
+Unit tests for the Redis-backed job storage and scheduling of the API service.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+from unittest.mock import patch
+
+import fakeredis.aioredis
+import pytest
+
+from podcastfy.api import api_service, job_runner
+from podcastfy.api.models import JobRedisOperations
+from podcastfy.api.utils import parse_time
+from tests.test_audio import mp3_frame
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+async def save_waiting_job(redis, job_id, score):
+    await JobRedisOperations.save_job(redis, job_id, {"job_id": job_id, "status": "waiting"})
+    await JobRedisOperations.enqueue_job(redis, job_id, score)
+
+
+def test_check_pending_jobs_pops_in_score_order(redis):
+    async def scenario():
+        await save_waiting_job(redis, "late", 20)
+        await save_waiting_job(redis, "early", 10)
+        await save_waiting_job(redis, "stopped", 5)
+        await JobRedisOperations.save_job(redis, "stopped", {"job_id": "stopped", "status": "stopped"})
+
+        started = []
+
+        async def fake_start(job_id, redis):
+            started.append(job_id)
+            api_service.processing_jobs.append(job_id)
+
+        with patch.object(api_service, "start_job_processing", fake_start), \
+                patch.object(api_service, "MAX_CONCURRENT_JOBS", 1), \
+                patch.object(api_service, "processing_jobs", []):
+            await api_service.check_pending_jobs(redis)
+            assert started == ["early"]
+            # Slot freed: the next call picks the remaining job without scanning keys
+            api_service.processing_jobs.clear()
+            await api_service.check_pending_jobs(redis)
+            assert started == ["early", "late"]
+
+        assert await JobRedisOperations.pop_waiting_job(redis) is None
+
+    asyncio.run(scenario())
+
+
+def make_job(job_id, user_id, status, create_time):
+    return {"job_id": job_id, "user_id": user_id, "status": status, "create_time": create_time}
+
+
+def test_user_index_follows_status_changes(redis):
+    async def scenario():
+        jobs = [
+            make_job("a", "alice@example.com", "completed", "2024-11-01 10:00:00 +0800"),
+            make_job("b", "alice@example.com", "waiting", "2024-11-01 10:05:00 +0800"),
+            make_job("c", "alice@example.com", "waiting", "2024-11-01 10:10:00 +0800"),
+            make_job("d", "bob@example.com", "waiting", "2024-11-01 10:07:00 +0800"),
+        ]
+        for job in jobs:
+            await JobRedisOperations.save_job(redis, job["job_id"], job)
+
+        # b moves from waiting to completed
+        jobs[1]["status"] = "completed"
+        await JobRedisOperations.save_job(redis, "b", jobs[1])
+
+        total, page = await JobRedisOperations.list_user_jobs(redis, "alice@example.com")
+        assert total == 3
+        assert [job["job_id"] for job in page] == ["a", "b", "c"]
+
+        total, page = await JobRedisOperations.list_user_jobs(
+            redis, "alice@example.com", status="completed", offset=1, count=1
+        )
+        assert total == 2
+        assert [job["job_id"] for job in page] == ["b"]
+
+        total, page = await JobRedisOperations.list_user_jobs(redis, "alice@example.com", status="waiting")
+        assert [job["job_id"] for job in page] == ["c"]
+
+        # An expired job key is dropped from the index on the next listing
+        await redis.delete(f"{api_service.JobRedisConfig.job_prefix}c")
+        total, page = await JobRedisOperations.list_user_jobs(redis, "alice@example.com")
+        assert total == 2
+        total, _ = await JobRedisOperations.list_user_jobs(redis, "alice@example.com")
+        assert total == 2
+
+    asyncio.run(scenario())
+
+
+def test_rebuild_indexes_backfills_legacy_jobs(redis):
+    async def scenario():
+        legacy = make_job("old", "alice@example.com", "completed", "2024-11-01 10:00:00 +0800")
+        await redis.hset(
+            f"{api_service.JobRedisConfig.job_prefix}old", mapping={"data": json.dumps(legacy)}
+        )
+
+        assert await JobRedisOperations.rebuild_indexes(redis) == 1
+        assert await JobRedisOperations.rebuild_indexes(redis) == 0
+        total, page = await JobRedisOperations.list_user_jobs(redis, "alice@example.com", status="completed")
+        assert total == 1
+        assert page[0]["job_id"] == "old"
+
+    asyncio.run(scenario())
+
+
+def test_waiting_queue_backfilled_from_legacy_waiting_jobs(redis):
+    async def scenario():
+        # Saved before the queue existed: waiting, but never enqueued
+        for job_id, create_time in [("later", "2024-11-01 10:05:00 +0800"), ("earlier", "2024-11-01 10:00:00 +0800")]:
+            await JobRedisOperations.save_job(
+                redis, job_id, make_job(job_id, "alice@example.com", "waiting", create_time)
+            )
+        follower = make_job("follower", "alice@example.com", "waiting", "2024-11-01 10:01:00 +0800")
+        follower["leader_job_id"] = "earlier"
+        await JobRedisOperations.save_job(redis, "follower", follower)
+        await JobRedisOperations.save_job(
+            redis, "done", make_job("done", "alice@example.com", "completed", "2024-11-01 09:00:00 +0800")
+        )
+
+        assert await JobRedisOperations.backfill_waiting_queue(redis) == 2
+        assert await JobRedisOperations.backfill_waiting_queue(redis) == 0
+        assert await JobRedisOperations.pop_waiting_job(redis) == "earlier"
+        assert await JobRedisOperations.pop_waiting_job(redis) == "later"
+        assert await JobRedisOperations.pop_waiting_job(redis) is None
+
+    asyncio.run(scenario())
+
+
+def test_partial_audio_streams_contiguous_segments(redis, tmp_path):
+    def write(path, data):
+        with open(path, "wb") as f:
+            f.write(data)
+
+    async def collect(agen):
+        return [chunk async for chunk in agen]
+
+    async def scenario():
+        segment_dir = tmp_path / "temp" / "job"
+        segment_dir.mkdir(parents=True)
+        frames = {i: mp3_frame(fill=bytes([i])) for i in range(1, 5)}
+        write(segment_dir / "1_Person1.mp3", b"ID3\x04\x00\x00\x00\x00\x00\x01x" + frames[1])
+        write(segment_dir / "3_Person1.mp3", frames[3])
+        write(segment_dir / "2_Person2.mp3.part", frames[2][:100])
+        job = {"job_id": "job", "user_id": "alice@example.com", "status": "processing"}
+        await JobRedisOperations.save_job(redis, "job", job)
+
+        with patch.object(api_service, "TEMP_DIRECTORY", str(tmp_path / "temp")):
+            # 3_Person1 waits for 2_Person2; the in-progress write is ignored
+            assert await collect(api_service.iter_partial_audio(redis, "job")) == [frames[1]]
+
+            stream = api_service.iter_partial_audio(redis, "job", follow=True, poll_interval=0)
+            assert await stream.__anext__() == frames[1]
+            os.replace(segment_dir / "2_Person2.mp3.part", segment_dir / "2_Person2.mp3")
+            write(segment_dir / "2_Person2.mp3", frames[2])
+            assert await stream.__anext__() == frames[2]
+            assert await stream.__anext__() == frames[3]
+
+            # On completion the segments are cleaned up; the rest comes from the merged file
+            final_file = tmp_path / "final.mp3"
+            write(final_file, b"".join(frames[i] for i in range(1, 5)))
+            shutil.rmtree(segment_dir)
+            await JobRedisOperations.save_job(
+                redis, "job", dict(job, status="completed", audio_file=str(final_file))
+            )
+            assert await collect(stream) == [frames[4]]
+
+    asyncio.run(scenario())
+
+
+def test_audio_download_supports_conditional_and_range_requests(redis, tmp_path):
+    from fastapi.testclient import TestClient
+    from podcastfy.api.models import User
+
+    audio_file = tmp_path / "original.mp3"
+    audio_file.write_bytes(bytes(range(256)) * 4)
+
+    async def setup():
+        await JobRedisOperations.save_job(redis, "original", {
+            "job_id": "original", "user_id": "alice@example.com", "status": "completed",
+            "job_hash": "abc123", "audio_file": str(audio_file),
+        })
+        await JobRedisOperations.save_job(redis, "repeat", {
+            "job_id": "repeat", "user_id": "alice@example.com", "status": "repeated",
+            "job_hash": "abc123", "repeated_job_id": "original",
+        })
+
+    asyncio.run(setup())
+
+    async def get_redis():
+        return redis
+
+    api_service.app.dependency_overrides[api_service.get_current_active_user] = \
+        lambda: User(email="alice@example.com", password_hash="x")
+    api_service.app.dependency_overrides[api_service.get_redis_job] = get_redis
+    try:
+        client = TestClient(api_service.app)
+        full = client.get("/jobs/original/download/audio")
+        assert full.status_code == 200
+        etag = full.headers["etag"]
+        assert "abc123" in etag and not etag.startswith("W/")
+
+        # Repeated jobs share the original job's artifact
+        repeated = client.get("/jobs/repeat/download/audio", headers={"If-None-Match": etag})
+        assert repeated.status_code == 304
+        assert repeated.headers["etag"] == etag
+
+        since = client.get("/jobs/original/download/audio",
+                           headers={"If-Modified-Since": full.headers["last-modified"]})
+        assert since.status_code == 304
+
+        partial = client.get("/jobs/original/download/audio",
+                             headers={"Range": "bytes=256-511", "If-Range": etag})
+        assert partial.status_code == 206
+        assert partial.headers["content-range"] == "bytes 256-511/1024"
+        assert partial.content == bytes(range(256))
+    finally:
+        api_service.app.dependency_overrides.clear()
+
+
+async def submit(redis, job_id, create_time="2024-12-01 10:00:00 +0800"):
+    job = make_job(job_id, "alice@example.com", "waiting", create_time)
+    job["job_hash"] = "same-content"
+    await JobRedisOperations.save_job(redis, job_id, job)
+    return await job_runner.attach_to_duplicate_job(redis, job_id, job)
+
+
+def test_concurrent_identical_submissions_coalesce(redis):
+    async def scenario():
+        leaders = await asyncio.gather(*(submit(redis, f"job{i}") for i in range(5)))
+        assert leaders.count(None) == 1
+        leader_id = f"job{leaders.index(None)}"
+        assert set(leaders) == {None, leader_id}
+
+        leader = await JobRedisOperations.get_job(redis, leader_id)
+        await job_runner.save_job_result(redis, leader_id, leader, ("audio.mp3", "transcript.txt"))
+
+        for i in range(5):
+            job = await JobRedisOperations.get_job(redis, f"job{i}")
+            if f"job{i}" != leader_id:
+                assert job["status"] == "repeated"
+                assert job["repeated_job_id"] == leader_id
+
+        # Later submissions reuse the completed job directly
+        assert await submit(redis, "late") == leader_id
+        assert (await JobRedisOperations.get_job(redis, "late"))["status"] == "repeated"
+
+    asyncio.run(scenario())
+
+
+def test_follower_takes_over_when_leader_fails(redis):
+    async def scenario():
+        assert await submit(redis, "leader", "2024-12-01 10:00:00 +0800") is None
+        assert await submit(redis, "second", "2024-12-01 10:00:01 +0800") == "leader"
+        assert await submit(redis, "third", "2024-12-01 10:00:02 +0800") == "leader"
+        assert await JobRedisOperations.pop_waiting_job(redis) is None
+
+        await job_runner.mark_job_failed(redis, "leader", "boom")
+
+        assert await JobRedisOperations.pop_waiting_job(redis) == "second"
+        assert await JobRedisOperations.get_job_by_hash(redis, "same-content") == "second"
+        assert "leader_job_id" not in await JobRedisOperations.get_job(redis, "second")
+        assert (await JobRedisOperations.get_job(redis, "third"))["leader_job_id"] == "second"
+
+        # The promoted job fails too: the last follower runs it; without followers the claim is released
+        await job_runner.mark_job_failed(redis, "second", "boom")
+        assert await JobRedisOperations.pop_waiting_job(redis) == "third"
+        await job_runner.mark_job_failed(redis, "third", "boom")
+        assert await JobRedisOperations.get_job_by_hash(redis, "same-content") is None
+
+    asyncio.run(scenario())
+
+
+def test_failed_and_orphaned_jobs_resume_from_checkpoint(redis, tmp_path):
+    async def scenario():
+        job = make_job("failed", "alice@example.com", "processing", "2024-12-01 10:00:00 +0800")
+        job["job_hash"] = "failed-content"
+        job["conversation_config"] = {"text_to_speech": {"temp_audio_dir": str(tmp_path)}}
+        await JobRedisOperations.save_job(redis, "failed", job)
+        (tmp_path / "1_Person1.mp3").write_bytes(b"audio")
+
+        await job_runner.mark_job_failed(redis, "failed", "boom")
+        job = await JobRedisOperations.get_job(redis, "failed")
+        assert job["checkpoint"]["completed_segments"] == ["1_Person1.mp3"]
+        assert api_service.format_job_info(job)["checkpoint"]["completed_segments"] == 1
+
+        assert await job_runner.resume_job(redis, "failed", job) is None
+        job = await JobRedisOperations.get_job(redis, "failed")
+        assert job["status"] == "waiting" and job["resume"] and "fail_reason" not in job
+
+        # A job left processing by a previous API process is re-queued ahead of newer jobs
+        await save_waiting_job(redis, "newer", parse_time("2024-12-02 10:00:00 +0800").timestamp())
+        await JobRedisOperations.save_job(
+            redis, "orphan", make_job("orphan", "bob@example.com", "processing", "2024-12-01 09:00:00 +0800")
+        )
+        assert await JobRedisOperations.reclaim_orphaned_jobs(redis) == ["orphan"]
+        assert (await JobRedisOperations.get_job(redis, "orphan"))["resume"]
+        assert [await JobRedisOperations.pop_waiting_job(redis) for _ in range(3)] == ["orphan", "failed", "newer"]
+
+    asyncio.run(scenario())
+
+
+def test_clear_jobs_skips_jobs_running_in_any_process(redis):
+    from fastapi.testclient import TestClient
+    from podcastfy.api.models import User
+
+    async def setup():
+        await JobRedisOperations.save_job(
+            redis, "done", make_job("done", "alice@example.com", "completed", "2024-11-01 10:00:00 +0800")
+        )
+        # Running in a worker: not in this process's processing_jobs
+        await JobRedisOperations.save_job(
+            redis, "remote", make_job("remote", "alice@example.com", "processing", "2024-11-01 10:05:00 +0800")
+        )
+        await JobRedisOperations.enqueue_job(redis, "remote", 10)
+        assert await JobRedisOperations.claim_waiting_job(redis, "worker-1", 60) == "remote"
+
+    asyncio.run(setup())
+
+    async def get_redis():
+        return redis
+
+    api_service.app.dependency_overrides[api_service.get_current_active_user] = \
+        lambda: User(email="alice@example.com", password_hash="x")
+    api_service.app.dependency_overrides[api_service.get_redis_job] = get_redis
+    try:
+        with patch.object(api_service, "CLEANUP_ON_COMPLETE", False):
+            response = TestClient(api_service.app).delete("/jobs/clear")
+        assert response.status_code == 200
+        assert response.json()["deleted_count"] == 1
+        assert response.json()["skipped_count"] == 1
+    finally:
+        api_service.app.dependency_overrides.clear()
+
+    async def remaining():
+        return [await JobRedisOperations.get_job(redis, job_id) for job_id in ("done", "remote")]
+
+    done, remote = asyncio.run(remaining())
+    assert done is None
+    assert remote["status"] == "processing"
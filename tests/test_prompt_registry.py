@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+
+from podcastfy.content_generator import compose_prompt
+from podcastfy.utils.config import load_config
+from podcastfy.utils.prompt_registry import PromptRegistry
+
+TEMPLATE_NAME = "example/podcast_prompt"
+TEMPLATE_COMMIT = "abc123"
+
+# Parameters ContentGenerator formats the prompt with
+PROMPT_PARAMS = {
+    "input_text", "word_count", "conversation_style", "roles_person1", "roles_person2",
+    "dialogue_structure", "podcast_name", "podcast_tagline", "output_language",
+    "engagement_techniques",
+}
+
+
+def write_template(cache_dir, name=TEMPLATE_NAME, commit=TEMPLATE_COMMIT):
+    template = ChatPromptTemplate.from_messages(
+        [("system", "You host {podcast_name} in {output_language}."), ("human", "{input_text}")]
+    )
+    PromptRegistry._write(str(cache_dir / PromptRegistry.file_name(name, commit)), template)
+    return template
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """A prompt cache directory holding a template, as written after an earlier hub pull."""
+    cache_dir = tmp_path / "cache"
+    write_template(cache_dir)
+    return cache_dir
+
+
+def test_cached_template_resolved_without_hub(cache_dir):
+    registry = PromptRegistry(str(cache_dir))
+    with patch("langchain.hub.pull", side_effect=AssertionError("hub must not be called")):
+        template = registry.get(TEMPLATE_NAME, TEMPLATE_COMMIT)
+        assert registry.get(TEMPLATE_NAME, TEMPLATE_COMMIT) is template
+    assert template.messages[0].prompt.template == "You host {podcast_name} in {output_language}."
+
+
+def test_hub_pull_cached_on_disk(tmp_path):
+    template = write_template(tmp_path / "source")
+    cache_dir = str(tmp_path / "cache")
+
+    with patch("langchain.hub.pull", return_value=template) as pull:
+        PromptRegistry(cache_dir).get(TEMPLATE_NAME, TEMPLATE_COMMIT)
+    pull.assert_called_once_with(f"{TEMPLATE_NAME}:{TEMPLATE_COMMIT}")
+
+    # A fresh registry (e.g. another worker process) reads the cached copy
+    with patch("langchain.hub.pull", side_effect=AssertionError("hub must not be called")):
+        cached = PromptRegistry(cache_dir).get(TEMPLATE_NAME, TEMPLATE_COMMIT)
+    assert cached == template
+
+
+def test_composed_prompt_memoized(cache_dir):
+    registry = PromptRegistry(str(cache_dir))
+
+    prompt, image_keys = compose_prompt(registry, TEMPLATE_NAME, TEMPLATE_COMMIT, 1, "Be brief")
+    assert compose_prompt(registry, TEMPLATE_NAME, TEMPLATE_COMMIT, 1, "Be brief")[0] is prompt
+    assert compose_prompt(registry, TEMPLATE_NAME, TEMPLATE_COMMIT, 0, "Be brief")[0] is not prompt
+    assert image_keys == ("image_path_0",)
+
+    text_only, _ = compose_prompt(registry, TEMPLATE_NAME, TEMPLATE_COMMIT, 0, "Be brief")
+    messages = text_only.format_messages(
+        podcast_name="Podcastfy", output_language="English", input_text="Some article"
+    )
+    assert messages[0].content.startswith("You host Podcastfy in English.")
+    assert "Be brief" in messages[0].content
+
+
+def test_configured_template_resolved_offline_from_cache(tmp_path):
+    config = load_config().get("content_generator")
+    name, commit = config.get("prompt_template"), config.get("prompt_commit")
+    cache_dir = tmp_path / "cache"
+    write_template(cache_dir, name, commit)
+
+    def no_network(*args, **kwargs):
+        raise OSError("network disabled")
+
+    with patch("socket.socket.connect", side_effect=no_network), \
+            patch("langchain.hub.pull", side_effect=AssertionError("hub must not be called")):
+        prompt, _ = compose_prompt(PromptRegistry(str(cache_dir)), name, commit, 0, "")
+
+    assert set(prompt.input_variables) <= PROMPT_PARAMS
+    messages = prompt.format_messages(**{key: "x" for key in PROMPT_PARAMS})
+    assert messages[0].content.startswith("You host x in x.")
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from podcastfy.tts.providers.edge import EdgeTTS
+from podcastfy.utils.transcript import Turn, TurnStreamParser, pair_turns, parse_transcript
+
+
+TRANSCRIPT = (
+    "Some preamble <Person1>Hello <emphasis>there</emphasis>, how are you?</Person1>\n"
+    "<Person2>Fine, thanks!</Person2><Person1>Next question<Person2>Implicitly closed</Person2>"
+    "<Person1>Unfinished turn</Pers"
+)
+EXPECTED = [
+    ("Person1", "Hello <emphasis>there</emphasis>, how are you?"),
+    ("Person2", "Fine, thanks!"),
+    ("Person1", "Next question"),
+    ("Person2", "Implicitly closed"),
+    ("Person1", "Unfinished turn"),
+]
+
+
+def test_turns_independent_of_chunking():
+    rng = random.Random(42)
+    for _ in range(100):
+        parser = TurnStreamParser()
+        turns = []
+        pos = 0
+        while pos < len(TRANSCRIPT):
+            size = rng.randint(1, 12)
+            turns += parser.feed(TRANSCRIPT[pos:pos + size])
+            pos += size
+        turns += parser.finish()
+        assert turns == EXPECTED
+
+
+def test_turn_emitted_when_closing_tag_arrives():
+    parser = TurnStreamParser()
+    assert parser.feed("<Person1>Hi the") == []
+    assert parser.feed("re</Person") == []
+    assert parser.feed("1><Person2>") == [("Person1", "Hi there")]
+    assert parser.finish() == []
+
+
+def test_parse_transcript_recovers_turns_and_cleans_markup():
+    turns = parse_transcript(TRANSCRIPT, supported_tags=["s"])
+
+    assert turns[:2] == [
+        Turn("Person1", "Hello there, how are you?"),
+        Turn("Person2", "Fine, thanks!"),
+    ]
+    assert [turn.closed for turn in turns] == [True, True, False, True, False]
+    assert pair_turns(turns, "Bye!") == [
+        ("Hello there, how are you?", "Fine, thanks!"),
+        ("Next question", "Implicitly closed"),
+        ("Unfinished turn</Pers", "Bye!"),
+    ]
+
+
+def test_strict_parse_rejects_malformed_tags():
+    with pytest.raises(ValueError, match="Unclosed Person1"):
+        parse_transcript("<Person1>Hi<Person2>Yo</Person2>", strict=True)
+    with pytest.raises(ValueError, match="Unexpected closing tag </Person2>"):
+        parse_transcript("<Person1>Hi</Person2>", strict=True)
+
+
+def test_provider_cleaning_keeps_supported_tags_unchanged():
+    provider = EdgeTTS()
+    supported_tags = provider.get_supported_tags()
+    before = list(supported_tags)
+
+    cleaned = provider.clean_tss_markup("<Person1><s>Hi</s> <break/>there</Person1>", supported_tags=supported_tags)
+    provider.split_qa("<Person1>Hi</Person1>", "Bye", supported_tags)
+
+    assert cleaned == "<Person1><s>Hi</s> there</Person1>"
+    assert supported_tags == before == EdgeTTS.COMMON_SSML_TAGS
+
+
+def test_split_turns_batches_speakers_beyond_two():
+    transcript = (
+        "<Person1>Welcome.</Person1><Person1> Today we have guests.</Person1>"
+        "<Person3>Hi!</Person3><Person2>Hello <unknown>all</unknown>.</Person2>"
+        "<Person2></Person2><Person1>Any last words?</Person1>"
+    )
+
+    assert EdgeTTS().split_turns(transcript, "Bye!") == [
+        Turn("Person1", "Welcome. Today we have guests."),
+        Turn("Person3", "Hi!"),
+        Turn("Person2", "Hello all."),
+        Turn("Person1", "Any last words?"),
+        Turn("Person2", "Bye!"),
+    ]
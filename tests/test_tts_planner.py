@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+from podcastfy.tts.planner import Segment, plan_segments, split_text
+
+
+def test_adjacent_turns_of_one_voice_share_a_request():
+    turns = [
+        ("Person1", "Right.", "a"),
+        ("Person3", "Exactly.", "a"),
+        ("Person2", "So what now?", "b"),
+        ("Person1", "We wait.", "a"),
+    ]
+
+    assert list(plan_segments(turns)) == [
+        Segment("Person1", "Right. Exactly.", "a"),
+        Segment("Person2", "So what now?", "b"),
+        Segment("Person1", "We wait.", "a"),
+    ]
+
+
+def test_turns_without_voice_merged_only_within_a_speaker():
+    turns = [
+        ("Person1", "Hi.", None),
+        ("Person1", "Welcome.", None),
+        ("Person3", "Hello!", None),
+    ]
+
+    assert list(plan_segments(turns)) == [
+        Segment("Person1", "Hi. Welcome.", None),
+        Segment("Person3", "Hello!", None),
+    ]
+
+
+def test_long_text_split_at_sentence_boundaries():
+    text = "One two. Three four five! Six? 七八。九十。 " + "x" * 25
+
+    chunks = split_text(text, 20)
+
+    assert chunks == ["One two.", "Three four five!", "Six? 七八。 九十。", "x" * 20, "x" * 5]
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert split_text(text, None) == [text]
+    # Limits in bytes count each CJK character as three
+    assert split_text("你好。再见。", 12, size=lambda chunk: len(chunk.encode("utf-8"))) == ["你好。", "再见。"]
+
+
+def test_segments_follow_provider_character_limit(mock_tts):
+    mock_tts.provider.MAX_CHARACTERS = 20
+    mock_tts.ending_message = ""
+    transcript = (
+        "<Person1>Hi.</Person1><Person2>Fine. Thanks a lot!</Person2>"
+        "<Person2>And you?</Person2><Person1>Good.</Person1>"
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_files = mock_tts._generate_audio_segments(transcript, temp_dir)
+        names = [os.path.basename(path) for path in audio_files]
+
+    assert names == ["1_Person1.mp3", "2_Person2.mp3", "3_Person2.mp3", "4_Person1.mp3"]
+    assert mock_tts.provider.calls == ["Hi.", "Fine. Thanks a lot!", "And you?", "Good."]
@@ -0,0 +1,109 @@
+import asyncio
+import tempfile
+import time
+
+import pytest
+
+from podcastfy.tts.scheduler import RequestScheduler, TokenBucket, classify_error
+
+TRANSCRIPT = "<Person1>Hello?</Person1><Person2>Hi!</Person2>"
+
+
+class FakeAPIError(Exception):
+    """Client library error carrying an HTTP status, like openai.APIStatusError."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_transient_failures_retried_per_segment(mock_tts):
+    mock_tts.provider.failures = [FakeAPIError(429, {"Retry-After": "0"}), FakeAPIError(503)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_files = mock_tts._generate_audio_segments(TRANSCRIPT, temp_dir)
+        contents = [open(path, "rb").read() for path in audio_files]
+
+    assert contents == [b"Hello?", b"Hi!"]
+    assert mock_tts.scheduler.retries == 2
+    assert len(mock_tts.provider.calls) == 4
+
+
+def test_async_client_closed_after_each_run(mock_tts):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        mock_tts._generate_audio_segments(TRANSCRIPT, temp_dir)
+        mock_tts._generate_audio_segments(TRANSCRIPT, temp_dir)
+
+    # One client per run (event loop), shared by its segments and closed when the run ends
+    assert len(mock_tts.provider.clients) == 2
+    assert all(client.closed for client in mock_tts.provider.clients)
+
+
+def test_permanent_failure_not_retried(mock_tts):
+    mock_tts.provider.failures = [FakeAPIError(400)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with pytest.raises(RuntimeError):
+            mock_tts._generate_audio_segments(TRANSCRIPT, temp_dir)
+    assert mock_tts.scheduler.retries == 0
+
+
+def test_retries_exhausted(mock_tts):
+    mock_tts.provider.failures = [FakeAPIError(500)] * 10
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with pytest.raises(RuntimeError):
+            mock_tts._generate_audio_segments(TRANSCRIPT, temp_dir)
+    # The first segment gave up after its 3 retries
+    assert mock_tts.provider.calls.count("Hello?") == 4
+
+
+def test_classify_error_follows_cause_chain():
+    try:
+        try:
+            raise FakeAPIError(429, {"retry-after": "2"})
+        except FakeAPIError as e:
+            raise RuntimeError("wrapped") from e
+    except RuntimeError as wrapped:
+        assert classify_error(wrapped) == (True, 2.0)
+
+    assert classify_error(ConnectionResetError()) == (True, None)
+    assert classify_error(ValueError("bad voice")) == (False, None)
+
+
+def test_token_bucket_paces_requests():
+    async def scenario():
+        bucket = TokenBucket(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # Two requests go out immediately, the other four wait 1/50 s each
+    assert asyncio.run(scenario()) >= 0.07
+
+
+def test_retry_after_pauses_whole_bucket():
+    async def scenario():
+        bucket = TokenBucket(rate=None)
+        bucket.pause(0.1)
+        start = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.09
+
+
+def test_oversized_retry_after_clamped_to_max_delay():
+    scheduler = RequestScheduler(TokenBucket(rate=None), max_retries=1, base_delay=0.01, max_delay=0.05)
+    failures = [FakeAPIError(429, {"Retry-After": "3600"})]
+
+    async def request():
+        if failures:
+            raise failures.pop()
+        return b"audio"
+
+    start = time.monotonic()
+    assert asyncio.run(scheduler.run(request)) == b"audio"
+    assert time.monotonic() - start < 1
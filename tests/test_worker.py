@@ -0,0 +1,178 @@
+"""
+Unit tests for the standalone job worker, using fakeredis and an in-thread runner.
+"""
+
+import asyncio
+import threading
+import time
+
+import fakeredis.aioredis
+import pytest
+
+from podcastfy.api import job_runner
+from podcastfy.api.models import JobRedisConfig, JobRedisOperations
+from podcastfy.api.utils import parse_time
+from podcastfy.api.worker import JobWorker
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+async def submit(redis, job_id, score, job_hash=None):
+    job = {
+        "job_id": job_id,
+        "user_id": "alice@example.com",
+        "status": "waiting",
+        "job_hash": job_hash or f"hash-{job_id}",
+        "create_time": "2024-11-01 10:00:00 +0800",
+    }
+    await JobRedisOperations.save_job(redis, job_id, job)
+    await JobRedisOperations.enqueue_job(redis, job_id, score)
+
+
+async def run_until(worker, condition, timeout=5):
+    """Run the worker until ``condition`` holds, then stop it."""
+    task = asyncio.create_task(worker.run())
+    deadline = time.monotonic() + timeout
+    while not await condition():
+        assert time.monotonic() < deadline, "worker did not reach the expected state"
+        await asyncio.sleep(0.01)
+    worker.stop()
+    await task
+
+
+def test_worker_processes_jobs_and_releases_leases(redis):
+    async def scenario():
+        await submit(redis, "first", 10)
+        await submit(redis, "second", 20)
+        await submit(redis, "failing", 30)
+
+        seen = []
+
+        def runner(job_id, job, cancel_event):
+            seen.append(job_id)
+            if job_id == "failing":
+                return None
+            return f"data/transcripts/{job_id}.txt"
+
+        async def all_done():
+            jobs = await JobRedisOperations.get_jobs(redis, ["first", "second", "failing"])
+            return all(job["status"] in ("completed", "failed") for job in jobs)
+
+        worker = JobWorker(redis, concurrency=2, poll_interval=0.01, runner=runner)
+        await run_until(worker, all_done)
+
+        assert sorted(seen) == ["failing", "first", "second"]
+        first = await JobRedisOperations.get_job(redis, "first")
+        assert first["status"] == "completed"
+        assert first["text_file"] == "data/transcripts/first.txt"
+        assert (await JobRedisOperations.get_job(redis, "failing"))["status"] == "failed"
+        assert await JobRedisOperations.get_job_by_hash(redis, "hash-first") == "first"
+        assert await redis.zcard(JobRedisConfig.lease_key) == 0
+        assert await redis.hget(f"{JobRedisConfig.job_prefix}first", "worker_id") is None
+
+    asyncio.run(scenario())
+
+
+def test_worker_records_fail_reason_and_cleans_up_completed_jobs(redis, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_runner, "TEMP_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(job_runner, "CLEANUP_ON_COMPLETE", True)
+
+    async def scenario():
+        await submit(redis, "done", 10)
+        await submit(redis, "broken", 20)
+        for job_id in ("done", "broken"):
+            (tmp_path / job_id).mkdir()
+
+        def runner(job_id, job, cancel_event):
+            if job_id == "broken":
+                raise RuntimeError("ValueError: no content extracted")
+            return "data/transcripts/done.txt"
+
+        async def all_done():
+            jobs = await JobRedisOperations.get_jobs(redis, ["done", "broken"])
+            return all(job["status"] in ("completed", "failed") for job in jobs)
+
+        worker = JobWorker(redis, poll_interval=0.01, runner=runner)
+        await run_until(worker, all_done)
+
+        broken = await JobRedisOperations.get_job(redis, "broken")
+        assert broken["fail_reason"] == "ValueError: no content extracted"
+        # Completed jobs drop their temporary files; failed ones keep them to resume from
+        assert not (tmp_path / "done").exists()
+        assert (tmp_path / "broken").exists()
+
+    asyncio.run(scenario())
+
+
+def test_heartbeat_cancels_stopped_job(redis):
+    async def scenario():
+        await submit(redis, "slow", 10)
+        started = threading.Event()
+
+        def runner(job_id, job, cancel_event):
+            started.set()
+            assert cancel_event.wait(5)
+            return None
+
+        async def stopped():
+            if not started.is_set():
+                return False
+            job = await JobRedisOperations.get_job(redis, "slow")
+            if job["status"] != "stopped":
+                # Same update as the /jobs/stop endpoint
+                job["status"] = "stopped"
+                await JobRedisOperations.save_job(redis, "slow", job)
+            return not worker.running
+
+        worker = JobWorker(redis, heartbeat_seconds=0.01, poll_interval=0.01, runner=runner)
+        await run_until(worker, stopped)
+
+        # The stopped status set by the API is kept instead of being overwritten by the result
+        assert (await JobRedisOperations.get_job(redis, "slow"))["status"] == "stopped"
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(redis):
+    async def scenario():
+        await submit(redis, "orphan", 10)
+
+        # A worker claims the job and then disappears without renewing its lease
+        crashed = JobWorker(redis, lease_seconds=0.05, worker_id="crashed")
+        assert await crashed.claim_next_job() == "orphan"
+        assert (await JobRedisOperations.get_job(redis, "orphan"))["status"] == "processing"
+        await asyncio.sleep(0.1)
+
+        async def completed():
+            job = await JobRedisOperations.get_job(redis, "orphan")
+            return job["status"] == "completed"
+
+        worker = JobWorker(redis, poll_interval=0.01, runner=lambda *args: "done.txt", worker_id="healthy")
+        await run_until(worker, completed)
+
+        # The crashed worker can no longer renew or release the lease it lost
+        assert not await JobRedisOperations.renew_lease(redis, "orphan", "crashed", 60)
+        assert not await JobRedisOperations.release_lease(redis, "orphan", "crashed")
+
+    asyncio.run(scenario())
+
+
+def test_job_claimed_by_crashed_worker_before_processing_is_requeued(redis):
+    async def scenario():
+        await submit(redis, "claimed", 10)
+
+        # The worker dies right after taking the job off the queue
+        assert await JobRedisOperations.claim_waiting_job(redis, "crashed", 0.05) == "claimed"
+        assert await redis.zcard(JobRedisConfig.waiting_queue_key) == 0
+        assert (await JobRedisOperations.get_job(redis, "claimed"))["status"] == "waiting"
+        await asyncio.sleep(0.1)
+
+        assert await JobRedisOperations.reclaim_expired_leases(redis) == ["claimed"]
+        # Queued again at its submission time
+        assert await redis.zscore(JobRedisConfig.waiting_queue_key, "claimed") == \
+            parse_time("2024-11-01 10:00:00 +0800").timestamp()
+
+    asyncio.run(scenario())